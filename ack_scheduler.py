@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Outgoing acknowledgement scheduler for the Discord bot.
+Sends one acknowledgement style per config, merges replies to the same channel
+within a short window into one message, drops redundant reactions and paces
+each per-channel route so bursts queue locally instead of hitting 429s.
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ACK_STYLES = ("reply", "reaction", "both")
+REPLY_BATCH_WINDOW = 0.5  # seconds to collect replies per channel
+MAX_MESSAGE_LENGTH = 2000  # Discord limit
+MAX_REMEMBERED_REACTIONS = 1000
+
+# Minimum spacing per channel for each route, from Discord's usual bucket sizes
+# (create message: 5 per 5s; add reaction: 1 per 0.25s)
+ROUTE_INTERVALS = {
+    "message": 1.0,
+    "reaction": 0.25,
+}
+
+
+class AckScheduler:
+    def __init__(self, style: str = "reply", batch_window: float = REPLY_BATCH_WINDOW,
+                 route_intervals: Dict[str, float] = None, metrics=None):
+        """Initialize scheduler state; actions must be scheduled from the event loop"""
+        if style not in ACK_STYLES:
+            raise ValueError(f"Unknown acknowledgement style: {style}")
+        self.style = style
+        self.batch_window = batch_window
+        self.route_intervals = dict(ROUTE_INTERVALS)
+        self.route_intervals.update(route_intervals or {})
+        self.metrics = metrics
+
+        self.pending_replies: Dict[int, List[Tuple[discord.Message, str]]] = {}
+        self.reply_tasks: Dict[int, asyncio.Task] = {}
+        self.reaction_tasks = set()
+        self.reacted: "OrderedDict[Tuple[int, str], None]" = OrderedDict()
+        self.route_locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self.next_allowed: Dict[Tuple[str, int], float] = {}
+
+    def _count(self, name: str):
+        if self.metrics:
+            self.metrics.increment(name)
+
+    async def _wait_route(self, route: str, channel_id: int):
+        """Sleep until the per-channel route may be used again, then claim the slot"""
+        key = (route, channel_id)
+        delay = self.next_allowed.get(key, 0) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.next_allowed[key] = time.monotonic() + self.route_intervals.get(route, 0)
+
+    def _route_lock(self, route: str, channel_id: int) -> asyncio.Lock:
+        key = (route, channel_id)
+        lock = self.route_locks.get(key)
+        if lock is None:
+            lock = self.route_locks[key] = asyncio.Lock()
+        return lock
+
+    # Public API ---------------------------------------------------------
+
+    def acknowledge(self, message: discord.Message, text: str, emoji: str = '✅'):
+        """Acknowledge a message in the configured style"""
+        if self.style in ("reaction", "both"):
+            self.react(message, emoji)
+        if self.style in ("reply", "both"):
+            self.reply(message, text)
+
+    def react(self, message: discord.Message, emoji: str):
+        """Add a reaction unless the same one was already sent for this message"""
+        key = (message.id, emoji)
+        if key in self.reacted:
+            self._count("acks_reactions_dropped")
+            return
+        self.reacted[key] = None
+        while len(self.reacted) > MAX_REMEMBERED_REACTIONS:
+            self.reacted.popitem(last=False)
+
+        task = asyncio.create_task(self._send_reaction(message, emoji))
+        self.reaction_tasks.add(task)
+        task.add_done_callback(self.reaction_tasks.discard)
+
+    def reply(self, message: discord.Message, text: str):
+        """Queue a reply; replies to one channel within the window become one message"""
+        channel_id = message.channel.id
+        self.pending_replies.setdefault(channel_id, []).append((message, text))
+        if channel_id not in self.reply_tasks:
+            self.reply_tasks[channel_id] = asyncio.create_task(self._flush_replies(channel_id))
+
+    async def stop(self):
+        """Wait for every scheduled action to be sent"""
+        while self.reply_tasks or self.reaction_tasks:
+            await asyncio.gather(*self.reply_tasks.values(), *self.reaction_tasks,
+                                 return_exceptions=True)
+
+    # Senders ------------------------------------------------------------
+
+    async def _send_reaction(self, message: discord.Message, emoji: str):
+        async with self._route_lock("reaction", message.channel.id):
+            await self._wait_route("reaction", message.channel.id)
+            try:
+                await message.add_reaction(emoji)
+                self._count("acks_reactions_sent")
+            except discord.HTTPException as e:
+                logger.warning(f"Could not add reaction {emoji}: {e}")
+
+    async def _flush_replies(self, channel_id: int):
+        try:
+            await asyncio.sleep(self.batch_window)
+            async with self._route_lock("message", channel_id):
+                await self._wait_route("message", channel_id)
+                # Take everything that arrived while waiting for the window and bucket
+                items = self.pending_replies.pop(channel_id, [])
+                del self.reply_tasks[channel_id]
+                for i, content in enumerate(self._compose(items)):
+                    if i:
+                        await self._wait_route("message", channel_id)
+                    await self._send_reply(items[-1][0], content)
+                if len(items) > 1:
+                    self._count("acks_replies_merged")
+        except Exception as e:
+            # A newer task may already own the channel once this one popped its items
+            if self.reply_tasks.get(channel_id) is asyncio.current_task():
+                del self.reply_tasks[channel_id]
+            logger.error(f"Error sending replies to channel {channel_id}: {e}")
+
+    def _compose(self, items: List[Tuple[discord.Message, str]]) -> List[str]:
+        """One message for a single reply, a bulleted list for several, split at the length limit"""
+        if len(items) == 1:
+            return [items[0][1][:MAX_MESSAGE_LENGTH]]
+        contents, current = [], ""
+        for _, text in items:
+            line = f"• {text}"[:MAX_MESSAGE_LENGTH]
+            if current and len(current) + 1 + len(line) > MAX_MESSAGE_LENGTH:
+                contents.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+        contents.append(current)
+        return contents
+
+    async def _send_reply(self, target: discord.Message, content: str):
+        try:
+            await target.reply(content, mention_author=False)
+        except discord.HTTPException:
+            # The message may be gone; the channel still is
+            await target.channel.send(content)
+        self._count("acks_replies_sent")
@@ -5,10 +5,7 @@ Used when Claude Code begins analyzing code or files.
 """
 
 import json
-from sound_manager import SoundManager
-
-# Initialize sound manager
-sound_manager = SoundManager()
+from hook_debounce import should_fire
 
 # Main logic
 if __name__ == "__main__":
@@ -22,6 +19,15 @@ if __name__ == "__main__":
         print("⚠️ No valid JSON input received, using default values")
         hook_input = {"session_id": "unknown"}
     
+    # Skip quickly (without loading the audio stack) if this hook fired recently
+    if not should_fire(hook_input.get("session_id", "unknown"), "analysis_start"):
+        print("⏭️ Hook fired within cooldown, skipping sound")
+        exit(0)
+    
+    # Sound manager is only imported once we know a sound will play
+    from sound_manager import SoundManager
+    sound_manager = SoundManager()
+    
     # Play thinking sound for analysis start
     print("🔊 Playing analysis start sound...")
     sound_manager.play_sound("thinking")
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Long-lived audio server for Claude Code hooks.
+Keeps one output stream open and decoded clips resident, mixes or queues
+concurrent play requests, and accepts requests over a local Unix socket.
+"""
+
+import sys
+import json
+import time
+import wave
+import array
+import shutil
+import asyncio
+import logging
+import argparse
+import threading
+import subprocess
+from pathlib import Path
+from collections import deque
+from typing import Dict, List, Optional
+
+from sound_manager import SoundManager, AUDIO_SERVER_SOCKET
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Output format (16-bit signed little-endian PCM)
+SAMPLE_RATE = 44100
+CHANNELS = 2
+CHUNK_FRAMES = 1024  # ~23ms per mixer step
+MAX_VOICES = 4
+POLICIES = ("mix", "queue", "interrupt")
+
+
+def load_wav(path: Path) -> array.array:
+    """Decode a WAV file into interleaved 16-bit stereo samples at SAMPLE_RATE"""
+    with wave.open(str(path), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    # Convert sample width to signed 16-bit
+    if width == 2:
+        samples = array.array("h", data)
+        if sys.byteorder == "big":
+            samples.byteswap()
+    elif width == 1:
+        samples = array.array("h", ((b - 128) << 8 for b in data))
+    elif width == 3:
+        samples = array.array("h", (int.from_bytes(data[i + 1:i + 3], "little", signed=True)
+                                    for i in range(0, len(data), 3)))
+    elif width == 4:
+        wide = array.array("i", data)
+        if sys.byteorder == "big":
+            wide.byteswap()
+        samples = array.array("h", (s >> 16 for s in wide))
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+
+    # Convert channel layout to stereo
+    if channels == 1:
+        stereo = array.array("h", bytes(len(samples) * 4))
+        stereo[0::2] = samples
+        stereo[1::2] = samples
+        samples = stereo
+    elif channels > 2:
+        stereo = array.array("h", bytes((len(samples) // channels) * 4))
+        stereo[0::2] = samples[0::channels]
+        stereo[1::2] = samples[1::channels]
+        samples = stereo
+
+    # Nearest-neighbour resample to the output rate
+    if rate != SAMPLE_RATE:
+        frames = len(samples) // 2
+        out_frames = int(frames * SAMPLE_RATE / rate)
+        resampled = array.array("h", bytes(out_frames * 4))
+        for i in range(out_frames):
+            src = min(int(i * rate / SAMPLE_RATE), frames - 1) * 2
+            resampled[2 * i] = samples[src]
+            resampled[2 * i + 1] = samples[src + 1]
+        samples = resampled
+
+    return samples
+
+
+# Sinks ------------------------------------------------------------------
+
+class NullSink:
+    """Discards audio, optionally pacing writes in real time"""
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        self.frames_written = 0
+
+    def write(self, pcm: bytes):
+        frames = len(pcm) // (2 * CHANNELS)
+        self.frames_written += frames
+        if self.realtime:
+            time.sleep(frames / SAMPLE_RATE)
+
+    def close(self):
+        pass
+
+
+class FileSink(NullSink):
+    """Writes mixed audio to a WAV file (for tests and debugging)"""
+
+    def __init__(self, path: Path, realtime: bool = False):
+        super().__init__(realtime)
+        self.wav = wave.open(str(path), "wb")
+        self.wav.setnchannels(CHANNELS)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(SAMPLE_RATE)
+
+    def write(self, pcm: bytes):
+        self.wav.writeframes(pcm)
+        super().write(pcm)
+
+    def close(self):
+        self.wav.close()
+
+
+class PlayerSink:
+    """One long-lived raw PCM player process fed through its stdin"""
+
+    COMMANDS = [
+        ["pacat", "--playback", "--raw", "--format=s16le", f"--rate={SAMPLE_RATE}", f"--channels={CHANNELS}"],
+        ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(SAMPLE_RATE), "-c", str(CHANNELS)],
+    ]
+
+    def __init__(self):
+        for command in self.COMMANDS:
+            if shutil.which(command[0]):
+                self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                logger.info(f"Opened output stream via {command[0]}")
+                return
+        raise RuntimeError("No raw PCM player found (need pacat or aplay)")
+
+    def write(self, pcm: bytes):
+        self.process.stdin.write(pcm)
+        self.process.stdin.flush()
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except Exception:
+            self.process.kill()
+
+
+# Mixer ------------------------------------------------------------------
+
+class Voice:
+    def __init__(self, name: str, samples: array.array):
+        self.name = name
+        self.samples = samples
+        self.position = 0
+
+    def done(self) -> bool:
+        return self.position >= len(self.samples)
+
+
+class Mixer(threading.Thread):
+    """Produces output chunks from active voices according to a policy"""
+
+    def __init__(self, sink, policy: str = "mix"):
+        super().__init__(daemon=True)
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        self.sink = sink
+        self.policy = policy
+        self.voices: List[Voice] = []
+        self.pending: deque = deque()
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.stats = {"played": 0, "dropped": 0, "chunks": 0}
+
+    def submit(self, name: str, samples: array.array) -> str:
+        """Add a clip according to the policy; returns what happened"""
+        voice = Voice(name, samples)
+        with self.condition:
+            if self.policy == "queue" and self.voices:
+                self.pending.append(voice)
+                result = "queued"
+            elif self.policy == "interrupt":
+                self.stats["dropped"] += len(self.voices)
+                self.voices = [voice]
+                result = "playing"
+            else:
+                if len(self.voices) >= MAX_VOICES:
+                    self.voices.pop(0)
+                    self.stats["dropped"] += 1
+                self.voices.append(voice)
+                result = "playing"
+            self.condition.notify()
+        return result
+
+    def set_policy(self, policy: str):
+        """Switch policies; clips already playing or queued are kept"""
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        with self.condition:
+            self.policy = policy
+
+    def idle(self) -> bool:
+        """True when nothing is playing or queued"""
+        with self.condition:
+            return not self.voices and not self.pending
+
+    def mix_chunk(self) -> bytes:
+        """Sum one chunk of all active voices with clipping"""
+        length = CHUNK_FRAMES * CHANNELS
+        if np is not None:
+            acc = np.zeros(length, dtype=np.int32)
+            for voice in self.voices:
+                segment = np.frombuffer(voice.samples, dtype=np.int16)[voice.position:voice.position + length]
+                acc[:len(segment)] += segment
+                voice.position += length
+            return np.clip(acc, -32768, 32767).astype("<i2").tobytes()
+
+        acc = [0] * length
+        for voice in self.voices:
+            segment = voice.samples[voice.position:voice.position + length]
+            for i, sample in enumerate(segment):
+                acc[i] += sample
+            voice.position += length
+        out = array.array("h", (max(-32768, min(32767, s)) for s in acc))
+        if sys.byteorder == "big":
+            out.byteswap()
+        return out.tobytes()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.voices and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    break
+                pcm = self.mix_chunk()
+                finished = [v for v in self.voices if v.done()]
+                self.voices = [v for v in self.voices if not v.done()]
+                self.stats["played"] += len(finished)
+                if not self.voices and self.pending:
+                    self.voices.append(self.pending.popleft())
+                self.stats["chunks"] += 1
+            self.sink.write(pcm)
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+
+# Server -----------------------------------------------------------------
+
+class AudioServer:
+    def __init__(self, sink, policy: str = "mix", socket_path: Path = None):
+        """Initialize server with an output sink and mixing policy"""
+        self.socket_path = Path(socket_path or AUDIO_SERVER_SOCKET)
+        self.mixer = Mixer(sink, policy)
+        self.clips: Dict[str, tuple] = {}
+        self.sink = sink
+
+    def get_clip(self, path: str) -> array.array:
+        """Return a decoded clip, reloading only if the file changed"""
+        stat = Path(path).stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self.clips.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        samples = load_wav(Path(path))
+        self.clips[path] = (stamp, samples)
+        return samples
+
+    def follow_config(self, manager: SoundManager, policy_pinned: bool = False):
+        """Take the mixing policy from the sound config and hot-reload it on edits"""
+        def apply():
+            policy = manager.config.get("sound_settings", {}).get("audio_server_policy")
+            if policy_pinned or policy is None:
+                return
+            if policy not in POLICIES:
+                logger.error(f"Ignoring unknown audio_server_policy in sound config: {policy}")
+            elif policy != self.mixer.policy:
+                self.mixer.set_policy(policy)
+                logger.info(f"Mixing policy changed to {policy}")
+
+        apply()
+        manager.watch_config(apply)
+
+    def handle_request(self, request: dict) -> dict:
+        """Handle one decoded request"""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "policy": self.mixer.policy, "clips": len(self.clips)}
+        if op == "stats":
+            return dict(self.mixer.stats, ok=True, clips=len(self.clips), idle=self.mixer.idle())
+        if op == "play":
+            path = request.get("path", "")
+            if not path.lower().endswith(".wav"):
+                return {"ok": False, "error": "only WAV clips are supported"}
+            try:
+                samples = self.get_clip(path)
+            except (OSError, EOFError, ValueError, wave.Error) as e:
+                return {"ok": False, "error": str(e)}
+            return {"ok": True, "status": self.mixer.submit(Path(path).name, samples)}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve newline-delimited JSON requests from one client"""
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    # Decoding a new clip can take a moment; keep the loop responsive
+                    response = await loop.run_in_executor(None, self.handle_request, request)
+                except ValueError:
+                    response = {"ok": False, "error": "invalid JSON"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Listen on the Unix socket until cancelled"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self.mixer.start()
+        server = await asyncio.start_unix_server(self.handle_client, path=str(self.socket_path))
+        self.socket_path.chmod(0o600)
+        logger.info(f"Audio server listening on {self.socket_path} (policy: {self.mixer.policy})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.mixer.stop()
+            self.sink.close()
+            self.socket_path.unlink(missing_ok=True)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Audio server for Claude Code hook sounds")
+    parser.add_argument("--policy", choices=POLICIES,
+                        help="How to handle overlapping requests (default: audio_server_policy "
+                             "from the sound config, else mix; reloaded when the config changes)")
+    parser.add_argument("--sink", choices=["device", "null", "file"], default="device",
+                        help="Where mixed audio goes")
+    parser.add_argument("--output", default="audio_server_output.wav", help="WAV path for --sink file")
+    parser.add_argument("--socket", default=str(AUDIO_SERVER_SOCKET), help="Unix socket path")
+    args = parser.parse_args()
+
+    if args.sink == "null":
+        sink = NullSink()
+    elif args.sink == "file":
+        sink = FileSink(Path(args.output))
+    else:
+        sink = PlayerSink()
+
+    server = AudioServer(sink, args.policy or "mix", Path(args.socket))
+    server.follow_config(SoundManager(), policy_pinned=args.policy is not None)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        logger.info("Audio server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
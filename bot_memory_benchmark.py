@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the bot's client profiles.
+Feeds a simulated stream of gateway MESSAGE_CREATE events through discord.py's
+connection state (no network) and reports RSS growth and Python allocations
+for each profile, each measured in a fresh process.
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+import resource
+import subprocess
+import tracemalloc
+from typing import Dict
+
+import discord
+
+from bot_profiles import BOT_PROFILES, client_options
+
+# Configuration
+GUILD_ID = "100"
+CHANNEL_ID = "200"
+
+
+def rss_kib() -> int:
+    """Current resident set size in KiB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def guild_payload() -> Dict:
+    """Minimal GUILD_CREATE payload with one text channel"""
+    return {
+        "id": GUILD_ID, "name": "benchmark", "member_count": 1, "large": False,
+        "unavailable": False, "features": [], "emojis": [], "members": [],
+        "channels": [{"id": CHANNEL_ID, "type": 0, "name": "general", "position": 0,
+                      "permission_overwrites": []}],
+        "roles": [{"id": GUILD_ID, "name": "@everyone", "permissions": "0", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+    }
+
+
+def message_payload(i: int, authors: int, content_size: int) -> Dict:
+    """MESSAGE_CREATE payload from one of `authors` users"""
+    author_id = str(1000 + i % authors)
+    return {
+        "id": str(10_000_000 + i), "channel_id": CHANNEL_ID, "guild_id": GUILD_ID,
+        "author": {"id": author_id, "username": f"user{author_id}", "discriminator": "0",
+                   "avatar": None, "global_name": None},
+        "member": {"roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False},
+        "content": f"claude: message {i} " + "x" * content_size,
+        "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None,
+        "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+        "attachments": [], "embeds": [], "pinned": False, "type": 0,
+    }
+
+
+async def simulate(profile: str, messages: int, authors: int, content_size: int) -> Dict:
+    """Run the message stream through a client configured with a profile"""
+    tracemalloc.start()
+    rss_before = rss_kib()
+    client = discord.Client(**client_options(profile))
+    state = client._connection
+    state.parse_guild_create(guild_payload())
+
+    for i in range(messages):
+        state.parse_message_create(message_payload(i, authors, content_size))
+        if i % 500 == 0:
+            await asyncio.sleep(0)  # let dispatched events run
+    await asyncio.sleep(0)
+
+    current, peak = tracemalloc.get_traced_memory()
+    rss_after = rss_kib()
+    tracemalloc.stop()
+    await client.close()
+
+    guild = state._get_guild(int(GUILD_ID))
+    return {
+        "profile": profile,
+        "messages": messages,
+        "cached_messages": len(state._messages or []),
+        "cached_members": len(guild._members) if guild else 0,
+        "rss_growth_kib": rss_after - rss_before,
+        "retained_kib": current // 1024,
+        "peak_alloc_kib": peak // 1024,
+    }
+
+
+def run_profile(profile: str, args) -> Dict:
+    """Measure one profile in a fresh interpreter so RSS is not shared"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", profile,
+         "--messages", str(args.messages), "--authors", str(args.authors),
+         "--content-size", str(args.content_size)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Compare bot client profiles by memory use")
+    parser.add_argument("--messages", type=int, default=20000, help="Simulated messages")
+    parser.add_argument("--authors", type=int, default=200, help="Distinct message authors")
+    parser.add_argument("--content-size", type=int, default=200, help="Characters per message")
+    parser.add_argument("--profiles", nargs="*", default=list(BOT_PROFILES), choices=BOT_PROFILES)
+    parser.add_argument("--json", dest="json_output", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(simulate(args.child, args.messages, args.authors, args.content_size))
+        print(json.dumps(result))
+        return 0
+
+    results = [run_profile(profile, args) for profile in args.profiles]
+    if args.json_output:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"🧠 Bot memory benchmark: {args.messages} messages from {args.authors} authors")
+    print("=" * 40)
+    header = f"{'Profile':<12} {'Msgs cached':>11} {'Members':>8} {'RSS +KiB':>9} {'Retained KiB':>13} {'Peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['profile']:<12} {r['cached_messages']:>11} {r['cached_members']:>8} "
+              f"{r['rss_growth_kib']:>9} {r['retained_kib']:>13} {r['peak_alloc_kib']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Runtime metrics for the Discord bot.
+Timing windows with p50/p99 for handlers and REST calls, an event-loop lag
+sampler, rate-limit counters from discord.py's HTTP log, and reporting via a
+periodic log line and an optional local JSON endpoint.
+"""
+
+import math
+import time
+import asyncio
+import logging
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+WINDOW_SIZE = 2048  # most recent samples kept per metric
+LOOP_LAG_INTERVAL = 0.25  # seconds between loop lag samples
+REPORT_INTERVAL = 60  # seconds between metrics log lines
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class TimingWindow:
+    def __init__(self, size: int = WINDOW_SIZE):
+        """Rolling window of durations in seconds"""
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def observe(self, seconds: float):
+        """Record one duration"""
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict:
+        """Count and p50/p99/max in milliseconds over the window"""
+        values = sorted(self.samples)
+        return {
+            "count": self.count,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        }
+
+
+class RateLimitLogCounter(logging.Handler):
+    """Counts rate-limit warnings emitted by discord.http"""
+
+    def __init__(self, metrics: "BotMetrics"):
+        super().__init__(level=logging.WARNING)
+        self.metrics = metrics
+
+    def emit(self, record: logging.LogRecord):
+        message = str(record.msg)
+        if message.startswith("Global rate limit"):
+            self.metrics.increment("rate_limit_global")
+        elif "responded with 429" in message:
+            self.metrics.increment("rate_limit_429")
+
+
+class BotMetrics:
+    def __init__(self):
+        """Empty metric registry"""
+        self.timings: Dict[str, TimingWindow] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+        self.tasks = []
+        self.runner = None
+        self.rate_limit_handler: Optional[RateLimitLogCounter] = None
+
+    def observe(self, name: str, seconds: float):
+        """Record a duration for a metric"""
+        window = self.timings.get(name)
+        if window is None:
+            window = self.timings[name] = TimingWindow()
+        window.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1):
+        """Bump a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time a block (works around awaits too), counting exceptions as errors"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment(f"{name}_errors")
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict:
+        """All metrics as a JSON-serializable dict"""
+        return {
+            "uptime_s": round(time.time() - self.started),
+            "timings": {name: window.summary() for name, window in sorted(self.timings.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def format_line(self) -> str:
+        """Compact one-line summary for the log"""
+        parts = [f"{name} n={s['count']} p50={s['p50_ms']}ms p99={s['p99_ms']}ms"
+                 for name, s in self.snapshot()["timings"].items()]
+        parts += [f"{name}={value}" for name, value in sorted(self.counters.items())]
+        return "; ".join(parts) or "no samples yet"
+
+    def instrument_http(self, http_client):
+        """Time every REST request made through discord.py's HTTP client"""
+        original_request = http_client.request
+
+        @functools.wraps(original_request)
+        async def timed_request(route, **kwargs):
+            with self.timer(f"rest {route.method} {route.path}"):
+                return await original_request(route, **kwargs)
+
+        http_client.request = timed_request
+
+        if self.rate_limit_handler is None:
+            self.rate_limit_handler = RateLimitLogCounter(self)
+            logging.getLogger("discord.http").addHandler(self.rate_limit_handler)
+
+    async def sample_loop_lag(self, interval: float = LOOP_LAG_INTERVAL):
+        """Measure how late the event loop wakes us up"""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.observe("loop_lag", max(0.0, loop.time() - expected))
+
+    async def report_periodically(self, interval: float = REPORT_INTERVAL):
+        """Log a metrics line every interval"""
+        while True:
+            await asyncio.sleep(interval)
+            logger.info(f"Metrics: {self.format_line()}")
+
+    async def start(self, port: Optional[int] = None, report_interval: float = REPORT_INTERVAL):
+        """Start the lag sampler, periodic log line and (if port given) the local endpoint"""
+        self.tasks.append(asyncio.create_task(self.sample_loop_lag()))
+        if report_interval > 0:
+            self.tasks.append(asyncio.create_task(self.report_periodically(report_interval)))
+        if port:
+            from aiohttp import web
+
+            async def handle_metrics(request):
+                return web.json_response(self.snapshot())
+
+            app = web.Application()
+            app.router.add_get("/metrics", handle_metrics)
+            self.runner = web.AppRunner(app)
+            await self.runner.setup()
+            await web.TCPSite(self.runner, "127.0.0.1", port).start()
+            logger.info(f"Bot metrics available at http://127.0.0.1:{port}/metrics")
+
+    async def stop(self):
+        """Cancel background tasks and close the endpoint"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+        if self.rate_limit_handler:
+            logging.getLogger("discord.http").removeHandler(self.rate_limit_handler)
+            self.rate_limit_handler = None
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+discord.Client configuration profiles for the command bot.
+The low-memory profile keeps only what the bot uses: guild and DM messages
+with their content, no message cache, no member cache and no chunking. The
+interactions profile goes further for slash-command-only use: no intents at
+all, so the gateway sends no message traffic.
+"""
+
+from typing import Dict
+
+import discord
+
+# Configuration
+BOT_PROFILES = ("default", "low_memory", "interactions")
+
+
+def client_options(profile: str = "default") -> Dict:
+    """Keyword arguments for discord.Client for a profile"""
+    if profile == "default":
+        intents = discord.Intents.default()
+        intents.message_content = True
+        return {"intents": intents}
+
+    if profile == "low_memory":
+        intents = discord.Intents.none()
+        intents.guilds = True  # channel objects for replies; one guild is small
+        intents.guild_messages = True
+        intents.dm_messages = True
+        intents.message_content = True
+        return {
+            "intents": intents,
+            "max_messages": None,  # replies carry their referenced message
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+        }
+
+    if profile == "interactions":
+        # Interactions are delivered regardless of intents; message commands
+        # and replies to notifications stop working
+        return {
+            "intents": discord.Intents.none(),
+            "max_messages": None,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+        }
+
+    raise ValueError(f"Unknown bot profile: {profile} (expected one of {', '.join(BOT_PROFILES)})")
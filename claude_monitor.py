@@ -5,13 +5,15 @@ Watches for new commands and executes them via Claude Code.
 """
 
 import os
-import json
 import time
 import subprocess
 import logging
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from command_queue import get_command_queue, make_command_id
+from attachment_store import (COMMAND_FILES_DIR, safe_filename, describe_attachments, link_attachments,
+                              remove_linked_attachments)
 
 # Set up logging
 logging.basicConfig(
@@ -21,8 +23,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Configuration
-COMMAND_QUEUE_FILE = Path.home() / ".claude" / "command_queue.json"
-PROCESSED_COMMANDS_FILE = Path.home() / ".claude" / "processed_commands.json"
 CLAUDE_CODE_COMMAND = "claude-code"  # Update this to your actual Claude Code command
 # Examples: "claude", "/usr/local/bin/claude-code", "npx claude-cli"
 POLL_INTERVAL = 2  # seconds
@@ -30,58 +30,21 @@ MAX_CONCURRENT_PROCESSES = 1  # Only run one Claude Code instance at a time
 
 class ClaudeMonitor:
     def __init__(self):
-        self.processed_commands = self.load_processed_commands()
+        self.command_queue = get_command_queue()
         self.running_processes: Dict[str, subprocess.Popen] = {}
-        
-    def load_processed_commands(self) -> set:
-        """Load list of already processed command IDs"""
-        try:
-            if PROCESSED_COMMANDS_FILE.exists():
-                with open(PROCESSED_COMMANDS_FILE, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('processed_ids', []))
-        except Exception as e:
-            logger.error(f"Error loading processed commands: {e}")
-        return set()
-    
-    def save_processed_commands(self):
-        """Save list of processed command IDs"""
-        try:
-            PROCESSED_COMMANDS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            data = {
-                'processed_ids': list(self.processed_commands),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(PROCESSED_COMMANDS_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving processed commands: {e}")
     
     def get_command_id(self, command_entry: dict) -> str:
         """Generate unique ID for a command"""
-        return f"{command_entry['timestamp']}_{command_entry['message_id']}"
+        return make_command_id(command_entry)
     
-    def load_command_queue(self) -> List[dict]:
-        """Load pending commands from queue file"""
-        try:
-            if COMMAND_QUEUE_FILE.exists():
-                with open(COMMAND_QUEUE_FILE, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading command queue: {e}")
-        return []
+    def command_files_dir(self, command_id: str) -> Path:
+        """Directory holding links to one command's attachments"""
+        return COMMAND_FILES_DIR / safe_filename(command_id)
     
-    def get_pending_commands(self) -> List[dict]:
-        """Get commands that haven't been processed yet"""
-        all_commands = self.load_command_queue()
-        pending = []
-        
-        for command in all_commands:
-            command_id = self.get_command_id(command)
-            if command_id not in self.processed_commands:
-                pending.append(command)
-        
-        return pending
+    def finish_command(self, command_id: str, status: str = "done"):
+        """Mark a command finished and drop its attachment links"""
+        self.command_queue.complete(command_id, status)
+        remove_linked_attachments(self.command_files_dir(command_id))
     
     def can_run_command(self) -> bool:
         """Check if we can run a new command (not exceeding concurrent limit)"""
@@ -91,9 +54,56 @@ class ClaudeMonitor:
             if process.poll() is not None:  # Process finished
                 del self.running_processes[cmd_id]
                 logger.info(f"Command {cmd_id} finished with return code {process.returncode}")
+                self.finish_command(cmd_id, "done" if process.returncode == 0 else "failed")
         
         return len(self.running_processes) < MAX_CONCURRENT_PROCESSES
     
+    def handle_cancel_requests(self):
+        """Stop running commands that were cancelled from Discord"""
+        for cmd_id in self.command_queue.cancel_requests():
+            process = self.running_processes.pop(cmd_id, None)
+            if process is None:
+                continue  # not started by this monitor
+            logger.info(f"Cancelling command {cmd_id}")
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            self.finish_command(cmd_id, "cancelled")
+    
+    def build_claude_command(self, command_entry: dict) -> Tuple[List[str], Path]:
+        """Command line and working directory, resuming the originating session when known"""
+        claude_cmd = [CLAUDE_CODE_COMMAND]
+        cwd = Path.home()  # Default to home directory
+        
+        session = command_entry.get("session") or {}
+        session_cwd = Path(session["cwd"]) if session.get("cwd") else None
+        if session_cwd and session_cwd.is_dir():
+            cwd = session_cwd
+            transcript = session.get("transcript_path")
+            # A session can only be resumed while its transcript still exists
+            if session.get("session_id") and (not transcript or Path(transcript).exists()):
+                claude_cmd += ["--resume", session["session_id"]]
+        
+        prompt = command_entry['command']
+        attachments = [ref for ref in command_entry.get("attachments") or []
+                       if Path(ref["path"]).is_file()]
+        if len(attachments) < len(command_entry.get("attachments") or []):
+            logger.warning("Some attachments are no longer in the attachment store")
+        if attachments:
+            # Claude may read this command's files, not the rest of the store
+            files_dir = self.command_files_dir(self.get_command_id(command_entry))
+            attachments = link_attachments(attachments, files_dir)
+            claude_cmd += ["--add-dir", str(files_dir)]
+            prompt += "\n\n" + describe_attachments(attachments)
+        
+        claude_cmd += [
+            "-p",  # Non-interactive mode
+            prompt
+        ]
+        return claude_cmd, cwd
+    
     def execute_command(self, command_entry: dict):
         """Execute a command via Claude Code"""
         command_id = self.get_command_id(command_entry)
@@ -101,18 +111,12 @@ class ClaudeMonitor:
         
         try:
             logger.info(f"Executing command {command_id}: {command_text}")
-            
-            # Mark as processed immediately to avoid duplicates
-            self.processed_commands.add(command_id)
-            self.save_processed_commands()
+            if command_entry.get("session"):
+                logger.info(f"Command {command_id} belongs to session {command_entry['session'].get('session_id')}")
             
             if self.claude_available:
                 # Real Claude Code execution
-                claude_cmd = [
-                    CLAUDE_CODE_COMMAND,
-                    "-p",  # Non-interactive mode
-                    command_text
-                ]
+                claude_cmd, cwd = self.build_claude_command(command_entry)
                 
                 # Set up environment
                 env = os.environ.copy()
@@ -124,22 +128,25 @@ class ClaudeMonitor:
                     stderr=subprocess.PIPE,
                     text=True,
                     env=env,
-                    cwd=Path.home()  # Default to home directory
+                    cwd=cwd
                 )
                 
                 # Store running process
                 self.running_processes[command_id] = process
-                logger.info(f"Started Claude Code for command {command_id}")
+                logger.info(f"Started Claude Code for command {command_id} in {cwd}")
             else:
                 # Test mode simulation
                 self.test_mode_simulation(command_text)
                 logger.info(f"Simulated execution completed for command {command_id}")
+                self.finish_command(command_id)
             
         except FileNotFoundError:
             logger.error(f"Claude Code command not found: {CLAUDE_CODE_COMMAND}")
             logger.error("Make sure Claude Code is installed and in your PATH")
+            self.finish_command(command_id, "failed")
         except Exception as e:
             logger.error(f"Error executing command {command_id}: {e}")
+            self.finish_command(command_id, "failed")
     
     def check_claude_code_available(self) -> bool:
         """Check if Claude Code is available in the system"""
@@ -193,22 +200,27 @@ class ClaudeMonitor:
         else:
             logger.info(f"Claude Code is available at: {CLAUDE_CODE_COMMAND}")
         
-        logger.info(f"Monitoring queue file: {COMMAND_QUEUE_FILE}")
+        logger.info(f"Monitoring command queue: {type(self.command_queue).__name__}")
+        recovered = self.command_queue.recover()
+        if any(recovered.values()):
+            # Left behind by a monitor that stopped without finishing them
+            logger.warning(f"Recovered interrupted commands: {recovered.get('pending', 0)} requeued, "
+                           f"{recovered.get('cancelled', 0)} cancelled")
+        # Links left by commands that were running when a previous monitor stopped
+        remove_linked_attachments(COMMAND_FILES_DIR)
         logger.info(f"Poll interval: {POLL_INTERVAL} seconds")
         self.claude_available = claude_available
         
         try:
             while True:
-                # Get pending commands
-                pending_commands = self.get_pending_commands()
+                self.handle_cancel_requests()
                 
-                # Execute commands if we have capacity
-                for command in pending_commands:
-                    if self.can_run_command():
-                        self.execute_command(command)
-                    else:
-                        logger.info("Max concurrent processes reached, waiting...")
+                # Claim and execute commands while we have capacity
+                while self.can_run_command():
+                    claimed = self.command_queue.claim(1)
+                    if not claimed:
                         break
+                    self.execute_command(claimed[0])
                 
                 # Wait before next poll
                 time.sleep(POLL_INTERVAL)
@@ -227,6 +239,8 @@ class ClaudeMonitor:
                     
         except Exception as e:
             logger.error(f"Monitor error: {e}")
+        finally:
+            self.command_queue.close()
         
         logger.info("Monitor stopped")
 
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Command queue backends shared by the Discord bot and the command monitor.
+The SQLite backend (WAL mode) gives O(1) enqueue, indexed dequeue by status
+and atomic claims; the JSON backend keeps the original file format.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+COMMAND_QUEUE_FILE = Path.home() / ".claude" / "command_queue.json"
+PROCESSED_COMMANDS_FILE = Path.home() / ".claude" / "processed_commands.json"
+COMMAND_QUEUE_DB = Path.home() / ".claude" / "command_queue.db"
+MAX_QUEUE_ENTRIES = 100  # JSON backend keeps only the newest entries
+MAX_FINISHED_ROWS = 1000  # SQLite backend prunes older finished commands
+WRITE_BATCH_WINDOW = 0.005  # seconds the async writer waits to group a commit
+WRITE_BATCH_MAX = 100
+# .env files shared by the bot and the monitor; later files override earlier ones
+ENV_FILES = [
+    Path.home() / ".claude" / "hooks" / ".env",
+    Path("/home/charlie/.claude/hooks/.env"),
+]
+
+
+def load_env_vars() -> Dict[str, str]:
+    """Variables from the hook .env files and ./.env"""
+    env_vars = {}
+    for env_path in ENV_FILES + [Path.cwd() / ".env"]:
+        if env_path.exists():
+            try:
+                with open(env_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if '=' in line and not line.startswith('#'):
+                            key, value = line.split('=', 1)
+                            env_vars[key] = value
+            except Exception as e:
+                logger.error(f"Error reading {env_path}: {e}")
+    return env_vars
+
+
+def configured_backend(env_vars: Optional[Dict[str, str]] = None) -> str:
+    """COMMAND_QUEUE_BACKEND from the .env files, then the environment (default sqlite)"""
+    if env_vars is None:
+        env_vars = load_env_vars()
+    return (env_vars.get("COMMAND_QUEUE_BACKEND") or os.getenv("COMMAND_QUEUE_BACKEND") or "sqlite").lower()
+
+
+def make_command_id(command_entry: dict) -> str:
+    """Generate unique ID for a command"""
+    return f"{command_entry['timestamp']}_{command_entry['message_id']}"
+
+
+class CommandQueue:
+    """Interface for command queue backends"""
+
+    def enqueue(self, command_entry: dict) -> str:
+        """Add a command and return its ID"""
+        raise NotImplementedError
+
+    def enqueue_many(self, command_entries: List[dict]) -> List[str]:
+        """Add several commands in one commit"""
+        return [self.enqueue(entry) for entry in command_entries]
+
+    def claim(self, limit: int = 1) -> List[dict]:
+        """Atomically take up to `limit` pending commands and mark them running"""
+        raise NotImplementedError
+
+    def complete(self, command_id: str, status: str = "done"):
+        """Mark a claimed command as finished"""
+        raise NotImplementedError
+
+    def pending(self) -> List[dict]:
+        """Commands that have not been claimed yet"""
+        raise NotImplementedError
+
+    def get(self, command_id: str) -> Optional[dict]:
+        """A command with its "command_id" and "status", or None if unknown"""
+        raise NotImplementedError
+
+    def recent(self, limit: int = 10, user_id: Optional[int] = None) -> List[dict]:
+        """Newest commands first (optionally one user's) with their ID and status"""
+        raise NotImplementedError
+
+    def counts(self) -> Dict[str, int]:
+        """Number of commands per status"""
+        raise NotImplementedError
+
+    def cancel(self, command_id: str) -> Optional[str]:
+        """Cancel a pending command or ask the monitor to stop a running one.
+
+        Returns the new status ("cancelled" or "cancelling"), or None if the
+        command is unknown or already finished.
+        """
+        raise NotImplementedError
+
+    def cancel_requests(self) -> List[str]:
+        """IDs of running commands whose cancellation was requested"""
+        return []
+
+    def recover(self) -> Dict[str, int]:
+        """Release commands left claimed by a monitor that died.
+
+        Running commands go back to pending and pending cancellations are
+        completed; returns how many rows were changed per new status.
+        """
+        return {}
+
+    def close(self):
+        """Release resources"""
+
+
+class JsonFileQueue(CommandQueue):
+    """Original command_queue.json + processed_commands.json format"""
+
+    def __init__(self, queue_file: Path = None, processed_file: Path = None,
+                 max_entries: int = MAX_QUEUE_ENTRIES):
+        self.queue_file = Path(queue_file or COMMAND_QUEUE_FILE)
+        self.processed_file = Path(processed_file or PROCESSED_COMMANDS_FILE)
+        self.max_entries = max_entries
+        self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+
+    def _read_json(self, path: Path, default):
+        try:
+            if path.exists():
+                with open(path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading {path}: {e}")
+        return default
+
+    def _write_json(self, path: Path, data):
+        tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, path)
+
+    def _processed_ids(self) -> set:
+        return set(self._read_json(self.processed_file, {}).get('processed_ids', []))
+
+    def _mark_processed(self, command_ids: List[str]):
+        processed = self._processed_ids() | set(command_ids)
+        self._write_json(self.processed_file, {
+            'processed_ids': list(processed),
+            'last_updated': datetime.now().isoformat()
+        })
+
+    def enqueue(self, command_entry: dict) -> str:
+        return self.enqueue_many([command_entry])[0]
+
+    def enqueue_many(self, command_entries: List[dict]) -> List[str]:
+        queue = self._read_json(self.queue_file, [])
+        queue.extend(command_entries)
+
+        # Keep only the newest commands
+        if len(queue) > self.max_entries:
+            queue = queue[-self.max_entries:]
+
+        self._write_json(self.queue_file, queue)
+        return [make_command_id(entry) for entry in command_entries]
+
+    def pending(self) -> List[dict]:
+        processed = self._processed_ids()
+        return [c for c in self._read_json(self.queue_file, [])
+                if make_command_id(c) not in processed]
+
+    def claim(self, limit: int = 1) -> List[dict]:
+        claimed = self.pending()[:limit]
+        if claimed:
+            self._mark_processed([make_command_id(c) for c in claimed])
+        return claimed
+
+    def complete(self, command_id: str, status: str = "done"):
+        # Claimed commands are already recorded as processed
+        pass
+
+    def _with_status(self, entries: List[dict]) -> List[dict]:
+        # This format only knows whether a command was taken, not how it ended
+        processed = self._processed_ids()
+        return [dict(entry, command_id=make_command_id(entry),
+                     status="processed" if make_command_id(entry) in processed else "pending")
+                for entry in entries]
+
+    def get(self, command_id: str) -> Optional[dict]:
+        queue = self._read_json(self.queue_file, [])
+        matches = [entry for entry in queue if make_command_id(entry) == command_id]
+        return self._with_status(matches)[0] if matches else None
+
+    def recent(self, limit: int = 10, user_id: Optional[int] = None) -> List[dict]:
+        queue = self._read_json(self.queue_file, [])
+        if user_id is not None:
+            queue = [entry for entry in queue if entry.get("user_id") == user_id]
+        return self._with_status(queue[::-1][:limit])
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self._with_status(self._read_json(self.queue_file, [])):
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def cancel(self, command_id: str) -> Optional[str]:
+        # Only pending commands can be cancelled; marking them processed
+        # keeps the monitor from claiming them
+        if any(make_command_id(entry) == command_id for entry in self.pending()):
+            self._mark_processed([command_id])
+            return "cancelled"
+        return None
+
+
+class SqliteQueue(CommandQueue):
+    """SQLite (WAL) backend with indexed status lookups and atomic claims"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS commands (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            command_id TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL DEFAULT 'pending',
+            created_at REAL NOT NULL,
+            claimed_at REAL,
+            finished_at REAL,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_commands_status ON commands(status, id);
+    """
+
+    def __init__(self, db_file: Path = None):
+        self.db_file = Path(db_file or COMMAND_QUEUE_DB)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), timeout=10, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=10000")
+        self.conn.executescript(self.SCHEMA)
+
+    def enqueue(self, command_entry: dict) -> str:
+        command_id = make_command_id(command_entry)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO commands (command_id, created_at, payload) VALUES (?, ?, ?)",
+            (command_id, time.time(), json.dumps(command_entry))
+        )
+        return command_id
+
+    def enqueue_many(self, command_entries: List[dict]) -> List[str]:
+        rows = [(make_command_id(e), time.time(), json.dumps(e)) for e in command_entries]
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO commands (command_id, created_at, payload) VALUES (?, ?, ?)",
+                rows
+            )
+        return [row[0] for row in rows]
+
+    def pending(self) -> List[dict]:
+        rows = self.conn.execute(
+            "SELECT payload FROM commands WHERE status = 'pending' ORDER BY id"
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def claim(self, limit: int = 1) -> List[dict]:
+        # BEGIN IMMEDIATE takes the write lock up front, so two claimers can
+        # never select the same pending rows
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT id, payload FROM commands WHERE status = 'pending' ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+            if rows:
+                self.conn.executemany(
+                    "UPDATE commands SET status = 'running', claimed_at = ? WHERE id = ?",
+                    [(time.time(), row[0]) for row in rows]
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [json.loads(row[1]) for row in rows]
+
+    def complete(self, command_id: str, status: str = "done"):
+        self.conn.execute(
+            "UPDATE commands SET status = ?, finished_at = ? WHERE command_id = ?",
+            (status, time.time(), command_id)
+        )
+        # Bound the table: drop the oldest finished commands
+        self.conn.execute(
+            """DELETE FROM commands WHERE status NOT IN ('pending', 'running', 'cancelling') AND id <= (
+                   SELECT id FROM commands WHERE status NOT IN ('pending', 'running', 'cancelling')
+                   ORDER BY id DESC LIMIT 1 OFFSET ?)""",
+            (MAX_FINISHED_ROWS,)
+        )
+
+    def _row_entry(self, row) -> dict:
+        command_id, status, payload = row
+        return dict(json.loads(payload), command_id=command_id, status=status)
+
+    def get(self, command_id: str) -> Optional[dict]:
+        row = self.conn.execute(
+            "SELECT command_id, status, payload FROM commands WHERE command_id = ?", (command_id,)
+        ).fetchone()
+        return self._row_entry(row) if row else None
+
+    def recent(self, limit: int = 10, user_id: Optional[int] = None) -> List[dict]:
+        if user_id is None:
+            rows = self.conn.execute(
+                "SELECT command_id, status, payload FROM commands ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                """SELECT command_id, status, payload FROM commands
+                   WHERE json_extract(payload, '$.user_id') = ? ORDER BY id DESC LIMIT ?""",
+                (user_id, limit)
+            ).fetchall()
+        return [self._row_entry(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM commands GROUP BY status").fetchall())
+
+    def cancel(self, command_id: str) -> Optional[str]:
+        # Same write lock as claim, so a command is either cancelled before
+        # the monitor takes it or flagged for the monitor to stop
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT status FROM commands WHERE command_id = ?", (command_id,)
+            ).fetchone()
+            new_status = {"pending": "cancelled", "running": "cancelling"}.get(row[0]) if row else None
+            if new_status == "cancelled":
+                self.conn.execute(
+                    "UPDATE commands SET status = 'cancelled', finished_at = ? WHERE command_id = ?",
+                    (time.time(), command_id)
+                )
+            elif new_status == "cancelling":
+                self.conn.execute(
+                    "UPDATE commands SET status = 'cancelling' WHERE command_id = ?", (command_id,)
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return new_status
+
+    def cancel_requests(self) -> List[str]:
+        rows = self.conn.execute(
+            "SELECT command_id FROM commands WHERE status = 'cancelling' ORDER BY id"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def recover(self) -> Dict[str, int]:
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            requeued = self.conn.execute(
+                "UPDATE commands SET status = 'pending', claimed_at = NULL WHERE status = 'running'"
+            ).rowcount
+            cancelled = self.conn.execute(
+                "UPDATE commands SET status = 'cancelled', finished_at = ? WHERE status = 'cancelling'",
+                (time.time(),)
+            ).rowcount
+        return {"pending": requeued, "cancelled": cancelled}
+
+    def close(self):
+        self.conn.close()
+
+
+class AsyncQueueWriter:
+    """Single background task that persists commands with group commit.
+
+    Entries submitted within WRITE_BATCH_WINDOW of each other are written
+    with one enqueue_many call in an executor, so the event loop never
+    blocks on disk and writes from concurrent handlers never interleave.
+    """
+
+    def __init__(self, command_queue: CommandQueue, batch_window: float = WRITE_BATCH_WINDOW,
+                 max_batch: int = WRITE_BATCH_MAX):
+        self.command_queue = command_queue
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pending: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the writer task on the running loop"""
+        self.pending = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def submit(self, command_entry: dict) -> str:
+        """Queue a command and return its ID once it has been committed"""
+        if self.task is None or self.task.done():
+            raise RuntimeError("Command queue writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self.pending.put((command_entry, future))
+        return await future
+
+    async def run(self):
+        """Collect batches and commit them until stopped"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = [await self.pending.get()]
+            if self.batch_window > 0:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self.pending.empty():
+                batch.append(self.pending.get_nowait())
+
+            if None in batch:
+                stopping = True
+                batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
+
+            try:
+                command_ids = await loop.run_in_executor(
+                    None, self.command_queue.enqueue_many, [entry for entry, _ in batch])
+            except Exception as e:
+                logger.error(f"Error committing {len(batch)} queued commands: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), command_id in zip(batch, command_ids):
+                if not future.done():
+                    future.set_result(command_id)
+
+    async def stop(self):
+        """Commit everything already submitted, then stop the task"""
+        if self.task is None or self.task.done():
+            return
+        await self.pending.put(None)
+        await self.task
+
+
+def get_command_queue(backend: Optional[str] = None) -> CommandQueue:
+    """Create the configured queue backend (COMMAND_QUEUE_BACKEND: sqlite or json)"""
+    backend = (backend or configured_backend()).lower()
+    if backend == "json":
+        return JsonFileQueue()
+    if backend == "sqlite":
+        return SqliteQueue()
+    raise ValueError(f"Unknown command queue backend: {backend}")
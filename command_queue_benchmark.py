@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Command queue backend benchmark.
+Runs concurrent writer processes against the JSON file and SQLite backends,
+then concurrent claimers, and reports throughput, lost commands and commands
+claimed more than once.
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+from collections import Counter
+from typing import Dict
+
+from command_queue import JsonFileQueue, SqliteQueue, make_command_id
+
+
+def open_queue(backend: str, directory: Path):
+    """Open a benchmark queue in a scratch directory"""
+    if backend == "json":
+        # No entry cap, so every missing command is a lost update
+        return JsonFileQueue(directory / "command_queue.json",
+                             directory / "processed_commands.json", max_entries=sys.maxsize)
+    return SqliteQueue(directory / "command_queue.db")
+
+
+def writer(backend: str, directory: str, writer_id: int, count: int, start):
+    """Enqueue `count` commands once all writers are ready"""
+    queue = open_queue(backend, Path(directory))
+    start.wait()
+    for i in range(count):
+        queue.enqueue({
+            "timestamp": f"w{writer_id}",
+            "message_id": i,
+            "command": f"benchmark command {writer_id}/{i}",
+        })
+    queue.close()
+
+
+def claimer(backend: str, directory: str, start, results):
+    """Claim commands one at a time until the queue is empty"""
+    queue = open_queue(backend, Path(directory))
+    start.wait()
+    claimed = []
+    while True:
+        batch = queue.claim(1)
+        if not batch:
+            break
+        claimed.append(make_command_id(batch[0]))
+    queue.close()
+    results.put(claimed)
+
+
+def run_processes(target, args_list, start):
+    """Start processes and release them together; returns them and the start time"""
+    processes = [multiprocessing.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    start.set()
+    return processes, started
+
+
+def bench_backend(backend: str, writers: int, per_writer: int, claimers: int) -> Dict:
+    """Benchmark one backend in a fresh directory"""
+    with tempfile.TemporaryDirectory() as directory:
+        open_queue(backend, Path(directory)).close()
+        expected = writers * per_writer
+
+        start = multiprocessing.Event()
+        processes, started = run_processes(
+            writer, [(backend, directory, w, per_writer, start) for w in range(writers)], start)
+        for process in processes:
+            process.join()
+        write_elapsed = time.perf_counter() - started
+
+        queue = open_queue(backend, Path(directory))
+        stored = len(queue.pending())
+        queue.close()
+
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes, started = run_processes(
+            claimer, [(backend, directory, start, results) for _ in range(claimers)], start)
+        claimed = []
+        for _ in processes:
+            claimed.extend(results.get())
+        for process in processes:
+            process.join()
+        claim_elapsed = time.perf_counter() - started
+
+    counts = Counter(claimed)
+    return {
+        "backend": backend,
+        "enqueued": expected,
+        "stored": stored,
+        "lost": expected - stored,
+        "enqueue_per_sec": round(expected / write_elapsed, 1),
+        "claimed": len(claimed),
+        "claimed_twice": sum(1 for n in counts.values() if n > 1),
+        "claim_per_sec": round(len(claimed) / claim_elapsed, 1) if claimed else 0.0,
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark command queue backends")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer processes")
+    parser.add_argument("--commands", type=int, default=200, help="Commands per writer")
+    parser.add_argument("--claimers", type=int, default=4, help="Concurrent claimer processes")
+    parser.add_argument("--backends", nargs="*", default=["json", "sqlite"], choices=["json", "sqlite"])
+    parser.add_argument("--json", dest="json_output", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [bench_backend(b, args.writers, args.commands, args.claimers) for b in args.backends]
+    if args.json_output:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"📬 Command queue benchmark: {args.writers} writers × {args.commands} commands, "
+          f"{args.claimers} claimers")
+    print("=" * 40)
+    header = f"{'Backend':<8} {'Stored':>8} {'Lost':>6} {'Enqueue/s':>10} {'Claimed':>8} {'Twice':>6} {'Claim/s':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['backend']:<8} {r['stored']:>8} {r['lost']:>6} {r['enqueue_per_sec']:>10} "
+              f"{r['claimed']:>8} {r['claimed_twice']:>6} {r['claim_per_sec']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Command policy engine for commands received over Discord.
+Rules are compiled into one case-insensitive regex that finds every match in
+a single pass; each rule applies a configurable action (reject, strip or
+escape) and the result reports which rules fired. Only the rules whose
+required literal occurs in a command are scanned for, so ordinary commands
+usually skip the regex entirely.
+"""
+
+import re
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+COMMAND_POLICY_FILE = Path(__file__).parent / "command_policy.json"
+MAX_COMMAND_LENGTH = 500
+REMOVED_MARKER = "[REMOVED]"
+MAX_COMPILED_SUBSETS = 256  # cached regexes for combinations of rules
+ACTIONS = ("reject", "strip", "escape")
+SHELL_METACHARACTERS = re.compile(r"([\\$`|&;<>(){}'\"*?!#~])")
+ZERO_WIDTH_ESCAPES = set("bBAZ")
+SINGLE_CHAR_ESCAPES = set("dDsSwWntrfva")  # classes and control characters
+
+# Used when command_policy.json is missing; patterns must not nest unbounded
+# quantifiers, so matching stays linear in the command length
+DEFAULT_RULES = [
+    {"name": "rm_rf", "pattern": r"rm\s+-rf", "action": "strip"},
+    {"name": "sudo", "pattern": r"\bsudo\b", "action": "strip"},
+    {"name": "su", "pattern": r"\bsu\s", "action": "strip"},
+    {"name": "chmod_777", "pattern": r"chmod\s+777", "action": "strip"},
+    {"name": "wget", "pattern": r"\bwget\b", "action": "strip"},
+    {"name": "curl", "pattern": r"\bcurl\b", "action": "strip"},
+    {"name": "redirect", "pattern": r">>?", "action": "strip"},
+    {"name": "pipe", "pattern": r"\|", "action": "strip"},
+    {"name": "background", "pattern": r"&", "action": "strip"},
+    {"name": "separator", "pattern": r";", "action": "strip"},
+    {"name": "subshell", "pattern": r"\$\(", "action": "strip"},
+    {"name": "backtick", "pattern": r"`", "action": "strip"},
+    {"name": "eval", "pattern": r"\beval\b", "action": "strip"},
+    {"name": "exec", "pattern": r"\bexec\b", "action": "strip"},
+]
+
+
+def fold_case(text: str) -> str:
+    """Fold case at least as loosely as re.IGNORECASE, for literal prefiltering"""
+    folded = text.casefold()
+    # re.IGNORECASE also matches dotless i with i and I; casefold() keeps it distinct
+    return folded.replace("ı", "i") if "ı" in folded else folded
+
+
+def pattern_atoms(pattern: str) -> Optional[List[Optional[str]]]:
+    """Split a pattern into required atoms: a literal character, "" for a
+    zero-width anchor, or None for anything that is not a fixed character.
+
+    Returns None for patterns with groups, classes, alternation or numeric
+    escapes; those are not analysed. Optional atoms (?, *, {m,n}) become None.
+    """
+    atoms: List[Optional[str]] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in "([|)]":
+            return None
+        if char == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped in ZERO_WIDTH_ESCAPES:
+                atoms.append("")
+                continue
+            if escaped.isalnum() and escaped not in SINGLE_CHAR_ESCAPES:
+                return None  # \x41, \u..., backreferences and the like
+            atom = None if escaped.isalnum() else escaped
+        elif char in "^$":
+            i += 1
+            atoms.append("")
+            continue
+        else:
+            atom = None if char == "." else char
+            i += 1
+
+        quantifier = pattern[i] if i < len(pattern) else ""
+        if quantifier in ("?", "*", "{"):
+            atom = None
+            if quantifier == "{":
+                end = pattern.find("}", i)
+                if end < 0:
+                    return None
+                i = end
+            i += 1
+        elif quantifier == "+":
+            atoms.append(atom)
+            atom = None  # the repeat breaks the run of fixed characters
+            i += 1
+        if i < len(pattern) and pattern[i] == "?":  # lazy quantifier
+            i += 1
+        atoms.append(atom)
+    return atoms
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """Longest run of characters every match of a pattern contains (casefolded),
+    or None if none can be derived"""
+    atoms = pattern_atoms(pattern)
+    if atoms is None:
+        return None
+    best, run = "", ""
+    for atom in atoms:
+        if atom is None:
+            run = ""
+        else:
+            run += atom
+        if len(run) > len(best):
+            best = run
+    return fold_case(best) or None
+
+
+def first_chars(pattern: str) -> Optional[Set[str]]:
+    """Characters every match of a pattern must start with, or None if unknown.
+
+    Used to build a leading lookahead, which lets the regex engine skip
+    positions where no rule can start instead of trying every alternative.
+    """
+    for atom in pattern_atoms(pattern) or [None]:
+        if atom != "":
+            return {atom} if atom else None
+    return None
+
+
+class SanitizeResult:
+    def __init__(self, text: str, rejected: bool, fired: List[str], truncated: bool):
+        """Outcome of applying the policy to one command"""
+        self.text = text
+        self.rejected = rejected
+        self.fired = fired
+        self.truncated = truncated
+
+    def __repr__(self):
+        return (f"SanitizeResult(text={self.text!r}, rejected={self.rejected}, "
+                f"fired={self.fired}, truncated={self.truncated})")
+
+
+class CommandSanitizer:
+    def __init__(self, rules: List[Dict] = None, max_length: int = MAX_COMMAND_LENGTH):
+        """Validate rules ({"name", "pattern", "action"}); they are compiled lazily into
+        one alternation per combination of rules a command can match"""
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.max_length = max_length
+        self.actions: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+
+        # Rules are grouped by a literal every match must contain; a command is
+        # only scanned for the rules whose literal it contains
+        self.literal_rules: Dict[str, List[int]] = {}
+        self.unfiltered_rules: List[int] = []
+        self.alternatives: List[str] = []
+        self.starts: List[Optional[Set[str]]] = []
+        self.regexes: Dict[tuple, Optional[re.Pattern]] = {}
+        for i, rule in enumerate(self.rules):
+            action = rule.get("action", "strip")
+            if action not in ACTIONS:
+                raise ValueError(f"Unknown action {action!r} for rule {rule['name']!r}")
+            re.compile(rule["pattern"])  # report bad patterns per rule
+            group = f"r{i}"
+            self.actions[group] = action
+            self.names[group] = rule["name"]
+            # An empty marker group after the rule names it in match.lastgroup; a
+            # wrapping group would hide the rule's first character from the engine
+            self.alternatives.append(f"(?:{rule['pattern']})(?P<{group}>)")
+            self.starts.append(first_chars(rule["pattern"]))
+            literal = required_literal(rule["pattern"])
+            if literal is None:
+                self.unfiltered_rules.append(i)
+            else:
+                self.literal_rules.setdefault(literal, []).append(i)
+
+    def compile_rules(self, indexes: List[int]) -> Optional[re.Pattern]:
+        """One alternation of the given rules, in policy order"""
+        if not indexes:
+            return None
+        pattern = "|".join(self.alternatives[i] for i in indexes)
+        starts: Optional[Set[str]] = set()
+        for i in indexes:
+            starts = starts | self.starts[i] if starts is not None and self.starts[i] is not None else None
+        if starts:
+            pattern = f"(?=[{''.join(re.escape(c) for c in sorted(starts))}])(?:{pattern})"
+        return re.compile(pattern, re.IGNORECASE)
+
+    def regex_for(self, command: str) -> Optional[re.Pattern]:
+        """Regex of the rules that can match this command"""
+        folded = fold_case(command)
+        present = tuple([literal for literal in self.literal_rules if literal in folded])
+        if not present and not self.unfiltered_rules:
+            return None
+        regex = self.regexes.get(present, False)
+        if regex is False:
+            indexes = list(self.unfiltered_rules)
+            for literal in present:
+                indexes.extend(self.literal_rules[literal])
+            if len(self.regexes) >= MAX_COMPILED_SUBSETS:
+                self.regexes.clear()
+            regex = self.regexes[present] = self.compile_rules(sorted(indexes))
+        return regex
+
+    @classmethod
+    def from_file(cls, policy_file: Path = None) -> "CommandSanitizer":
+        """Load rules from the policy file, falling back to the defaults"""
+        policy_file = Path(policy_file or COMMAND_POLICY_FILE)
+        try:
+            with open(policy_file, "r") as f:
+                policy = json.load(f)
+            return cls(policy["rules"], policy.get("max_length", MAX_COMMAND_LENGTH))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, KeyError, re.error) as e:
+            logger.error(f"Invalid command policy {policy_file}, using defaults: {e}")
+            return cls()
+
+    def scan(self, text: str) -> Tuple[List[str], bool]:
+        """Rules that match text and whether any of them rejects, without rewriting it"""
+        fired: List[str] = []
+        rejected = False
+        regex = self.regex_for(text)
+        if regex:
+            for match in regex.finditer(text):
+                name = self.names[match.lastgroup]
+                if name not in fired:
+                    fired.append(name)
+                rejected = rejected or self.actions[match.lastgroup] == "reject"
+        return fired, rejected
+
+    def sanitize(self, command: str) -> SanitizeResult:
+        """Apply the policy in one pass over the command"""
+        command = command.strip()
+        fired: List[str] = []
+        rejected = False
+        sanitized = command
+
+        regex = self.regex_for(command)
+        if regex:
+            parts = []
+            position = 0
+            for match in regex.finditer(command):
+                group = match.lastgroup
+                name = self.names[group]
+                if name not in fired:
+                    fired.append(name)
+                action = self.actions[group]
+                parts.append(command[position:match.start()])
+                if action == "reject":
+                    rejected = True
+                    parts.append(match.group())
+                elif action == "strip":
+                    parts.append(REMOVED_MARKER)
+                else:
+                    parts.append(SHELL_METACHARACTERS.sub(r"\\\1", match.group()))
+                position = match.end()
+            parts.append(command[position:])
+            sanitized = "".join(parts)
+
+        truncated = len(sanitized) > self.max_length
+        if truncated:
+            sanitized = sanitized[:self.max_length] + '...'
+
+        if fired:
+            logger.warning(f"Command policy rules fired: {', '.join(fired)}"
+                           f"{' (rejected)' if rejected else ''}")
+        return SanitizeResult(sanitized, rejected, fired, truncated)
@@ -8,6 +8,7 @@ import sys
 import json
 from pathlib import Path
 from sound_manager import SoundManager
+from sound_synth import describe_spec
 
 def show_current_config(manager):
     """Show current sound configuration"""
@@ -64,7 +65,10 @@ def show_available_sounds(manager):
             continue
             
         for i, cmd_config in enumerate(commands, 1):
-            command = " ".join(cmd_config["command"])
+            if "synth" in cmd_config:
+                command = describe_spec(cmd_config["synth"])
+            else:
+                command = " ".join(cmd_config["command"])
             description = cmd_config.get("description", "No description")
             print(f"   {i}. {description}")
             print(f"      Command: {command}")
@@ -79,7 +83,7 @@ def edit_config_file(manager):
     print("   or")
     print(f"   code {config_file}")
     print()
-    print("After editing, restart your hooks or run this script again to test.")
+    print("Changes are picked up automatically by hooks and by this menu.")
 
 def create_custom_sounds_directory():
     """Create directory for custom sounds"""
@@ -94,9 +98,18 @@ def create_custom_sounds_directory():
     print("3. Update sound_config.json to enable custom sounds")
     print("4. Set 'custom_sounds.enabled' to true")
 
+def build_sound_cache(manager):
+    """Pre-decode custom sounds into the sound cache"""
+    from sound_cache import build_manifest, SOUND_CACHE_DIR
+    
+    print(f"🎵 Building sound cache in {SOUND_CACHE_DIR}")
+    manifest = build_manifest(manager.config, manager.config_digest)
+    print(f"🎯 Cached {len(manifest['sounds'])} sound type(s)")
+
 def interactive_menu():
     """Show interactive menu"""
     manager = SoundManager()
+    manager.watch_config(lambda: print("\n🔄 Sound configuration changed, reloaded"))
     
     while True:
         print("\n🎵 Claude Code Sound Configuration")
@@ -108,11 +121,12 @@ def interactive_menu():
         print("5. Edit configuration file")
         print("6. Create custom sounds directory")
         print("7. Reload configuration")
+        print("8. Build sound cache")
         print("0. Exit")
         print()
         
         try:
-            choice = input("Select option (0-7): ").strip()
+            choice = input("Select option (0-8): ").strip()
             
             if choice == "0":
                 print("👋 Goodbye!")
@@ -130,10 +144,12 @@ def interactive_menu():
             elif choice == "6":
                 create_custom_sounds_directory()
             elif choice == "7":
-                manager = SoundManager()  # Reload
-                print("✅ Configuration reloaded!")
+                if manager.reload_config():
+                    print("✅ Configuration reloaded!")
+            elif choice == "8":
+                build_sound_cache(manager)
             else:
-                print("❌ Invalid option. Please choose 0-7.")
+                print("❌ Invalid option. Please choose 0-8.")
                 
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
@@ -151,7 +167,7 @@ def main():
         if command == "test":
             print("🎯 Testing success sound:")
             manager.play_sound("success")
-        elif command == "test-all":
+        elif command in ("test-all", "bench"):
             manager.test_all_sounds()
         elif command == "config":
             show_current_config(manager)
@@ -159,8 +175,10 @@ def main():
             toggle_sounds(manager)
         elif command == "sounds":
             show_available_sounds(manager)
+        elif command == "cache":
+            build_sound_cache(manager)
         else:
-            print("Usage: python3 configure_sounds.py [test|test-all|config|toggle|sounds]")
+            print("Usage: python3 configure_sounds.py [test|test-all|bench|config|toggle|sounds|cache]")
             print("   Or run without arguments for interactive mode")
     else:
         # Interactive mode
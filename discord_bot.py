@@ -5,13 +5,27 @@ Listens for replies to webhook messages and queues commands for execution.
 """
 
 import os
+import signal
 import discord
-import json
 import asyncio
+import yarl
+import discord.http
+from discord import app_commands
+from discord.gateway import DiscordWebSocket
 import logging
-from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Sequence
+
+from command_queue import AsyncQueueWriter, configured_backend, get_command_queue, load_env_vars
+from webhook_index import WebhookIndex
+from command_sanitizer import CommandSanitizer
+from bot_metrics import BotMetrics, REPORT_INTERVAL
+from ack_scheduler import AckScheduler
+from bot_profiles import client_options
+from slash_commands import ClaudeCommandGroup, sync_commands
+from attachment_store import AttachmentStore, AttachmentRejected, MAX_ATTACHMENT_BYTES
+from gateway_session import (RESUME_WINDOW, ResumingWebSocket, install_resuming_websocket,
+                             load_gateway_session, save_gateway_session)
 
 # Set up logging
 logging.basicConfig(
@@ -20,47 +34,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-def load_env_vars():
-    """Load environment variables from .env file"""
-    env_paths = [
-        Path.home() / ".claude" / "hooks" / ".env",
-        Path("/home/charlie/.claude/hooks/.env"),
-        Path.cwd() / ".env"
-    ]
-    
-    env_vars = {}
-    for env_path in env_paths:
-        if env_path.exists():
-            try:
-                with open(env_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.split('=', 1)
-                            env_vars[key] = value
-            except Exception as e:
-                logger.error(f"Error reading {env_path}: {e}")
-    
-    return env_vars
-
 # Load configuration
 env_vars = load_env_vars()
 DISCORD_BOT_TOKEN = env_vars.get('DISCORD_BOT_TOKEN') or os.getenv('DISCORD_BOT_TOKEN')
 AUTHORIZED_USER_ID = env_vars.get('AUTHORIZED_USER_ID') or os.getenv('AUTHORIZED_USER_ID')
-COMMAND_QUEUE_FILE = Path.home() / ".claude" / "command_queue.json"
+COMMAND_QUEUE_BACKEND = configured_backend(env_vars)  # the monitor resolves it the same way
+BOT_METRICS_PORT = env_vars.get('BOT_METRICS_PORT') or os.getenv('BOT_METRICS_PORT')
+BOT_METRICS_INTERVAL = float(env_vars.get('BOT_METRICS_INTERVAL') or os.getenv('BOT_METRICS_INTERVAL') or REPORT_INTERVAL)
+ACK_STYLE = env_vars.get('ACK_STYLE') or os.getenv('ACK_STYLE') or 'reply'  # reply, reaction or both
+BOT_PROFILE = env_vars.get('BOT_PROFILE') or os.getenv('BOT_PROFILE') or 'default'  # low_memory or interactions
+SLASH_COMMANDS_GUILD_ID = env_vars.get('SLASH_COMMANDS_GUILD_ID') or os.getenv('SLASH_COMMANDS_GUILD_ID')
+GATEWAY_RESUME_WINDOW = float(env_vars.get('GATEWAY_RESUME_WINDOW') or os.getenv('GATEWAY_RESUME_WINDOW') or RESUME_WINDOW)  # 0 disables
+# Alternative endpoints, e.g. a local fake_discord.py for load testing
+DISCORD_API_BASE = env_vars.get('DISCORD_API_BASE') or os.getenv('DISCORD_API_BASE')
+DISCORD_GATEWAY_URL = env_vars.get('DISCORD_GATEWAY_URL') or os.getenv('DISCORD_GATEWAY_URL')
+ATTACHMENT_MAX_BYTES = int(env_vars.get('ATTACHMENT_MAX_BYTES') or os.getenv('ATTACHMENT_MAX_BYTES') or MAX_ATTACHMENT_BYTES)
 WEBHOOK_BOT_NAME = "Claude Code Hooks"  # Name that appears in webhook messages
 
-# Ensure command queue directory exists
-COMMAND_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
-
 class ClaudeCommandBot(discord.Client):
     def __init__(self, *args, **kwargs):
-        # Enable necessary intents
-        intents = discord.Intents.default()
-        intents.message_content = True
-        super().__init__(intents=intents, *args, **kwargs)
+        # Intents and caches come from the configured profile
+        options = client_options(BOT_PROFILE)
+        options.update(kwargs)
+        super().__init__(*args, **options)
         
+        self.command_queue = get_command_queue(COMMAND_QUEUE_BACKEND)
+        self.queue_writer = AsyncQueueWriter(self.command_queue)
+        self.queue_control = get_command_queue(COMMAND_QUEUE_BACKEND)  # status/cancel, off the writer's connection
+        self.webhook_index = WebhookIndex()
+        self.sanitizer = CommandSanitizer.from_file()
+        self.metrics = BotMetrics()
+        self.acks = AckScheduler(ACK_STYLE, metrics=self.metrics)
+        self.attachment_store = AttachmentStore(max_bytes=ATTACHMENT_MAX_BYTES, sanitizer=self.sanitizer)
+        self.tree = app_commands.CommandTree(self)
+        self.tree.add_command(ClaudeCommandGroup(self, self.queue_control))
+        install_resuming_websocket()
+        self.saved_gateway_session = None
         self.authorized_user_id = None
         if AUTHORIZED_USER_ID:
             try:
@@ -68,9 +77,56 @@ class ClaudeCommandBot(discord.Client):
             except ValueError:
                 logger.error(f"Invalid AUTHORIZED_USER_ID: {AUTHORIZED_USER_ID}")
 
+    async def setup_hook(self):
+        """Start background tasks before connecting to the gateway"""
+        if GATEWAY_RESUME_WINDOW > 0:
+            self.saved_gateway_session = load_gateway_session(max_age=GATEWAY_RESUME_WINDOW)
+        self.queue_writer.start()
+        await self.attachment_store.start()
+        self.metrics.instrument_http(self.http)
+        try:
+            await sync_commands(self.tree, int(SLASH_COMMANDS_GUILD_ID) if SLASH_COMMANDS_GUILD_ID else None)
+        except (discord.HTTPException, ValueError) as e:
+            logger.error(f"Could not register slash commands: {e}")
+        try:
+            await self.metrics.start(int(BOT_METRICS_PORT) if BOT_METRICS_PORT else None,
+                                     BOT_METRICS_INTERVAL)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not start metrics endpoint: {e}")
+
+    async def close(self):
+        """Suspend the gateway session and flush queued commands before shutting down"""
+        self.suspend_gateway_session()
+        await self.queue_writer.stop()
+        await self.acks.stop()
+        await self.attachment_store.stop()
+        await self.metrics.stop()
+        await super().close()
+
+    def suspend_gateway_session(self):
+        """Stop taking gateway events and save the session for the next start to resume"""
+        ws = self.ws
+        if GATEWAY_RESUME_WINDOW <= 0 or not isinstance(ws, ResumingWebSocket) or ws.suspended or not ws.open:
+            return
+        state = ws.suspend()
+        if not state:
+            return
+        try:
+            save_gateway_session(state)
+            logger.info(f"Saved gateway session {state['session_id']} at sequence {state['sequence']}")
+        except OSError as e:
+            logger.error(f"Could not save gateway session: {e}")
+
+    async def on_resumed(self):
+        """Called when a gateway session is resumed (no READY, caches start cold)"""
+        logger.info(f'Gateway session resumed as {self.user}')
+        self.metrics.increment("gateway_resumed")
+
     async def on_ready(self):
         """Called when bot is ready"""
+        self.metrics.increment("gateway_identified")
         logger.info(f'Discord bot logged in as {self.user} (ID: {self.user.id})')
+        logger.info(f'Client profile: {BOT_PROFILE}')
         if self.authorized_user_id:
             logger.info(f'Authorized user ID: {self.authorized_user_id}')
         else:
@@ -78,32 +134,33 @@ class ClaudeCommandBot(discord.Client):
 
     async def on_message(self, message):
         """Handle incoming messages"""
+        with self.metrics.timer("on_message"):
+            await self.handle_message(message)
+
+    async def handle_message(self, message):
+        """Route a message to the command queue if it is for us"""
         # Ignore messages from bots (including self)
         if message.author.bot:
             return
             
         # Check if user is authorized
-        if self.authorized_user_id and message.author.id != self.authorized_user_id:
+        if not self.is_authorized(message.author.id):
             logger.info(f'Ignoring message from unauthorized user: {message.author.id}')
             return
             
         # Check if message is a reply to a webhook message
         if message.reference and message.reference.message_id:
             try:
-                # Get the original message
-                original_message = await message.channel.fetch_message(message.reference.message_id)
-                
-                # Check if it's from our webhook (by author name)
-                if (original_message.author.name == WEBHOOK_BOT_NAME or 
-                    original_message.webhook_id is not None):
-                    
+                with self.metrics.timer("resolve_reply_target"):
+                    session = await self.resolve_reply_target(message)
+                if session is not None:
                     # Extract command from the reply
                     command_text = message.content.strip()
                     
                     if command_text:
-                        await self.queue_command(command_text, message)
+                        await self.queue_command(command_text, message, session)
                     else:
-                        await message.add_reaction('❓')
+                        self.acks.react(message, '❓')
                         
             except discord.NotFound:
                 logger.warning(f'Could not find original message {message.reference.message_id}')
@@ -127,82 +184,127 @@ class ClaudeCommandBot(discord.Client):
             if command_text:
                 await self.queue_command(command_text, message)
             else:
-                await message.add_reaction('❓')
+                self.acks.react(message, '❓')
+
+    def is_authorized(self, user_id: int) -> bool:
+        """Whether a user may send commands (everyone when no user is configured)"""
+        return not self.authorized_user_id or user_id == self.authorized_user_id
+
+    def is_webhook_message(self, original_message: discord.Message) -> bool:
+        """Check if a message came from our webhook (by author name or webhook ID)"""
+        return (original_message.author.name == WEBHOOK_BOT_NAME or
+                original_message.webhook_id is not None)
+
+    async def resolve_reply_target(self, message: discord.Message) -> Optional[dict]:
+        """Session info for a reply to one of our notifications ({} if unknown), else None.
 
-    async def queue_command(self, command_text: str, message: discord.Message):
-        """Queue a command for execution"""
+        Avoids REST where possible: the gateway usually delivers the referenced
+        message, and the notification senders index what they post.
+        """
+        reference = message.reference
+        session = await asyncio.to_thread(self.webhook_index.lookup, reference.message_id)
+        if session is not None:
+            return session
+        
+        if isinstance(reference.resolved, discord.Message):
+            return {} if self.is_webhook_message(reference.resolved) else None
+        if isinstance(reference.resolved, discord.DeletedReferencedMessage):
+            return None
+        
+        # Cold fallback: ask the API, and remember the answer
+        original_message = await message.channel.fetch_message(reference.message_id)
+        if not self.is_webhook_message(original_message):
+            return None
+        await asyncio.to_thread(self.webhook_index.record, original_message.id, original_message.channel.id)
+        return {}
+
+    async def queue_command(self, command_text: str, message: discord.Message,
+                            session: Optional[dict] = None):
+        """Queue a command for execution (in the originating Claude session, if known)"""
+        with self.metrics.timer("queue_command"):
+            await self._queue_command(command_text, message, session)
+
+    async def _queue_command(self, command_text: str, message: discord.Message,
+                             session: Optional[dict]):
         try:
-            # Sanitize command
-            sanitized_command = self.sanitize_command(command_text)
-            
-            # Create command entry
-            command_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "command": sanitized_command,
-                "original_command": command_text,
-                "user_id": message.author.id,
-                "user_name": str(message.author),
-                "channel_id": message.channel.id,
-                "message_id": message.id,
-                "guild_id": message.guild.id if message.guild else None
-            }
-            
-            # Add to queue
-            await self.add_to_queue(command_entry)
+            # After a resume the guild cache is cold; partial channels still know the guild
+            guild_id = message.guild.id if message.guild else getattr(message.channel, 'guild_id', None)
+            result, _ = await self.submit_command(command_text, message.author, message.channel.id,
+                                                  message.id, guild_id, session,
+                                                  attachments=message.attachments)
+            if result.rejected:
+                self.acks.acknowledge(message, f"Command rejected by policy: {', '.join(result.fired)}", '🚫')
+                return
             
-            # Confirm receipt
-            await message.add_reaction('✅')
-            await message.reply(f"Command queued: `{sanitized_command}`", mention_author=False)
-            
-            logger.info(f'Queued command from {message.author}: {sanitized_command}')
+            # Confirm receipt (batched and paced by the scheduler)
+            self.acks.acknowledge(message, f"Command queued: `{result.text}`")
             
+        except AttachmentRejected as e:
+            self.acks.acknowledge(message, f"Attachment rejected: {e}", '🚫')
         except Exception as e:
             logger.error(f'Error queuing command: {e}')
-            await message.add_reaction('❌')
+            self.metrics.increment("commands_failed")
+            self.acks.react(message, '❌')
 
-    def sanitize_command(self, command: str) -> str:
-        """Sanitize command text to prevent dangerous operations"""
-        # Remove potentially dangerous characters and commands
-        dangerous_patterns = [
-            'rm -rf', 'sudo', 'su ', 'chmod 777', 'wget', 'curl',
-            '>', '>>', '|', '&', ';', '$(', '`', 'eval', 'exec'
-        ]
+    async def submit_command(self, command_text: str, user, channel_id: int, source_id: int,
+                             guild_id: Optional[int] = None, session: Optional[dict] = None,
+                             source: str = "message", attachments: Sequence[discord.Attachment] = ()):
+        """Apply the command policy and queue the command; returns (policy result, command ID).
+
+        Attachments are streamed into the attachment store and queued as file
+        references; AttachmentRejected is raised if one exceeds a limit or
+        contains text the policy rejects.
+        """
+        result = self.sanitizer.sanitize(command_text)
+        if result.rejected:
+            logger.warning(f'Rejected command from {user}: {", ".join(result.fired)}')
+            self.metrics.increment("commands_rejected")
+            return result, None
         
-        sanitized = command.strip()
+        # Create command entry (message_id holds the interaction ID for slash commands)
+        command_entry = {
+            "timestamp": datetime.now().isoformat(),
+            "command": result.text,
+            "original_command": command_text,
+            "policy_rules": result.fired,
+            "user_id": user.id,
+            "user_name": str(user),
+            "channel_id": channel_id,
+            "message_id": source_id,
+            "guild_id": guild_id,
+            "source": source
+        }
+        if session:
+            command_entry["session"] = session
+        if attachments:
+            try:
+                with self.metrics.timer("ingest_attachments"):
+                    command_entry["attachments"] = await self.attachment_store.ingest_all(attachments)
+                for ref in command_entry["attachments"]:
+                    if ref["policy_rules"]:
+                        logger.warning(f'Attachment {ref["filename"]} from {user} fired policy rules: '
+                                       f'{", ".join(ref["policy_rules"])}')
+            except AttachmentRejected as e:
+                logger.warning(f'Rejected attachments from {user}: {e}')
+                self.metrics.increment("attachments_rejected")
+                raise
         
-        # Check for dangerous patterns
-        for pattern in dangerous_patterns:
-            if pattern in sanitized.lower():
-                logger.warning(f'Dangerous pattern detected: {pattern}')
-                # Replace with safe version or remove
-                sanitized = sanitized.replace(pattern, '[REMOVED]')
+        # Add to queue (returns once the command is committed)
+        command_id = await self.add_to_queue(command_entry)
         
-        # Limit length
-        if len(sanitized) > 500:
-            sanitized = sanitized[:500] + '...'
-            
-        return sanitized
+        logger.info(f'Queued command from {user}: {result.text}')
+        self.metrics.increment("commands_queued")
+        return result, command_id
+
+    def sanitize_command(self, command: str) -> str:
+        """Sanitize command text to prevent dangerous operations"""
+        return self.sanitizer.sanitize(command).text
 
-    async def add_to_queue(self, command_entry: dict):
-        """Add command to the queue file"""
+    async def add_to_queue(self, command_entry: dict) -> str:
+        """Add command to the command queue through the background writer"""
         try:
-            # Read existing queue
-            queue = []
-            if COMMAND_QUEUE_FILE.exists():
-                with open(COMMAND_QUEUE_FILE, 'r') as f:
-                    queue = json.load(f)
-            
-            # Add new command
-            queue.append(command_entry)
-            
-            # Keep only last 100 commands
-            if len(queue) > 100:
-                queue = queue[-100:]
-            
-            # Write back to file
-            with open(COMMAND_QUEUE_FILE, 'w') as f:
-                json.dump(queue, f, indent=2)
-                
+            with self.metrics.timer("add_to_queue"):
+                return await self.queue_writer.submit(command_entry)
         except Exception as e:
             logger.error(f'Error adding to queue: {e}')
             raise
@@ -213,8 +315,24 @@ async def main():
         logger.error('DISCORD_BOT_TOKEN not found in environment variables or .env file')
         return
     
+    if DISCORD_API_BASE:
+        discord.http.Route.BASE = DISCORD_API_BASE.rstrip('/')
+        logger.warning(f'Using Discord API at {DISCORD_API_BASE}')
+    if DISCORD_GATEWAY_URL:
+        DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(DISCORD_GATEWAY_URL)
+        logger.warning(f'Using Discord gateway at {DISCORD_GATEWAY_URL}')
+    
     bot = ClaudeCommandBot()
     
+    # Shut down cleanly on SIGTERM (start_bidirectional.py) so the session is saved
+    loop = asyncio.get_running_loop()
+    shutdown_tasks = set()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, lambda: shutdown_tasks.add(asyncio.create_task(bot.close())))
+        except NotImplementedError:  # Windows
+            pass
+    
     try:
         await bot.start(DISCORD_BOT_TOKEN)
     except discord.LoginFailure:
@@ -223,6 +341,9 @@ async def main():
         logger.error(f'Error starting bot: {e}')
     finally:
         await bot.close()
+        bot.command_queue.close()
+        bot.queue_control.close()
+        bot.webhook_index.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
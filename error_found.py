@@ -6,9 +6,11 @@ Used when Claude Code discovers errors or issues during analysis.
 
 import json
 from sound_manager import SoundManager
+from error_tracker import ErrorTracker
 
-# Initialize sound manager
+# Initialize sound manager and error tracker
 sound_manager = SoundManager()
+error_tracker = ErrorTracker(namespace="error_found")  # separate from notification.py's
 
 # Main logic
 if __name__ == "__main__":
@@ -22,9 +24,16 @@ if __name__ == "__main__":
         print("⚠️ No valid JSON input received, using default values")
         hook_input = {"session_id": "unknown"}
     
-    # Play error found sound (randomly selected from available options)
-    print("🔊 Playing error found sound...")
-    sound_manager.play_sound("error_found")
+    # Only the first occurrence of an error inside the dedup window plays a sound;
+    # repeats just bump this hook's own counter. It sends nothing to Discord, so
+    # its closed windows need no summary (notification.py summarizes its own)
+    is_first, _ = error_tracker.record(hook_input)
+    if is_first:
+        # Play error found sound (randomly selected from available options)
+        print("🔊 Playing error found sound...")
+        sound_manager.play_sound("error_found")
+    else:
+        print("🔁 Repeated error within dedup window, sound suppressed")
     
     # Exit successfully
     print("🎯 Error found hook completed")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Error fingerprint tracker for Claude Code hooks.
+Collapses repeated error events into a single notification plus a counter.
+Each caller tracks its fingerprints in its own namespace of the shared state
+file, so one hook's occurrences never suppress or expire another's.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Configuration
+ERROR_STATE_FILE = Path.home() / ".claude" / "error_fingerprints.json"
+ERROR_DEDUP_WINDOW = int(os.getenv("CLAUDE_ERROR_DEDUP_WINDOW", "180"))  # seconds
+DEFAULT_NAMESPACE = "notification"
+
+ERROR_CLASS_PATTERN = re.compile(r"\b([A-Z][A-Za-z]*(?:Error|Exception|Failure|Warning))\b")
+PATH_PATTERN = re.compile(r"(?:[A-Za-z]:)?(?:[\\/][\w.\-@]+)+[\\/]?|\b[\w.\-]+\.\w{1,5}\b")
+HEX_PATTERN = re.compile(r"\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{8,}\b")
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+SPACE_PATTERN = re.compile(r"\s+")
+
+
+def extract_error_details(hook_input: dict) -> Tuple[str, str, str]:
+    """Pull (tool, error class, raw message) out of a hook payload"""
+    tool = hook_input.get("tool_name")
+    if not tool:
+        tools_used = hook_input.get("tools_used", [])
+        tool = tools_used[-1] if isinstance(tools_used, list) and tools_used else str(tools_used or "")
+
+    message = hook_input.get("error") or hook_input.get("message") or ""
+    if not message:
+        tool_response = hook_input.get("tool_response")
+        if isinstance(tool_response, dict):
+            message = tool_response.get("error") or tool_response.get("stderr") or ""
+        elif tool_response:
+            message = str(tool_response)
+    message = str(message)
+
+    match = ERROR_CLASS_PATTERN.search(message)
+    error_class = match.group(1) if match else "error"
+
+    return tool or "unknown", error_class, message
+
+
+def normalize_message(message: str) -> str:
+    """Strip paths, hex IDs and numbers so repeats of one failure look identical"""
+    normalized = PATH_PATTERN.sub("<path>", message)
+    normalized = HEX_PATTERN.sub("<hex>", normalized)
+    normalized = NUMBER_PATTERN.sub("<n>", normalized)
+    return SPACE_PATTERN.sub(" ", normalized).strip().lower()[:500]
+
+
+def fingerprint_error(hook_input: dict) -> Tuple[str, Dict]:
+    """Compute a stable fingerprint for an error event"""
+    tool, error_class, message = extract_error_details(hook_input)
+    normalized = normalize_message(message)
+    digest = hashlib.sha1(f"{tool}|{error_class}|{normalized}".encode("utf-8")).hexdigest()[:16]
+    details = {
+        "tool": tool,
+        "error_class": error_class,
+        "message": message[:200],
+    }
+    return digest, details
+
+
+def format_span(seconds: float) -> str:
+    """Format a duration the way summaries show it (e.g. '45 s', '3 min')"""
+    if seconds < 60:
+        return f"{int(seconds)} s"
+    if seconds < 3600:
+        return f"{int(round(seconds / 60))} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+class ErrorTracker:
+    def __init__(self, state_file: Path = None, window: int = None, namespace: str = DEFAULT_NAMESPACE):
+        """Initialize tracker with its state file, dedup window and key namespace"""
+        self.state_file = Path(state_file or ERROR_STATE_FILE)
+        self.namespace = namespace
+        self.lock_file = self.state_file.with_suffix(".lock")
+        self.window = ERROR_DEDUP_WINDOW if window is None else window
+
+    def _locked(self):
+        """Open the lock file and take an exclusive lock (no-op without fcntl)"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_file, "a+")
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _load(self) -> Dict:
+        """Load the fingerprint tables of all namespaces"""
+        try:
+            if self.state_file.exists():
+                with open(self.state_file, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading error fingerprints: {e}")
+        return {}
+
+    def _save(self, table: Dict):
+        """Atomically write the fingerprint table"""
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(table, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _expire(self, table: Dict, now: float) -> List[Dict]:
+        """Remove entries whose window closed and return summaries for repeats"""
+        summaries = []
+        for digest in list(table.keys()):
+            entry = table[digest]
+            if now - entry["first_seen"] < self.window:
+                continue
+            if entry["count"] > 1:
+                summaries.append(dict(entry, fingerprint=digest))
+            del table[digest]
+        return summaries
+
+    def record(self, hook_input: dict, now: float = None) -> Tuple[bool, List[Dict]]:
+        """Record an error occurrence.
+
+        Returns (is_first, summaries): is_first is True when the caller should
+        notify normally, summaries lists closed windows that still need one
+        summarized message.
+        """
+        now = time.time() if now is None else now
+        digest, details = fingerprint_error(hook_input)
+
+        handle = self._locked()
+        try:
+            tables = self._load()
+            table = tables.setdefault(self.namespace, {})
+            summaries = self._expire(table, now)
+
+            entry = table.get(digest)
+            is_first = entry is None
+            if is_first:
+                entry = dict(details, first_seen=now, count=0)
+                table[digest] = entry
+            entry["count"] += 1
+            entry["last_seen"] = now
+
+            self._save(tables)
+        finally:
+            handle.close()
+
+        return is_first, summaries
+
+    def flush(self, now: float = None) -> List[Dict]:
+        """Close expired windows and return summaries that need sending"""
+        now = time.time() if now is None else now
+
+        handle = self._locked()
+        try:
+            tables = self._load()
+            table = tables.get(self.namespace, {})
+            summaries = self._expire(table, now)
+            if summaries:
+                self._save(tables)
+        finally:
+            handle.close()
+
+        return summaries
+
+
+def format_summary(summary: Dict) -> Tuple[str, Dict]:
+    """Create Discord message and embed for a repeated-error summary"""
+    span = format_span(summary["last_seen"] - summary["first_seen"])
+    main_message = f"❌ **Repeated error** ×{summary['count']} in {span}"
+
+    embed = {
+        "title": "Repeated Error Summary",
+        "color": 0xff0000,  # Red color
+        "fields": [
+            {
+                "name": "🔧 Tool",
+                "value": f"`{summary['tool']}`",
+                "inline": True
+            },
+            {
+                "name": "🏷️ Error Class",
+                "value": f"`{summary['error_class']}`",
+                "inline": True
+            },
+            {
+                "name": "🔁 Occurrences",
+                "value": f"{summary['count']} in {span}",
+                "inline": True
+            }
+        ]
+    }
+
+    if summary.get("message"):
+        embed["fields"].append({
+            "name": "📝 Sample",
+            "value": f"```{summary['message']}```",
+            "inline": False
+        })
+
+    return main_message, embed
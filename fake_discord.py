@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Local Discord stand-in for offline load and latency testing.
+Serves the webhook execute endpoint with Discord-style rate-limit headers and
+429s, a minimal gateway (HELLO, IDENTIFY/READY, RESUME with replay,
+heartbeats, MESSAGE_CREATE and INTERACTION_CREATE), the REST routes the bot
+uses and attachment downloads. Latency, jitter and error injection are configurable.
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import itertools
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from aiohttp import web, WSMsgType
+
+# Configuration
+API_VERSION = 10
+DISCORD_EPOCH = 1420070400000  # ms, for snowflakes
+HEARTBEAT_INTERVAL_MS = 41250
+MAX_REPLAY_EVENTS = 1000  # events kept per session for RESUME
+DEFAULT_CHANNEL_ID = 200
+DEFAULT_USER_ID = 300
+WEBHOOK_NAME = "Claude Code Hooks"
+
+# (requests, per seconds) for each bucket, keyed per major parameter like Discord's
+RATE_LIMITS = {
+    "webhook": (5, 2.0),     # per webhook
+    "message": (5, 5.0),     # create message, per channel
+    "reaction": (1, 0.25),   # add reaction, per channel
+}
+GLOBAL_RATE_LIMIT = (50, 1.0)  # per bot token, all authenticated routes
+
+# Gateway intent bits that gate message events
+INTENT_GUILD_MESSAGES = 1 << 9
+INTENT_DIRECT_MESSAGES = 1 << 12
+INTENT_MESSAGE_CONTENT = 1 << 15
+
+BOT_USER = {"id": "4242", "username": "claude-bot", "discriminator": "0", "avatar": None,
+            "global_name": None, "bot": True}
+
+
+def json_response(data, status: int = 200, headers: Dict = None) -> web.Response:
+    """JSON with the exact content type discord.py expects"""
+    return web.Response(body=json.dumps(data).encode(), status=status, headers=headers,
+                        content_type="application/json")
+
+
+def iso_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class Bucket:
+    """Fixed-window rate limit bucket"""
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def hit(self, now: float) -> bool:
+        """Take one request from the bucket; False when exhausted"""
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+        if self.remaining == 0:
+            return False
+        self.remaining -= 1
+        return True
+
+    def headers(self, name: str, now: float) -> Dict[str, str]:
+        """X-RateLimit-* headers as Discord sends them"""
+        reset_after = max(0.0, self.reset_at - now)
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": name,
+        }
+
+
+class GatewaySession:
+    def __init__(self, session_id: str, intents: int):
+        """Dispatch history of one identified session, kept for RESUME"""
+        self.session_id = session_id
+        self.intents = intents
+        self.sequence = 0
+        self.events: Deque[dict] = deque(maxlen=MAX_REPLAY_EVENTS)
+        self.ws: Optional[web.WebSocketResponse] = None
+
+    def wants_messages(self, guild: bool) -> bool:
+        return bool(self.intents & (INTENT_GUILD_MESSAGES if guild else INTENT_DIRECT_MESSAGES))
+
+    def can_replay_from(self, sequence: int) -> bool:
+        return not self.events or self.events[0]["s"] <= sequence + 1
+
+    async def dispatch(self, event_type: str, data: dict):
+        """Record an event and send it if a connection is attached"""
+        self.sequence += 1
+        event = {"op": 0, "t": event_type, "s": self.sequence, "d": data}
+        self.events.append(event)
+        if self.ws is not None and not self.ws.closed:
+            try:
+                await self.ws.send_json(event)
+            except ConnectionError:
+                pass  # replayed on RESUME
+
+
+class FakeDiscord:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limits: Dict[str, Tuple[int, float]] = None,
+                 global_rate_limit: Tuple[int, float] = GLOBAL_RATE_LIMIT, seed: Optional[int] = None):
+        """Stand-in state; latency and jitter are seconds, error_rate is the share of 500s"""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limits = dict(RATE_LIMITS)
+        self.rate_limits.update(rate_limits or {})
+        self.global_rate_limit = global_rate_limit
+        self.random = random.Random(seed)
+
+        self.buckets: Dict[Tuple[str, str], Bucket] = {}
+        self.global_buckets: Dict[str, Bucket] = {}
+        self.ids = itertools.count()
+        self.messages: Dict[int, dict] = {}
+        self.channel_messages: Dict[int, List[int]] = {}
+        self.reactions: List[Tuple[int, int, str]] = []
+        self.interaction_responses: List[dict] = []
+        self.files: Dict[int, bytes] = {}  # attachment ID -> content, served like the CDN
+        self.registered_commands: Dict[str, List[dict]] = {}
+        self.sessions: Dict[str, GatewaySession] = {}
+        self.gateway_closes: List[Optional[int]] = []
+        self.stats: Dict[str, int] = {}
+        self.runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    # Helpers ------------------------------------------------------------
+
+    def count(self, name: str, amount: int = 1):
+        self.stats[name] = self.stats.get(name, 0) + amount
+
+    def snowflake(self) -> int:
+        """Time-ordered ID so discord.py derives sensible created_at values"""
+        return ((int(time.time() * 1000) - DISCORD_EPOCH) << 22) | (next(self.ids) & 0x3FFFFF)
+
+    @property
+    def api_base(self) -> str:
+        return f"{self.base_url}/api/v{API_VERSION}"
+
+    @property
+    def gateway_url(self) -> str:
+        return self.base_url.replace("http://", "ws://", 1) + "/gateway"
+
+    def webhook_url(self, webhook_id: int = 1, token: str = "fake-token") -> str:
+        return f"{self.base_url}/api/webhooks/{webhook_id}/{token}"
+
+    def store_message(self, channel_id: int, author: dict, content: str, guild_id: Optional[int] = None,
+                      webhook_id: Optional[int] = None, reference_id: Optional[int] = None,
+                      embeds: List[dict] = None) -> dict:
+        """Create a message object the way the API returns it"""
+        message = {
+            "id": str(self.snowflake()), "channel_id": str(channel_id), "author": author,
+            "content": content, "timestamp": iso_now(), "edited_timestamp": None, "tts": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+            "embeds": embeds or [], "pinned": False, "type": 0,
+        }
+        if guild_id:
+            message["guild_id"] = str(guild_id)
+        if webhook_id:
+            message["webhook_id"] = str(webhook_id)
+        if reference_id:
+            message["type"] = 19
+            message["message_reference"] = {"message_id": str(reference_id), "channel_id": str(channel_id)}
+        self.messages[int(message["id"])] = message
+        self.channel_messages.setdefault(channel_id, []).append(int(message["id"]))
+        return message
+
+    def attach(self, filename: str, content: bytes) -> dict:
+        """Host a file and return the attachment object that references it"""
+        attachment_id = self.snowflake()
+        self.files[attachment_id] = content
+        url = f"{self.base_url}/attachments/{attachment_id}/{filename}"
+        return {"id": str(attachment_id), "filename": filename, "size": len(content), "url": url,
+                "proxy_url": url, "content_type": "text/plain; charset=utf-8"}
+
+    def channel_history(self, channel_id: int) -> List[dict]:
+        """Messages posted to a channel, oldest first"""
+        return [self.messages[i] for i in self.channel_messages.get(channel_id, []) if i in self.messages]
+
+    # Event injection ----------------------------------------------------
+
+    async def push_message(self, content: str, channel_id: int = DEFAULT_CHANNEL_ID,
+                           author_id: int = DEFAULT_USER_ID, guild_id: Optional[int] = None,
+                           reference_id: Optional[int] = None, files: Dict[str, bytes] = None) -> dict:
+        """A user posts a message: store it and send MESSAGE_CREATE to subscribed sessions"""
+        author = {"id": str(author_id), "username": f"user{author_id}", "discriminator": "0",
+                  "avatar": None, "global_name": None}
+        message = self.store_message(channel_id, author, content, guild_id, reference_id=reference_id)
+        message["attachments"] = [self.attach(name, data) for name, data in (files or {}).items()]
+        event = dict(message)
+        if reference_id and reference_id in self.messages:
+            event["referenced_message"] = self.messages[reference_id]
+        for session in list(self.sessions.values()):
+            if not session.wants_messages(guild_id is not None):
+                continue
+            data = event
+            if not session.intents & INTENT_MESSAGE_CONTENT:
+                data = dict(event, content="", embeds=[], attachments=[])
+            await session.dispatch("MESSAGE_CREATE", data)
+            self.count("gateway_dispatched")
+        return message
+
+    async def push_interaction(self, group: str, subcommand: str, options: Dict[str, str] = None,
+                               user_id: int = DEFAULT_USER_ID, channel_id: int = DEFAULT_CHANNEL_ID) -> dict:
+        """A user runs a slash command in a DM: send INTERACTION_CREATE (no intents needed)"""
+        interaction_id = self.snowflake()
+        data = {
+            "id": str(interaction_id), "application_id": BOT_USER["id"], "type": 2,
+            "token": f"interaction-{interaction_id}", "version": 1, "locale": "en-US",
+            "attachment_size_limit": 8 * 1024 * 1024, "app_permissions": "0", "entitlements": [],
+            "authorizing_integration_owners": {}, "context": 1,
+            "channel_id": str(channel_id), "channel": {"id": str(channel_id), "type": 1},
+            "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0",
+                     "avatar": None, "global_name": None},
+            "data": {"id": "1", "name": group, "type": 1, "options": [{
+                "name": subcommand, "type": 1,
+                "options": [{"name": k, "type": 3, "value": v} for k, v in (options or {}).items()],
+            }]},
+        }
+        for session in list(self.sessions.values()):
+            await session.dispatch("INTERACTION_CREATE", data)
+            self.count("gateway_dispatched")
+        return data
+
+    async def disconnect_gateways(self, code: int = 4000):
+        """Drop every gateway connection (sessions stay resumable)"""
+        for session in self.sessions.values():
+            if session.ws is not None and not session.ws.closed:
+                await session.ws.close(code=code)
+
+    def invalidate_sessions(self):
+        """Forget all sessions, so the next RESUME gets INVALID_SESSION"""
+        self.sessions.clear()
+
+    # Rate limiting and faults -------------------------------------------
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        if request.path.startswith("/_fake") or request.path == "/gateway":
+            return await handler(request)
+
+        route = request.match_info.route.name or "other"
+        self.count("requests")
+        self.count(f"requests {route}")
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.count("injected_500")
+            return json_response({"message": "500: Internal Server Error", "code": 0}, status=500)
+
+        now = time.monotonic()
+        authorization = request.headers.get("Authorization")
+        if authorization and self.global_rate_limit:
+            bucket = self.global_buckets.get(authorization)
+            if bucket is None:
+                bucket = self.global_buckets[authorization] = Bucket(*self.global_rate_limit)
+            if not bucket.hit(now):
+                return self.rate_limited(bucket, "global", now, is_global=True)
+
+        bucket = None
+        if route in self.rate_limits:
+            major = request.match_info.get("webhook_id") or request.match_info.get("channel_id", "")
+            key = (route, major)
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = Bucket(*self.rate_limits[route])
+            if not bucket.hit(now):
+                return self.rate_limited(bucket, route, now)
+
+        response = await handler(request)
+        if bucket is not None:
+            response.headers.update(bucket.headers(route, now))
+        return response
+
+    def rate_limited(self, bucket: Bucket, name: str, now: float, is_global: bool = False) -> web.Response:
+        """429 with the body and headers discord.py and our senders read"""
+        self.count("429")
+        self.count(f"429 {name}")
+        retry_after = max(0.001, bucket.reset_at - now)
+        headers = bucket.headers(name, now)
+        headers.update({
+            "Retry-After": str(math.ceil(retry_after)),
+            "X-RateLimit-Scope": "global" if is_global else "user",
+            "Via": "1.1 google",  # discord.py treats 429s without it as a Cloudflare ban
+        })
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        return json_response({"message": "You are being rate limited.", "retry_after": round(retry_after, 3),
+                              "global": is_global}, status=429, headers=headers)
+
+    def require_auth(self, request: web.Request) -> Optional[web.Response]:
+        if not request.headers.get("Authorization", "").startswith("Bot "):
+            return json_response({"message": "401: Unauthorized", "code": 0}, status=401)
+        return None
+
+    # REST ---------------------------------------------------------------
+
+    async def handle_webhook_execute(self, request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+        except ValueError:
+            return json_response({"message": "Cannot send an empty message", "code": 50006}, status=400)
+        if not payload.get("content") and not payload.get("embeds"):
+            return json_response({"message": "Cannot send an empty message", "code": 50006}, status=400)
+
+        webhook_id = int(request.match_info["webhook_id"])
+        author = {"id": str(webhook_id), "username": payload.get("username") or WEBHOOK_NAME,
+                  "discriminator": "0000", "avatar": None, "bot": True}
+        message = self.store_message(DEFAULT_CHANNEL_ID, author, payload.get("content", ""),
+                                     webhook_id=webhook_id, embeds=payload.get("embeds"))
+        self.count("webhook_messages")
+        if request.query.get("wait", "").lower() in ("1", "true"):
+            return json_response(message)
+        return web.Response(status=204)
+
+    async def handle_me(self, request: web.Request) -> web.Response:
+        return self.require_auth(request) or json_response(BOT_USER)
+
+    async def handle_application(self, request: web.Request) -> web.Response:
+        return self.require_auth(request) or json_response({
+            "id": BOT_USER["id"], "name": "claude", "description": "", "icon": None,
+            "bot_public": False, "bot_require_code_grant": False, "owner": BOT_USER,
+            "verify_key": "", "flags": 0})
+
+    async def handle_gateway_info(self, request: web.Request) -> web.Response:
+        return json_response({"url": self.gateway_url, "shards": 1, "session_start_limit": {
+            "total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}})
+
+    async def handle_get_message(self, request: web.Request) -> web.Response:
+        denied = self.require_auth(request)
+        if denied:
+            return denied
+        message = self.messages.get(int(request.match_info["message_id"]))
+        if message is None or message["channel_id"] != request.match_info["channel_id"]:
+            return json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        return json_response(message)
+
+    async def handle_create_message(self, request: web.Request) -> web.Response:
+        denied = self.require_auth(request)
+        if denied:
+            return denied
+        payload = await request.json()
+        reference = (payload.get("message_reference") or {}).get("message_id")
+        message = self.store_message(int(request.match_info["channel_id"]), BOT_USER,
+                                     payload.get("content", ""), embeds=payload.get("embeds"),
+                                     reference_id=int(reference) if reference else None)
+        self.count("bot_messages")
+        return json_response(message)
+
+    async def handle_add_reaction(self, request: web.Request) -> web.Response:
+        denied = self.require_auth(request)
+        if denied:
+            return denied
+        message_id = int(request.match_info["message_id"])
+        if message_id not in self.messages:
+            return json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        self.reactions.append((int(request.match_info["channel_id"]), message_id, request.match_info["emoji"]))
+        self.count("reactions")
+        return web.Response(status=204)
+
+    async def handle_interaction_callback(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.interaction_responses.append(dict(payload, interaction_id=request.match_info["interaction_id"]))
+        flags = (payload.get("data") or {}).get("flags", 0)
+        return json_response({"interaction": {
+            "id": request.match_info["interaction_id"], "type": 2,
+            "response_message_loading": payload.get("type") == 5,
+            "response_message_ephemeral": bool(flags & 64)}})
+
+    async def handle_put_commands(self, request: web.Request) -> web.Response:
+        denied = self.require_auth(request)
+        if denied:
+            return denied
+        commands = await request.json()
+        scope = request.match_info.get("guild_id", "global")
+        self.registered_commands[scope] = commands
+        self.count("command_syncs")
+        return json_response([dict(command, id=str(self.snowflake()), application_id=BOT_USER["id"],
+                                   version="1") for command in commands])
+
+    # Gateway ------------------------------------------------------------
+
+    async def handle_gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"op": 10, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL_MS}})
+        session: Optional[GatewaySession] = None
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            payload = json.loads(msg.data)
+            op, data = payload.get("op"), payload.get("d") or {}
+            if op == 1:
+                await ws.send_json({"op": 11})
+            elif op == 2:
+                self.count("gateway_identify")
+                session = GatewaySession(f"fake-session-{self.snowflake()}", int(data.get("intents", 0)))
+                session.ws = ws
+                self.sessions[session.session_id] = session
+                await session.dispatch("READY", {
+                    "v": API_VERSION, "user": BOT_USER, "guilds": [], "session_id": session.session_id,
+                    "resume_gateway_url": self.gateway_url,
+                    "application": {"id": BOT_USER["id"], "flags": 0}})
+            elif op == 6:
+                self.count("gateway_resume")
+                candidate = self.sessions.get(data.get("session_id"))
+                sequence = data.get("seq") or 0
+                if candidate is None or not candidate.can_replay_from(sequence):
+                    self.count("gateway_invalid_session")
+                    await ws.send_json({"op": 9, "d": False})
+                    continue
+                session = candidate
+                session.ws = ws
+                for event in list(session.events):
+                    if event["s"] > sequence:
+                        await ws.send_json(event)
+                await session.dispatch("RESUMED", {})
+
+        if session is not None and session.ws is ws:
+            session.ws = None
+        self.gateway_closes.append(ws.close_code)
+        return ws
+
+    async def handle_attachment(self, request: web.Request) -> web.StreamResponse:
+        content = self.files.get(int(request.match_info["attachment_id"]))
+        if content is None:
+            return web.Response(status=404)
+        self.count("attachment_downloads")
+        response = web.StreamResponse(headers={"Content-Type": "text/plain; charset=utf-8"})
+        response.content_length = len(content)
+        await response.prepare(request)
+        for start in range(0, len(content), 64 * 1024):
+            await response.write(content[start:start + 64 * 1024])
+        await response.write_eof()
+        return response
+
+    # Control API (for driving the stand-in from another process) --------
+
+    async def handle_control_message(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        message = await self.push_message(
+            body["content"], int(body.get("channel_id", DEFAULT_CHANNEL_ID)),
+            int(body.get("author_id", DEFAULT_USER_ID)),
+            int(body["guild_id"]) if body.get("guild_id") else None,
+            int(body["reference_id"]) if body.get("reference_id") else None)
+        return json_response(message)
+
+    async def handle_control_interaction(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        data = await self.push_interaction(body.get("group", "claude"), body["subcommand"],
+                                           body.get("options"), int(body.get("user_id", DEFAULT_USER_ID)))
+        return json_response(data)
+
+    async def handle_control_disconnect(self, request: web.Request) -> web.Response:
+        body = await request.json() if request.can_read_body else {}
+        await self.disconnect_gateways(int(body.get("code", 4000)))
+        return json_response({"disconnected": True})
+
+    async def handle_control_stats(self, request: web.Request) -> web.Response:
+        return json_response(dict(self.stats, sessions=len(self.sessions),
+                                  messages=len(self.messages), gateway_closes=self.gateway_closes))
+
+    async def handle_control_history(self, request: web.Request) -> web.Response:
+        return json_response(self.channel_history(int(request.match_info["channel_id"])))
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application"""
+        app = web.Application(middlewares=[self.middleware])
+        api = f"/api/v{API_VERSION}"
+        for prefix in ("/api", api):  # hook URLs are unversioned, discord.py's are versioned
+            app.router.add_post(prefix + "/webhooks/{webhook_id}/{token}", self.handle_webhook_execute,
+                                name="webhook" if prefix == "/api" else None)
+        app.router.add_get(api + "/users/@me", self.handle_me)
+        app.router.add_get(api + "/oauth2/applications/@me", self.handle_application)
+        app.router.add_get(api + "/gateway", self.handle_gateway_info)
+        app.router.add_get(api + "/gateway/bot", self.handle_gateway_info)
+        app.router.add_get(api + "/channels/{channel_id}/messages/{message_id}", self.handle_get_message)
+        app.router.add_post(api + "/channels/{channel_id}/messages", self.handle_create_message, name="message")
+        app.router.add_put(api + "/channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me",
+                           self.handle_add_reaction, name="reaction")
+        app.router.add_post(api + "/interactions/{interaction_id}/{token}/callback",
+                            self.handle_interaction_callback)
+        app.router.add_put(api + "/applications/{application_id}/commands", self.handle_put_commands)
+        app.router.add_put(api + "/applications/{application_id}/guilds/{guild_id}/commands",
+                           self.handle_put_commands)
+        app.router.add_get("/attachments/{attachment_id}/{filename}", self.handle_attachment, name="attachment")
+        app.router.add_get("/gateway", self.handle_gateway)
+        app.router.add_post("/_fake/messages", self.handle_control_message)
+        app.router.add_post("/_fake/interactions", self.handle_control_interaction)
+        app.router.add_post("/_fake/disconnect", self.handle_control_disconnect)
+        app.router.add_get("/_fake/stats", self.handle_control_stats)
+        app.router.add_get("/_fake/channels/{channel_id}/messages", self.handle_control_history)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """Serve on host:port (0 picks a free port)"""
+        self.runner = web.AppRunner(self.create_app(), access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        self.base_url = f"http://{host}:{self.runner.addresses[0][1]}"
+
+    async def stop(self):
+        """Close gateway connections and the server"""
+        await self.disconnect_gateways(1001)
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+@contextmanager
+def discord_py_pointed_at(fake: FakeDiscord):
+    """Route discord.py's REST and gateway traffic to the stand-in"""
+    import yarl
+    import discord.http
+    from discord.gateway import DiscordWebSocket
+
+    original = discord.http.Route.BASE, DiscordWebSocket.DEFAULT_GATEWAY
+    discord.http.Route.BASE = fake.api_base
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(fake.gateway_url)
+    try:
+        yield
+    finally:
+        discord.http.Route.BASE, DiscordWebSocket.DEFAULT_GATEWAY = original
+
+
+async def serve(args):
+    """Run the stand-in until interrupted"""
+    fake = FakeDiscord(args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, seed=args.seed)
+    await fake.start(args.host, args.port)
+    print(f"🧪 Fake Discord listening on {fake.base_url}")
+    print("Point the hooks and bot at it with:")
+    print(f"   DISCORD_WEBHOOK={fake.webhook_url()}")
+    print(f"   DISCORD_API_BASE={fake.api_base}")
+    print(f"   DISCORD_GATEWAY_URL={fake.gateway_url}")
+    print(f"Inject traffic: POST {fake.base_url}/_fake/messages {{\"content\": \"claude: hello\"}}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fake.stop()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Local Discord stand-in for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added to every REST/webhook request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of requests answered with 500")
+    parser.add_argument("--seed", type=int, help="Seed for jitter and errors")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Gateway session persistence for the Discord bot.
+Saves the session ID, last sequence number and resume URL when the bot shuts
+down, and resumes that session on the next start while it is still fresh, so
+a restart replays the events sent during the gap instead of re-identifying.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiohttp
+import yarl
+import discord.client
+from discord.errors import ConnectionClosed
+from discord.gateway import DiscordWebSocket
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+GATEWAY_SESSION_FILE = Path.home() / ".claude" / "gateway_session.json"
+RESUME_WINDOW = 90  # seconds a saved session is worth a RESUME attempt
+RESUMABLE_CLOSE_CODE = 4000  # closing with 1000 or 1001 ends the session on Discord's side
+
+
+def save_gateway_session(state: Dict, session_file: Path = GATEWAY_SESSION_FILE):
+    """Write the session state atomically"""
+    session_file = Path(session_file)
+    session_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = session_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, session_file)
+
+
+def load_gateway_session(session_file: Path = GATEWAY_SESSION_FILE,
+                         max_age: float = RESUME_WINDOW) -> Optional[Dict]:
+    """Saved session state if it is recent enough; the file is consumed either way"""
+    session_file = Path(session_file)
+    try:
+        with open(session_file, "r") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable gateway session file: {e}")
+        state = None
+
+    # A session can be resumed at most once
+    try:
+        session_file.unlink()
+    except OSError:
+        pass
+
+    if (not isinstance(state, dict) or not state.get("session_id") or
+            not state.get("resume_gateway_url") or state.get("sequence") is None):
+        return None
+    age = time.time() - state.get("saved_at", 0)
+    if not 0 <= age <= max_age:
+        logger.info(f"Saved gateway session is {age:.0f}s old, identifying instead")
+        return None
+    return state
+
+
+class ResumingWebSocket(DiscordWebSocket):
+    """Gateway connection that can open by resuming a saved session, and can be
+    suspended so that shutting down leaves the session resumable"""
+
+    suspended = False
+
+    @classmethod
+    async def from_client(cls, client, *, initial: bool = False, **kwargs):
+        if getattr(client, "gateway_resume_attempted", False):
+            # Identifying right after a failed resume is still this process's
+            # first IDENTIFY, so skip discord.py's 5s reconnect delay
+            client.gateway_resume_attempted = False
+            initial = initial or not kwargs.get("resume")
+
+        saved = getattr(client, "saved_gateway_session", None)
+        if initial and saved:
+            client.saved_gateway_session = None  # one attempt only
+            resume_kwargs = dict(kwargs, gateway=yarl.URL(saved["resume_gateway_url"]),
+                                 session=saved["session_id"], sequence=saved["sequence"],
+                                 resume=True)
+            logger.info(f"Resuming gateway session {saved['session_id']} "
+                        f"from sequence {saved['sequence']}")
+            client.gateway_resume_attempted = True
+            try:
+                # An expired session is answered with INVALID_SESSION, which
+                # discord.py handles by identifying on a fresh connection
+                return await super().from_client(client, initial=initial, **resume_kwargs)
+            except (OSError, aiohttp.ClientError, asyncio.TimeoutError, ConnectionClosed) as e:
+                client.gateway_resume_attempted = False
+                logger.warning(f"Could not reach the resume gateway ({e}), identifying instead")
+        return await super().from_client(client, initial=initial, **kwargs)
+
+    def suspend(self) -> Optional[Dict]:
+        """Stop handling events and return the state needed to resume later"""
+        self.suspended = True
+        if not self.session_id or self.sequence is None:
+            return None
+        return {
+            "session_id": self.session_id,
+            "sequence": self.sequence,
+            "resume_gateway_url": str(self.gateway),
+            "saved_at": time.time(),
+        }
+
+    async def received_message(self, msg, /):
+        # Once suspended the sequence stays put: whatever arrives now is
+        # replayed to the next process when it resumes
+        if self.suspended:
+            return
+        await super().received_message(msg)
+
+    async def close(self, code: int = RESUMABLE_CLOSE_CODE):
+        if self.suspended and code in (1000, 1001):
+            code = RESUMABLE_CLOSE_CODE
+        await super().close(code)
+
+
+def install_resuming_websocket():
+    """Make discord.py's Client.connect open ResumingWebSocket connections.
+
+    Clients without a saved session behave exactly as before.
+    """
+    discord.client.DiscordWebSocket = ResumingWebSocket
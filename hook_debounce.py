@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Cross-process debounce for high-frequency sound hooks.
+Keeps last-fire timestamps per (session, hook type) in a small memory-mapped
+table so a hook inside its cooldown can exit before loading SoundManager.
+"""
+
+import os
+import mmap
+import time
+import struct
+import hashlib
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Configuration
+DEBOUNCE_FILE = Path.home() / ".claude" / "hook_debounce.bin"
+DEFAULT_COOLDOWNS = {
+    "thinking": 30,        # seconds
+    "task_start": 60,
+    "analysis_start": 30,
+}
+
+SLOT = struct.Struct("<Qd")  # key hash, last fire timestamp
+SLOT_COUNT = 512
+MAX_PROBES = 8
+TABLE_SIZE = SLOT.size * SLOT_COUNT
+
+
+def get_cooldown(hook_type: str) -> float:
+    """Cooldown for a hook type, overridable via CLAUDE_HOOK_COOLDOWN_<TYPE>"""
+    override = os.getenv(f"CLAUDE_HOOK_COOLDOWN_{hook_type.upper()}")
+    if override:
+        try:
+            return float(override)
+        except ValueError:
+            pass
+    return DEFAULT_COOLDOWNS.get(hook_type, 0)
+
+
+def key_hash(session_id: str, hook_type: str) -> int:
+    """64-bit key for a (session, hook type) pair; 0 marks an empty slot"""
+    digest = hashlib.blake2b(f"{session_id}\0{hook_type}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def should_fire(session_id: str, hook_type: str, cooldown: float = None,
+                now: float = None, table_file: Path = None) -> bool:
+    """Return True if the hook may fire, recording the fire time atomically.
+
+    Returns False when the same session fired this hook type within its
+    cooldown. Any failure to use the table fails open (the hook fires).
+    """
+    cooldown = get_cooldown(hook_type) if cooldown is None else cooldown
+    if cooldown <= 0:
+        return True
+    now = time.time() if now is None else now
+    table_file = Path(table_file or DEBOUNCE_FILE)
+
+    try:
+        table_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(table_file, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return True
+
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        if os.fstat(fd).st_size < TABLE_SIZE:
+            os.ftruncate(fd, TABLE_SIZE)
+
+        with mmap.mmap(fd, TABLE_SIZE) as table:
+            key = key_hash(session_id, hook_type)
+            start = key % SLOT_COUNT
+            target = None
+            oldest = None
+
+            for probe in range(MAX_PROBES):
+                offset = ((start + probe) % SLOT_COUNT) * SLOT.size
+                slot_key, last_fire = SLOT.unpack_from(table, offset)
+
+                if slot_key == key:
+                    if now - last_fire < cooldown:
+                        return False
+                    target = offset
+                    break
+                if slot_key == 0:
+                    target = offset
+                    break
+                if oldest is None or last_fire < oldest[1]:
+                    oldest = (offset, last_fire)
+
+            # Probe window full: evict its least recently fired entry
+            if target is None:
+                target = oldest[0]
+
+            SLOT.pack_into(table, target, key, now)
+            return True
+    except (OSError, ValueError):
+        return True
+    finally:
+        os.close(fd)  # also releases the flock
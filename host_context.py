@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Host facts snapshot for Claude Code hooks.
+Caches static host information and per-directory project type detection so
+gather_system_context does not re-probe the system on every event.
+"""
+
+import os
+import sys
+import json
+import socket
+import platform
+from pathlib import Path
+from typing import Dict, Optional
+
+# Configuration
+HOST_FACTS_FILE = Path.home() / ".claude" / "host_facts.json"
+BOOT_ID_FILE = Path("/proc/sys/kernel/random/boot_id")
+PROJECT_FILES = ["package.json", "pyproject.toml", "Cargo.toml", "go.mod", "composer.json"]
+MAX_PROJECT_ENTRIES = 64
+
+
+def read_boot_id() -> Optional[str]:
+    """Read the kernel boot ID (Linux only)"""
+    try:
+        return BOOT_ID_FILE.read_text().strip()
+    except OSError:
+        return None
+
+
+def snapshot_key() -> Dict:
+    """Values that invalidate the snapshot when they change"""
+    return {
+        "boot_id": read_boot_id(),
+        "hostname": socket.gethostname(),
+        "python": sys.version,
+    }
+
+
+def load_snapshot(snapshot_file: Path = None) -> Dict:
+    """Load the snapshot file, returning an empty snapshot on any error"""
+    try:
+        with open(snapshot_file or HOST_FACTS_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshot(snapshot: Dict, snapshot_file: Path = None):
+    """Atomically write the snapshot file"""
+    snapshot_file = Path(snapshot_file or HOST_FACTS_FILE)
+    try:
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp_file, snapshot_file)
+    except OSError as e:
+        print(f"⚠️ Could not save host facts snapshot: {e}")
+
+
+def probe_host_facts() -> Dict:
+    """Collect static host facts (the expensive part)"""
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "python_version": platform.python_version(),
+    }
+
+
+def detect_project_type(directory: Path = None, snapshot: Dict = None) -> Optional[str]:
+    """Detect project type for a directory, memoized by directory inode and mtime.
+
+    Adding or removing a marker file changes the directory mtime, which
+    invalidates the memoized entry.
+    """
+    directory = Path(directory or Path.cwd())
+    try:
+        stat = os.stat(directory)
+    except OSError:
+        return None
+
+    stamp = [stat.st_ino, stat.st_mtime_ns]
+    projects = snapshot.setdefault("projects", {}) if snapshot is not None else {}
+    cached = projects.get(str(directory))
+    if cached and cached.get("stamp") == stamp:
+        return cached.get("project_type")
+
+    project_type = None
+    for file in PROJECT_FILES:
+        if (directory / file).exists():
+            project_type = file
+            break
+
+    projects.pop(str(directory), None)
+    projects[str(directory)] = {"stamp": stamp, "project_type": project_type}
+    while len(projects) > MAX_PROJECT_ENTRIES:
+        projects.pop(next(iter(projects)))
+
+    if snapshot is not None:
+        snapshot["dirty"] = True
+    return project_type
+
+
+def get_host_context(directory: Path = None, snapshot_file: Path = None) -> Dict:
+    """Return static host facts plus the project type for a directory.
+
+    Host facts are re-probed only when the boot ID, hostname or Python
+    interpreter changes; otherwise this is a single small file read.
+    """
+    snapshot = load_snapshot(snapshot_file)
+    key = snapshot_key()
+
+    if snapshot.get("key") != key or "facts" not in snapshot:
+        snapshot = {"key": key, "facts": probe_host_facts(), "projects": {}, "dirty": True}
+
+    context = dict(snapshot["facts"])
+    project_type = detect_project_type(directory, snapshot)
+    if project_type:
+        context["project_type"] = project_type
+
+    if snapshot.pop("dirty", False):
+        save_snapshot(snapshot, snapshot_file)
+
+    return context
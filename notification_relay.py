@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Central notification relay for Claude Code hooks.
+Accepts hook events from many machines over HTTP or a Unix socket, batches and
+coalesces them, and posts to Discord through one pooled, rate-limited connection.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from aiohttp import web, ClientSession, ClientTimeout, ClientError
+
+from webhook_index import WebhookIndex, wait_url
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Configuration
+BATCH_INTERVAL = 2.0  # seconds to collect events before posting
+MAX_EMBEDS_PER_MESSAGE = 10  # Discord limit
+MAX_CONTENT_LENGTH = 2000  # Discord limit
+VOLATILE_EMBED_KEYS = ("timestamp", "footer")  # differ on every hook run
+MAX_PENDING_EVENTS = 1000
+MAX_SEND_ATTEMPTS = 5
+
+
+def load_env_vars():
+    """Load environment variables from .env file"""
+    env_paths = [
+        Path.home() / ".claude" / "hooks" / ".env",
+        Path("/home/charlie/.claude/hooks/.env"),
+        Path.cwd() / ".env"
+    ]
+
+    env_vars = {}
+    for env_path in env_paths:
+        if env_path.exists():
+            try:
+                with open(env_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if '=' in line and not line.startswith('#'):
+                            key, value = line.split('=', 1)
+                            env_vars[key] = value
+            except Exception as e:
+                logger.error(f"Error reading {env_path}: {e}")
+
+    return env_vars
+
+
+def coalesce_key(payload: dict, session: Optional[dict]) -> str:
+    """Identity of an event for merging repeats, ignoring per-event embed fields"""
+    embeds = [{k: v for k, v in embed.items() if k not in VOLATILE_EMBED_KEYS}
+              if isinstance(embed, dict) else embed
+              for embed in payload.get("embeds", [])]
+    return json.dumps([dict(payload, embeds=embeds), session], sort_keys=True, default=str)
+
+
+def coalesce_events(events: List[dict]) -> List[Tuple[dict, Optional[dict]]]:
+    """Merge and pack events into as few Discord payloads as possible.
+
+    Repeats of an event (same payload apart from embed timestamps and footers,
+    same session) become one entry with a ×N count, keeping the latest embed.
+    Entries of the same session are then packed into one message, contents
+    joined by newlines, up to Discord's 10 embeds and 2000 characters. Sessions
+    are never mixed so replies still route. Returns (payload, session) pairs.
+    """
+    groups: "OrderedDict[str, dict]" = OrderedDict()
+    for event in events:
+        payload = event.get("payload", {})
+        group = groups.setdefault(coalesce_key(payload, event.get("session")),
+                                  {"session": event.get("session"), "count": 0, "clients": []})
+        group["payload"] = payload
+        group["count"] += 1
+        client = event.get("client", "unknown")
+        if client not in group["clients"]:
+            group["clients"].append(client)
+
+    payloads = []
+    open_messages = {}
+    for group in groups.values():
+        payload = group["payload"]
+        content = payload.get("content", "")
+        if group["count"] > 1:
+            content = f"{content} ×{group['count']} ({', '.join(group['clients'][:5])})"
+        content = content[:MAX_CONTENT_LENGTH]
+        embeds = list(payload.get("embeds", []))
+        extra = {k: v for k, v in payload.items() if k not in ("content", "embeds")}
+        pack_key = json.dumps([group["session"], extra], sort_keys=True, default=str)
+
+        message = open_messages.get(pack_key)
+        if message is not None:
+            joined = len(message["content"]) + 1 + len(content) if message["content"] else len(content)
+            room = MAX_EMBEDS_PER_MESSAGE - len(message.get("embeds", []))
+            if joined > MAX_CONTENT_LENGTH or room < min(len(embeds), MAX_EMBEDS_PER_MESSAGE):
+                message = None
+        if message is None:
+            message = dict(extra, content="")
+            payloads.append((message, group["session"]))
+            open_messages[pack_key] = message
+        message["content"] = "\n".join(part for part in (message["content"], content) if part)
+
+        # An entry with more than 10 embeds spills into continuation messages
+        while embeds:
+            room = MAX_EMBEDS_PER_MESSAGE - len(message.get("embeds", []))
+            if room == 0:
+                message = dict(extra, content="")
+                payloads.append((message, group["session"]))
+                open_messages[pack_key] = message
+                room = MAX_EMBEDS_PER_MESSAGE
+            message.setdefault("embeds", []).extend(embeds[:room])
+            embeds = embeds[room:]
+
+    return payloads
+
+
+class RateLimiter:
+    """Tracks Discord's webhook bucket from response headers"""
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.hits = 0
+
+    async def acquire(self):
+        """Wait until the bucket allows another request"""
+        if self.remaining == 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                logger.info(f"Rate limit bucket empty, waiting {delay:.2f}s")
+                await asyncio.sleep(delay)
+            self.remaining = None
+
+    def update(self, headers):
+        """Update bucket state from X-RateLimit-* headers"""
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset-After" in headers:
+                self.reset_at = time.monotonic() + float(headers["X-RateLimit-Reset-After"])
+        except ValueError:
+            pass
+
+    def backoff(self, retry_after: float):
+        """Record a 429 and block the bucket until retry_after elapses"""
+        self.hits += 1
+        self.remaining = 0
+        self.reset_at = time.monotonic() + retry_after
+
+
+class NotificationRelay:
+    def __init__(self, webhook_url: str, token: str = "", batch_interval: float = BATCH_INTERVAL,
+                 index_db: Optional[Path] = None):
+        """Initialize relay state (index_db defaults to ~/.claude/webhook_messages.db)"""
+        self.webhook_url = webhook_url
+        self.index_db = index_db
+        self.token = token
+        self.batch_interval = batch_interval
+        self.pending: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self.rate_limiter = RateLimiter()
+        self.session: Optional[ClientSession] = None
+        self.flusher: Optional[asyncio.Task] = None
+        self.stats = {"received": 0, "dropped": 0, "posted": 0, "failed": 0}
+        self.webhook_index: Optional[WebhookIndex] = None
+
+    async def start(self, app: web.Application):
+        """Open the pooled Discord connection and start the batch flusher"""
+        try:
+            self.webhook_index = WebhookIndex(self.index_db)
+        except Exception as e:
+            logger.warning(f"Webhook message index unavailable: {e}")
+        self.session = ClientSession(timeout=ClientTimeout(total=10))
+        self.flusher = asyncio.create_task(self.flush_loop())
+
+    async def stop(self, app: web.Application):
+        """Flush remaining events and close the Discord connection"""
+        if self.flusher:
+            self.flusher.cancel()
+            try:
+                await self.flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush_once()
+        if self.session:
+            await self.session.close()
+        if self.webhook_index:
+            self.webhook_index.close()
+
+    async def handle_event(self, request: web.Request) -> web.Response:
+        """Accept one event from a hook client"""
+        if self.token and request.headers.get("Authorization") != f"Bearer {self.token}":
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        try:
+            event = await request.json()
+        except ValueError:
+            return web.json_response({"error": "invalid JSON"}, status=400)
+        if not isinstance(event, dict) or not isinstance(event.get("payload"), dict):
+            return web.json_response({"error": "missing payload"}, status=400)
+
+        try:
+            self.pending.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return web.json_response({"error": "relay busy"}, status=503)
+
+        self.stats["received"] += 1
+        return web.json_response({"status": "queued"}, status=202)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """Report relay counters"""
+        return web.json_response(dict(
+            self.stats,
+            pending=self.pending.qsize(),
+            rate_limit_hits=self.rate_limiter.hits,
+        ))
+
+    async def flush_loop(self):
+        """Post collected events every batch interval"""
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            try:
+                await self.flush_once()
+            except Exception as e:
+                logger.error(f"Error flushing events: {e}")
+
+    async def flush_once(self):
+        """Drain pending events and post them as coalesced payloads"""
+        events = []
+        while not self.pending.empty():
+            events.append(self.pending.get_nowait())
+        if not events:
+            return
+
+        payloads = coalesce_events(events)
+        logger.info(f"Posting {len(events)} event(s) as {len(payloads)} Discord message(s)")
+        for payload, session in payloads:
+            await self.post_to_discord(payload, session)
+
+    async def post_to_discord(self, payload: dict, session: Optional[dict] = None) -> bool:
+        """Post one payload, honoring the shared rate limit"""
+        if not self.webhook_url:
+            logger.warning("No DISCORD_WEBHOOK configured, dropping payload")
+            self.stats["failed"] += 1
+            return False
+
+        for attempt in range(MAX_SEND_ATTEMPTS):
+            await self.rate_limiter.acquire()
+            try:
+                async with self.session.post(wait_url(self.webhook_url), json=payload) as response:
+                    self.rate_limiter.update(response.headers)
+                    if response.status in (200, 204):
+                        self.stats["posted"] += 1
+                        if response.status == 200:
+                            await self.index_message(response, session)
+                        return True
+                    if response.status == 429:
+                        retry_after = float(response.headers.get("Retry-After", 1))
+                        try:
+                            retry_after = float((await response.json()).get("retry_after", retry_after))
+                        except (ValueError, ClientError):
+                            pass
+                        logger.warning(f"Rate limited by Discord, retrying in {retry_after}s")
+                        self.rate_limiter.backoff(retry_after)
+                        continue
+                    logger.error(f"Discord API error: {response.status} - {await response.text()}")
+                    if 400 <= response.status < 500:
+                        break  # the payload or webhook is bad; retrying will not help
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error posting to Discord (attempt {attempt + 1}): {e}")
+            await asyncio.sleep(2 ** attempt)
+
+        self.stats["failed"] += 1
+        return False
+
+    async def index_message(self, response, session: Optional[dict] = None):
+        """Record a posted message so a bot on this host can route replies to it"""
+        if not self.webhook_index:
+            return
+        try:
+            message = await response.json()
+            channel_id = message.get("channel_id")
+            await asyncio.to_thread(self.webhook_index.record, int(message["id"]),
+                                    int(channel_id) if channel_id else None, session)
+        except Exception as e:
+            logger.warning(f"Could not index webhook message: {e}")
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application"""
+        app = web.Application(client_max_size=256 * 1024)
+        app.router.add_post("/events", self.handle_event)
+        app.router.add_get("/health", self.handle_health)
+        app.on_startup.append(self.start)
+        app.on_cleanup.append(self.stop)
+        return app
+
+
+async def run_relay(host: str, port: int, unix_path: Optional[str]):
+    """Run the relay until interrupted"""
+    env_vars = load_env_vars()
+    webhook_url = env_vars.get('DISCORD_WEBHOOK') or os.getenv('DISCORD_WEBHOOK', '')
+    token = env_vars.get('CLAUDE_RELAY_TOKEN') or os.getenv('CLAUDE_RELAY_TOKEN', '')
+
+    relay = NotificationRelay(webhook_url, token)
+    runner = web.AppRunner(relay.create_app())
+    await runner.setup()
+
+    if unix_path:
+        site = web.UnixSite(runner, unix_path)
+        logger.info(f"Notification relay listening on unix://{unix_path}")
+    else:
+        site = web.TCPSite(runner, host, port)
+        logger.info(f"Notification relay listening on http://{host}:{port}")
+    if not token:
+        logger.warning("No CLAUDE_RELAY_TOKEN configured - relay accepts events from anyone who can connect")
+    await site.start()
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Central notification relay for Claude Code hooks")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8787, help="Port to listen on")
+    parser.add_argument("--unix", dest="unix_path", help="Listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_relay(args.host, args.port, args.unix_path))
+    except KeyboardInterrupt:
+        logger.info("Relay stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
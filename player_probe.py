@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Audio player capability cache for the sound manager.
+Remembers which player backends exist and which commands work for each file
+format and sound type, so later plays go straight to a known-good command.
+Missing executables are remembered for the whole TTL; other failures (a
+PulseAudio hiccup, a timeout) only demote a player for a few minutes.
+"""
+
+import os
+import json
+import time
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configuration
+PROBE_CACHE_FILE = Path.home() / ".claude" / "sound_probe.json"
+PROBE_TTL = 24 * 3600  # seconds
+FAILURE_TTL = 10 * 60  # seconds a failed player or command is tried last
+PROBE_VERSION = 2
+
+
+class PlayerProbe:
+    def __init__(self, config_digest: str, system: str, cache_file: Path = None, ttl: int = PROBE_TTL):
+        """Load the probe cache, discarding it if PATH, config or TTL no longer match"""
+        self.cache_file = Path(cache_file or PROBE_CACHE_FILE)
+        self.ttl = ttl
+        self.key = {
+            "path": os.environ.get("PATH", ""),
+            "config": config_digest,
+            "system": system,
+            "version": PROBE_VERSION,
+        }
+        self.dirty = False
+        self.data = self.load()
+
+    def new_data(self) -> Dict:
+        """Empty probe state"""
+        self.dirty = True
+        return {"key": self.key, "created": time.time(), "backends": {}, "formats": {}, "commands": {}}
+
+    def load(self) -> Dict:
+        """Load cached probe results if still valid"""
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            if data.get("key") == self.key and time.time() - data.get("created", 0) < self.ttl:
+                return data
+        except (OSError, ValueError):
+            pass
+        return self.new_data()
+
+    def save(self):
+        """Persist probe results if anything was learned"""
+        if not self.dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save sound probe cache: {e}")
+
+    def reset(self):
+        """Forget everything and probe again on the next plays"""
+        self.data = self.new_data()
+
+    # Backends -----------------------------------------------------------
+
+    def has_backend(self, executable: str) -> bool:
+        """Check (once) whether an executable exists on PATH"""
+        backends = self.data["backends"]
+        if executable not in backends:
+            backends[executable] = shutil.which(executable) is not None
+            self.dirty = True
+        return backends[executable]
+
+    def mark_missing(self, executable: str):
+        """Record that launching an executable failed with FileNotFoundError"""
+        if self.data["backends"].get(executable) is not False:
+            self.data["backends"][executable] = False
+            self.dirty = True
+
+    def failed_recently(self, failed_at: Optional[float]) -> bool:
+        """Whether a failure timestamp is still inside FAILURE_TTL"""
+        return failed_at is not None and time.time() - failed_at < FAILURE_TTL
+
+    # File formats -------------------------------------------------------
+
+    def order_players(self, extension: str, players: List[str]) -> List[str]:
+        """Existing players for a format: known-good first, recently failed last"""
+        entry = self.data["formats"].get(extension, {})
+        failed = entry.get("failed", {})
+        ordered = [p for p in players if self.has_backend(p)]
+        ordered.sort(key=lambda p: (p != entry.get("player"), self.failed_recently(failed.get(p))))
+        return ordered
+
+    def record_player(self, extension: str, player: str, ok: bool):
+        """Record whether a player worked for a file format"""
+        entry = self.data["formats"].setdefault(extension, {"player": None, "failed": {}})
+        if ok:
+            if entry["player"] != player or player in entry["failed"]:
+                entry["player"] = player
+                entry["failed"].pop(player, None)
+                self.dirty = True
+        else:
+            entry["failed"][player] = time.time()
+            if entry["player"] == player:
+                entry["player"] = None
+            self.dirty = True
+
+    # Sound commands -----------------------------------------------------
+
+    @staticmethod
+    def command_key(command: List[str]) -> str:
+        """Stable string key for a command list"""
+        return json.dumps(command)
+
+    def command_rank(self, sound_config: Dict) -> int:
+        """0 known-good, 1 untried (or synthesized), 2 failed recently"""
+        if "command" not in sound_config:
+            return 1
+        status = self.data["commands"].get(self.command_key(sound_config["command"]))
+        if status is True:
+            return 0
+        return 2 if self.failed_recently(status) else 1
+
+    def order_commands(self, sound_commands: List[Dict]) -> List[Dict]:
+        """Usable commands for a sound type: known-good first, recently failed last,
+        commands whose executable is missing dropped"""
+        usable = []
+        for sound_config in sound_commands:
+            if "synth" in sound_config:
+                # Rendered in-process; playback goes through the file players
+                usable.append(sound_config)
+                continue
+            command = sound_config.get("command") or []
+            if not command or not self.has_backend(command[0]):
+                continue
+            usable.append(sound_config)
+        usable.sort(key=self.command_rank)
+        return usable
+
+    def record_command(self, command: List[str], ok: bool):
+        """Record whether a sound command worked (a failure holds for FAILURE_TTL)"""
+        key = self.command_key(command)
+        if ok and self.data["commands"].get(key) is True:
+            return
+        self.data["commands"][key] = True if ok else time.time()
+        self.dirty = True
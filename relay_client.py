@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Lightweight client for the central notification relay.
+Hooks forward events to the relay instead of posting to Discord directly;
+events are spooled locally while the relay is unreachable.
+"""
+
+import os
+import json
+import time
+import socket
+import platform
+import http.client
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+# Configuration
+RELAY_SPOOL_DIR = Path.home() / ".claude" / "relay_spool"
+REJECTED_DIR_NAME = "rejected"  # dead-lettered events the relay refused, kept for inspection
+RELAY_TIMEOUT = 2  # seconds
+MAX_SPOOL_FILES = 500
+
+
+def load_relay_config():
+    """Load CLAUDE_RELAY_URL and CLAUDE_RELAY_TOKEN from .env file or environment"""
+    env_paths = [
+        Path.home() / ".claude" / "hooks" / ".env",
+        Path("/home/charlie/.claude/hooks/.env"),
+        Path.cwd() / ".env"
+    ]
+
+    env_vars = {}
+    for env_path in env_paths:
+        if env_path.exists():
+            try:
+                with open(env_path, 'r') as f:
+                    for line in f:
+                        line = line.strip()
+                        if '=' in line and not line.startswith('#'):
+                            key, value = line.split('=', 1)
+                            env_vars.setdefault(key, value)
+            except Exception as e:
+                print(f"Error reading {env_path}: {e}")
+
+    relay_url = env_vars.get('CLAUDE_RELAY_URL') or os.getenv('CLAUDE_RELAY_URL', '')
+    relay_token = env_vars.get('CLAUDE_RELAY_TOKEN') or os.getenv('CLAUDE_RELAY_TOKEN', '')
+    return relay_url, relay_token
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket"""
+
+    def __init__(self, socket_path: str, timeout: float = RELAY_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class RelayClient:
+    def __init__(self, relay_url: str = None, token: str = None, spool_dir: Path = None):
+        """Initialize client; relay_url is http://host:port or unix:///path/to.sock"""
+        if relay_url is None:
+            relay_url, token = load_relay_config()
+        self.relay_url = relay_url
+        self.token = token or ""
+        self.spool_dir = Path(spool_dir or RELAY_SPOOL_DIR)
+        self.client_name = platform.node()
+
+    def is_configured(self) -> bool:
+        """Check if a relay URL is configured"""
+        return bool(self.relay_url)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Open a connection to the relay"""
+        parsed = urlparse(self.relay_url)
+        if parsed.scheme == "unix":
+            return UnixHTTPConnection(parsed.path)
+        if parsed.scheme == "https":
+            return http.client.HTTPSConnection(parsed.hostname, parsed.port or 443, timeout=RELAY_TIMEOUT)
+        return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=RELAY_TIMEOUT)
+
+    def _post(self, conn: http.client.HTTPConnection, event: dict) -> int:
+        """POST one event over an open connection and return the HTTP status"""
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        conn.request("POST", "/events", body=json.dumps(event), headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+
+    @staticmethod
+    def _accepted(status: int) -> bool:
+        return status in (200, 202)
+
+    @staticmethod
+    def _rejected(status: int) -> bool:
+        """The relay refused the event itself; resending it will never succeed"""
+        return 400 <= status < 500 and status != 429
+
+    def _spool(self, event: dict):
+        """Store an event locally for later delivery"""
+        try:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            spooled = sorted(self.spool_dir.glob("*.json"))
+            for old_file in spooled[:max(0, len(spooled) - MAX_SPOOL_FILES + 1)]:
+                old_file.unlink(missing_ok=True)
+
+            spool_file = self.spool_dir / f"{time.time_ns()}-{os.getpid()}.json"
+            tmp_file = spool_file.with_suffix(".tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(event, f)
+            os.replace(tmp_file, spool_file)
+            print(f"📥 Relay unreachable, spooled event to {spool_file.name}")
+        except Exception as e:
+            print(f"❌ Error spooling relay event: {e}")
+
+    def _dead_letter(self, spool_file: Path, status: int):
+        """Move a refused spooled event aside so it no longer blocks the spool"""
+        try:
+            rejected_dir = self.spool_dir / REJECTED_DIR_NAME
+            rejected_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(spool_file, rejected_dir / spool_file.name)
+            print(f"🚫 Relay rejected spooled event {spool_file.name} ({status}), moved to {REJECTED_DIR_NAME}/")
+        except OSError:
+            spool_file.unlink(missing_ok=True)
+
+    def _drain_spool(self, conn: http.client.HTTPConnection) -> int:
+        """Forward spooled events oldest first, stopping when the relay is unavailable"""
+        if not self.spool_dir.exists():
+            return 0
+
+        sent = 0
+        for spool_file in sorted(self.spool_dir.glob("*.json")):
+            try:
+                with open(spool_file, "r") as f:
+                    event = json.load(f)
+            except (OSError, ValueError):
+                spool_file.unlink(missing_ok=True)
+                continue
+
+            status = self._post(conn, event)
+            if self._rejected(status):
+                self._dead_letter(spool_file, status)
+                continue
+            if not self._accepted(status):
+                break
+            spool_file.unlink(missing_ok=True)
+            sent += 1
+        return sent
+
+    def forward(self, content: str, embed_data: dict = None, session: dict = None) -> bool:
+        """Forward a notification to the relay, spooling it on failure"""
+        payload = {"content": content}
+        if embed_data:
+            payload["embeds"] = [embed_data]
+        event = {
+            "client": self.client_name,
+            "timestamp": time.time(),
+            "payload": payload,
+        }
+        if session:
+            event["session"] = session
+
+        conn = None
+        try:
+            conn = self._connection()
+            drained = self._drain_spool(conn)
+            if drained:
+                print(f"📤 Forwarded {drained} spooled event(s) to relay")
+            status = self._post(conn, event)
+            if self._accepted(status):
+                print("✅ Event forwarded to notification relay")
+                return True
+            if self._rejected(status):
+                print(f"❌ Relay rejected event ({status}), not spooling it")
+                return False
+            print(f"❌ Relay unavailable ({status})")
+        except (OSError, http.client.HTTPException) as e:
+            print(f"🔌 Relay connection error: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+        self._spool(event)
+        return False
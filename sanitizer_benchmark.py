@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Command sanitizer benchmark and fuzzer.
+Measures throughput of the compiled policy against the previous per-pattern
+loop on typical prompts and on the seed corpus, checks that adversarial inputs scale linearly (no pathological
+backtracking) and fuzzes mutations of the seed corpus for crashes and
+non-idempotent output.
+"""
+
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from command_sanitizer import CommandSanitizer, REMOVED_MARKER
+
+# Configuration
+CORPUS_FILE = Path(__file__).parent / "sanitizer_corpus.json"
+SCALING_SIZES = (1_000, 10_000, 100_000)
+MAX_SCALING_RATIO = 25  # 10x input may cost at most this much more time
+MAX_CASE_SECONDS = 1.0
+
+# Everyday commands, for throughput on ordinary traffic
+TYPICAL_PROMPTS = [
+    "explain the auth module and how tokens are refreshed",
+    "run the tests and fix failures",
+    "add a retry with exponential backoff to the webhook client, keep the existing logging style",
+    "why does the build fail on python 3.12? look at the CI logs in the last run",
+    "refactor the config loader so the defaults live in one place and write a short summary of what changed",
+    "update the README section about sounds",
+    "check git status and tell me what is uncommitted",
+    "summarize the open TODOs in the repository",
+    "the notification hook posts twice when a session ends; find out why and fix it",
+    "write unit tests for the command queue recovery path, including a row stuck in cancelling",
+    "what changed in the last three commits?",
+    "rename get_config to load_config everywhere and make sure nothing else breaks",
+]
+
+legacy_logger = logging.getLogger("sanitizer_benchmark.legacy")
+
+LEGACY_PATTERNS = [
+    'rm -rf', 'sudo', 'su ', 'chmod 777', 'wget', 'curl',
+    '>', '>>', '|', '&', ';', '$(', '`', 'eval', 'exec'
+]
+
+# Inputs built to make regex engines backtrack: long runs of near-matches
+ADVERSARIAL = {
+    "plain_text": lambda n: ("explain the module " * n)[:n],
+    "near_rm": lambda n: ("rm " + " " * 50 + "-r") * (n // 55),
+    "near_chmod": lambda n: ("chmod" + " " * 40 + "77") * (n // 47),
+    "word_chars": lambda n: "s" * n,
+    "su_prefixes": lambda n: "su" * (n // 2),
+    "metachars": lambda n: "$`|&;>" * (n // 6),
+    "whitespace": lambda n: " " * n,
+}
+
+
+def legacy_sanitize(command: str) -> str:
+    """The previous sanitize_command loop, for comparison"""
+    sanitized = command.strip()
+    for pattern in LEGACY_PATTERNS:
+        if pattern in sanitized.lower():
+            legacy_logger.warning(f'Dangerous pattern detected: {pattern}')
+            sanitized = sanitized.replace(pattern, '[REMOVED]')
+    if len(sanitized) > 500:
+        sanitized = sanitized[:500] + '...'
+    return sanitized
+
+
+def load_corpus() -> List[Dict]:
+    """Seed cases shipped with the repository"""
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def time_calls(function: Callable[[str], object], inputs: List[str], repeat: int) -> float:
+    """Seconds for `repeat` passes over the inputs"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            function(text)
+    return time.perf_counter() - started
+
+
+def bench_throughput(sanitizer: CommandSanitizer, inputs: List[str], repeat: int) -> Dict:
+    """Commands per second for the compiled policy and the legacy loop"""
+    calls = len(inputs) * repeat
+    compiled = time_calls(sanitizer.sanitize, inputs, repeat)
+    legacy = time_calls(legacy_sanitize, inputs, repeat)
+    return {
+        "commands": calls,
+        "compiled_per_sec": round(calls / compiled),
+        "legacy_per_sec": round(calls / legacy),
+    }
+
+
+def bench_scaling(sanitizer: CommandSanitizer) -> List[Dict]:
+    """Time adversarial inputs at growing sizes; flag superlinear growth"""
+    results = []
+    for name, generate in ADVERSARIAL.items():
+        timings = []
+        for size in SCALING_SIZES:
+            text = generate(size)
+            timings.append(time_calls(sanitizer.sanitize, [text], 1))
+        ratio = timings[-1] / max(timings[-2], 1e-6)
+        results.append({
+            "input": name,
+            "ms": [round(t * 1000, 3) for t in timings],
+            "ratio": round(ratio, 1),
+            "ok": ratio <= MAX_SCALING_RATIO and max(timings) <= MAX_CASE_SECONDS,
+        })
+    return results
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """Random insertion, deletion, duplication or case flip"""
+    alphabet = "abcdefrmsuxo -|&;>$()`'\"\\\n\t7é✅"
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        operation = rng.randrange(4)
+        position = rng.randint(0, len(chars))
+        if operation == 0:
+            chars.insert(position, rng.choice(alphabet))
+        elif operation == 1 and chars:
+            del chars[min(position, len(chars) - 1)]
+        elif operation == 2:
+            chars[position:position] = chars[position:position + rng.randint(1, 8)]
+        elif chars:
+            i = min(position, len(chars) - 1)
+            chars[i] = chars[i].swapcase()
+    return "".join(chars)
+
+
+def fuzz(sanitizer: CommandSanitizer, corpus: List[Dict], iterations: int, seed: int) -> Dict:
+    """Mutate corpus seeds; sanitized output must not trigger any rule again"""
+    rng = random.Random(seed)
+    failures = []
+    slowest = 0.0
+    for _ in range(iterations):
+        text = mutate(rng.choice(corpus)["input"], rng)
+        started = time.perf_counter()
+        result = sanitizer.sanitize(text)
+        slowest = max(slowest, time.perf_counter() - started)
+        if result.truncated or result.rejected:
+            continue
+        again = sanitizer.sanitize(result.text)
+        if again.fired and REMOVED_MARKER not in text:
+            failures.append({"input": text, "output": result.text, "fired_again": again.fired})
+    return {"iterations": iterations, "failures": failures[:10], "slowest_ms": round(slowest * 1000, 3)}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark and fuzz the command sanitizer")
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the corpus for throughput")
+    parser.add_argument("--fuzz", type=int, default=20000, help="Fuzz iterations")
+    parser.add_argument("--seed", type=int, default=0, help="Fuzz random seed")
+    parser.add_argument("--json", dest="json_output", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Rule warnings would dominate the timings
+    logging.getLogger("command_sanitizer").setLevel(logging.ERROR)
+    legacy_logger.setLevel(logging.ERROR)
+
+    sanitizer = CommandSanitizer.from_file()
+    corpus = load_corpus()
+
+    # Corpus expectations first: a policy change should be deliberate
+    mismatches = []
+    for case in corpus:
+        result = sanitizer.sanitize(case["input"])
+        if result.fired != case["fired"] or result.text != case["output"]:
+            mismatches.append({"input": case["input"], "fired": result.fired, "output": result.text})
+
+    report = {
+        "corpus_mismatches": mismatches,
+        "throughput": {
+            "prompts": bench_throughput(sanitizer, TYPICAL_PROMPTS, max(1, args.repeat)),
+            "corpus": bench_throughput(sanitizer, [case["input"] for case in corpus], max(1, args.repeat)),
+        },
+        "scaling": bench_scaling(sanitizer),
+        "fuzz": fuzz(sanitizer, corpus, args.fuzz, args.seed),
+    }
+    ok = (not mismatches and not report["fuzz"]["failures"] and
+          all(r["ok"] for r in report["scaling"]))
+
+    if args.json_output:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return 0 if ok else 1
+
+    print("🛡️ Command sanitizer benchmark")
+    print("=" * 40)
+    print(f"Corpus cases: {len(corpus)} ({len(mismatches)} mismatched)")
+    for workload, throughput in report["throughput"].items():
+        print(f"Throughput ({workload}): {throughput['compiled_per_sec']:,} commands/s compiled, "
+              f"{throughput['legacy_per_sec']:,} commands/s legacy loop")
+    print(f"\n{'Adversarial input':<16} " + " ".join(f"{s:>10,}" for s in SCALING_SIZES) + "   10x ratio")
+    for r in report["scaling"]:
+        print(f"{r['input']:<16} " + " ".join(f"{ms:>8.2f}ms" for ms in r["ms"]) +
+              f"   {r['ratio']:>8}{'' if r['ok'] else '  ⚠️'}")
+    fuzz_report = report["fuzz"]
+    print(f"\nFuzz: {fuzz_report['iterations']} mutations, {len(fuzz_report['failures'])} failures, "
+          f"slowest {fuzz_report['slowest_ms']}ms")
+    for failure in fuzz_report["failures"]:
+        print(f"   ❌ {failure['input']!r} -> {failure['output']!r} fired again: {failure['fired_again']}")
+    for mismatch in mismatches:
+        print(f"   ❌ corpus {mismatch['input']!r}: {mismatch['fired']} -> {mismatch['output']!r}")
+    print(f"\n{'✅ All checks passed' if ok else '❌ Some checks failed'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Slash commands for the command bot.
+/claude run, /claude status and /claude cancel arrive as interactions with
+structured arguments, so they need no message content, prefix parsing or
+message fetches. Each handler defers first to stay inside Discord's 3-second
+window, then answers with a followup.
+"""
+
+import json
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional
+
+import discord
+from discord import app_commands
+
+from attachment_store import AttachmentRejected
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SLASH_COMMANDS_STATE_FILE = Path.home() / ".claude" / "slash_commands.json"
+STATUS_ICONS = {
+    "pending": "⏳",
+    "running": "▶️",
+    "cancelling": "⏹️",
+    "done": "✅",
+    "failed": "❌",
+    "cancelled": "🚫",
+    "processed": "☑️",  # JSON backend: taken by the monitor, outcome unknown
+}
+RECENT_COMMANDS_SHOWN = 5
+COMMAND_PREVIEW_LENGTH = 60
+
+
+def format_command(entry: dict) -> str:
+    """One status line for a queued command"""
+    text = entry.get("command", "")
+    if len(text) > COMMAND_PREVIEW_LENGTH:
+        text = text[:COMMAND_PREVIEW_LENGTH - 3] + "..."
+    icon = STATUS_ICONS.get(entry["status"], "•")
+    return f"{icon} `{text}` — {entry['status']} (ID `{entry['command_id']}`)"
+
+
+class ClaudeCommandGroup(app_commands.Group):
+    """/claude run | status | cancel"""
+
+    def __init__(self, bot, command_queue):
+        super().__init__(name="claude", description="Run and manage Claude Code commands")
+        self.bot = bot
+        self.command_queue = command_queue
+        # One connection for status and cancel; queue calls must not interleave
+        self.queue_lock = asyncio.Lock()
+
+    async def queue_call(self, method, *args, **kwargs):
+        """Run a blocking queue method off the event loop"""
+        async with self.queue_lock:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def defer(self, interaction: discord.Interaction, ephemeral: bool = False):
+        """Acknowledge the interaction before doing any work"""
+        with self.bot.metrics.timer("interaction_defer"):
+            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.bot.is_authorized(interaction.user.id):
+            return True
+        logger.info(f'Ignoring interaction from unauthorized user: {interaction.user.id}')
+        await interaction.response.send_message("You are not authorized to run commands.", ephemeral=True)
+        return False
+
+    @app_commands.command(name="run", description="Queue a command for Claude Code")
+    @app_commands.describe(command="What Claude Code should do", file="A file for Claude Code to read")
+    async def run(self, interaction: discord.Interaction, command: str,
+                  file: Optional[discord.Attachment] = None):
+        await self.defer(interaction)
+        with self.bot.metrics.timer("slash_run"):
+            try:
+                result, command_id = await self.bot.submit_command(
+                    command, interaction.user, interaction.channel_id, interaction.id,
+                    interaction.guild_id, source="interaction", attachments=[file] if file else ())
+            except AttachmentRejected as e:
+                await interaction.followup.send(f"🚫 Attachment rejected: {e}")
+                return
+            except Exception as e:
+                logger.error(f'Error queuing command: {e}')
+                self.bot.metrics.increment("commands_failed")
+                await interaction.followup.send("❌ Could not queue the command.")
+                return
+
+        if result.rejected:
+            await interaction.followup.send(f"🚫 Command rejected by policy: {', '.join(result.fired)}")
+        else:
+            await interaction.followup.send(f"✅ Command queued: `{result.text}`\nID `{command_id}`")
+
+    @app_commands.command(name="status", description="Show the command queue or one command")
+    @app_commands.describe(command_id="ID of a command (default: your recent commands)")
+    async def status(self, interaction: discord.Interaction, command_id: Optional[str] = None):
+        await self.defer(interaction, ephemeral=True)
+        with self.bot.metrics.timer("slash_status"):
+            if command_id:
+                entry = await self.queue_call(self.command_queue.get, command_id)
+                content = format_command(entry) if entry else f"No command with ID `{command_id}`."
+            else:
+                counts = await self.queue_call(self.command_queue.counts)
+                recent = await self.queue_call(self.command_queue.recent, RECENT_COMMANDS_SHOWN,
+                                               interaction.user.id)
+                summary = ", ".join(f"{counts.get(status, 0)} {status}"
+                                    for status in ("pending", "running"))
+                lines = [f"Queue: {summary}"]
+                if recent:
+                    lines.append("Your recent commands:")
+                    lines += [format_command(entry) for entry in recent]
+                content = "\n".join(lines)
+        await interaction.followup.send(content[:2000])
+
+    @app_commands.command(name="cancel", description="Cancel a queued or running command")
+    @app_commands.describe(command_id="ID of the command (default: your newest active command)")
+    async def cancel(self, interaction: discord.Interaction, command_id: Optional[str] = None):
+        await self.defer(interaction, ephemeral=True)
+        with self.bot.metrics.timer("slash_cancel"):
+            if command_id:
+                entry = await self.queue_call(self.command_queue.get, command_id)
+            else:
+                recent = await self.queue_call(self.command_queue.recent, RECENT_COMMANDS_SHOWN,
+                                               interaction.user.id)
+                entry = next((e for e in recent if e["status"] in ("pending", "running")), None)
+
+            if entry is None:
+                await interaction.followup.send("No matching command to cancel.")
+                return
+            if entry.get("user_id") != interaction.user.id:
+                await interaction.followup.send("You can only cancel your own commands.")
+                return
+
+            new_status = await self.queue_call(self.command_queue.cancel, entry["command_id"])
+        if new_status == "cancelled":
+            await interaction.followup.send(f"🚫 Cancelled `{entry['command_id']}`.")
+        elif new_status == "cancelling":
+            await interaction.followup.send(f"⏹️ Stopping `{entry['command_id']}`; the monitor will end it shortly.")
+        else:
+            await interaction.followup.send(f"`{entry['command_id']}` is already {entry['status']}.")
+
+
+def command_signature(tree: app_commands.CommandTree) -> str:
+    """Hash of the registered command definitions"""
+    payload = [command.to_dict(tree) for command in tree.get_commands()]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def sync_commands(tree: app_commands.CommandTree, guild_id: Optional[int] = None,
+                        state_file: Path = SLASH_COMMANDS_STATE_FILE) -> bool:
+    """Register the commands with Discord unless this exact set already was.
+
+    Syncing is rate limited and global commands take a while to propagate, so
+    restarts skip it; a guild ID registers them in that guild only, instantly.
+    """
+    state_file = Path(state_file)
+    guild = discord.Object(id=guild_id) if guild_id else None
+    if guild:
+        tree.copy_global_to(guild=guild)
+
+    key = f"{tree.client.application_id}:{guild_id or 'global'}"
+    signature = command_signature(tree)
+    try:
+        with open(state_file, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    if state.get(key) == signature:
+        return False
+
+    await tree.sync(guild=guild)
+    state[key] = signature
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_file, "w") as f:
+        json.dump(state, f, indent=2)
+    logger.info(f"Registered slash commands ({'guild ' + str(guild_id) if guild else 'global'})")
+    return True
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Sound backend latency benchmark.
+Measures, for every configured sound type and command, spawn-to-exec latency,
+time to first audio and total duration. Player commands are routed to a
+PulseAudio null sink whose monitor is recorded, so first audio is measured per
+backend and nothing is heard. The audio server's in-process decode + mix path
+is measured separately. Results are printed as a table and optionally written
+as JSON.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sound_manager import SoundManager, AUDIO_SERVER_PLAYERS
+from sound_synth import render_tone, describe_spec
+
+# Configuration
+COMMAND_TIMEOUT = 10  # seconds
+FIRST_AUDIO_TIMEOUT = 5  # seconds
+NULL_SINK_NAME = "claude_bench_null"
+CAPTURE_RATE = 48000
+CAPTURE_CHUNK = CAPTURE_RATE * 2 // 200  # 5 ms of mono s16le
+CAPTURE_GRACE = 0.1  # seconds to let the recorder catch up after a player exits
+
+
+class NullSinkCapture:
+    """PulseAudio null sink for the spawned players, recorded through its
+    monitor so the first audible sample of each run can be timestamped"""
+
+    def __init__(self):
+        self.module = None
+        self.recorder = None
+        self.armed = False
+        self.first_audio: Optional[float] = None
+
+    def start(self) -> bool:
+        """Load the null sink and start recording it; False without PulseAudio"""
+        try:
+            loaded = subprocess.run(
+                ["pactl", "load-module", "module-null-sink", f"sink_name={NULL_SINK_NAME}",
+                 "sink_properties=device.description=claude-sound-benchmark"],
+                capture_output=True, text=True, timeout=5, check=True)
+            self.module = loaded.stdout.strip()
+            self.recorder = subprocess.Popen(
+                ["parec", "-d", f"{NULL_SINK_NAME}.monitor", "--raw", "--format=s16le",
+                 "--channels=1", f"--rate={CAPTURE_RATE}", "--latency-msec=5"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            self.stop()
+            return False
+        threading.Thread(target=self._read, daemon=True).start()
+        return True
+
+    def _read(self):
+        while True:
+            pcm = self.recorder.stdout.read(CAPTURE_CHUNK)
+            if not pcm:
+                return
+            if self.armed and self.first_audio is None and pcm.strip(b"\0"):
+                self.first_audio = time.perf_counter()
+
+    def env(self) -> Dict[str, str]:
+        """Environment that sends a player's output to the null sink"""
+        return dict(os.environ, PULSE_SINK=NULL_SINK_NAME)
+
+    def arm(self):
+        """Start watching for the next run's first audio"""
+        self.first_audio = None
+        self.armed = True
+
+    def stop(self):
+        if self.recorder:
+            self.recorder.terminate()
+            self.recorder.wait()
+            self.recorder = None
+        if self.module:
+            subprocess.run(["pactl", "unload-module", self.module], capture_output=True, timeout=5)
+            self.module = None
+
+
+def clip_for_entry(sound_config: Dict) -> Optional[Path]:
+    """Audio file a command plays, when it can be identified"""
+    if "synth" in sound_config:
+        return render_tone(sound_config["synth"])
+    command = sound_config.get("command", [])
+    if len(command) == 2 and command[0] in AUDIO_SERVER_PLAYERS:
+        return Path(command[1])
+    return None
+
+
+def measure_server_first_audio(clip: Path) -> Optional[float]:
+    """Seconds from request to first PCM chunk through the audio server's decode + mix
+    path (in-process, the same for every backend)"""
+    from audio_server import Mixer, NullSink, load_wav
+
+    if clip.suffix.lower() != ".wav" or not clip.exists():
+        return None
+
+    class FirstWriteSink(NullSink):
+        def __init__(self):
+            super().__init__(realtime=False)
+            self.first_write = None
+
+        def write(self, pcm: bytes):
+            if self.first_write is None:
+                self.first_write = time.perf_counter()
+            super().write(pcm)
+
+    sink = FirstWriteSink()
+    mixer = Mixer(sink, "mix")
+    mixer.start()
+    started = time.perf_counter()
+    try:
+        mixer.submit(clip.name, load_wav(clip))
+        deadline = started + FIRST_AUDIO_TIMEOUT
+        while sink.first_write is None and time.perf_counter() < deadline:
+            time.sleep(0.0005)
+    except Exception:
+        return None
+    finally:
+        mixer.stop()
+    return None if sink.first_write is None else sink.first_write - started
+
+
+def measure_command(command: List[str], capture: Optional[NullSinkCapture] = None) -> Dict:
+    """Spawn a command and time exec, first audio on the capture sink and completion"""
+    result = {"spawn_to_exec": None, "first_audio": None, "total": None, "status": "ok"}
+    env = None
+    if capture:
+        env = capture.env()
+        capture.arm()
+    started = time.perf_counter()
+    try:
+        # Popen returns once the child has exec'd (exec failures raise here)
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        result["status"] = "not found"
+        return result
+    except OSError as e:
+        result["status"] = f"error: {e}"
+        return result
+    result["spawn_to_exec"] = time.perf_counter() - started
+
+    try:
+        returncode = process.wait(timeout=COMMAND_TIMEOUT)
+        if returncode:
+            result["status"] = f"exit {returncode}"
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        result["status"] = "timeout"
+    result["total"] = time.perf_counter() - started
+
+    if capture:
+        deadline = time.perf_counter() + CAPTURE_GRACE
+        while capture.first_audio is None and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        capture.armed = False
+        if capture.first_audio is not None:
+            result["first_audio"] = capture.first_audio - started
+    return result
+
+
+def summarize(values: List[Optional[float]]) -> Optional[float]:
+    """Median in milliseconds, ignoring missing samples"""
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values) * 1000, 2) if values else None
+
+
+def run_benchmark(manager: SoundManager, sound_types: List[str] = None, repeat: int = 1,
+                  spawn: bool = True, real_device: bool = False) -> List[Dict]:
+    """Benchmark every configured command of the given (default: all) sound types.
+
+    Players are spawned only when a null sink is available to route them to,
+    or when real_device allows them to play on the actual output.
+    """
+    if sound_types is None:
+        sound_types = list(manager.platform_commands or manager.config.get("sounds", {}))
+
+    capture = None
+    if spawn:
+        capture = NullSinkCapture()
+        if not capture.start():
+            capture = None
+            if not real_device:
+                print("⚠️ No PulseAudio null sink available; not spawning players "
+                      "(use --real-device to play them on the output device)", file=sys.stderr)
+                spawn = False
+    try:
+        return _run_benchmark(manager, sound_types, repeat, spawn, capture)
+    finally:
+        if capture:
+            capture.stop()
+
+
+def _run_benchmark(manager: SoundManager, sound_types: List[str], repeat: int, spawn: bool,
+                   capture: Optional[NullSinkCapture]) -> List[Dict]:
+    results = []
+    for sound_type in sound_types:
+        for sound_config in manager.get_sound_commands(sound_type):
+            entry = {
+                "sound_type": sound_type,
+                "description": sound_config.get("description", "Unknown"),
+            }
+
+            prepare_started = time.perf_counter()
+            try:
+                clip = clip_for_entry(sound_config)
+            except Exception as e:
+                clip = None
+                entry["status"] = f"error: {e}"
+            entry["prepare_ms"] = round((time.perf_counter() - prepare_started) * 1000, 2)
+
+            if "synth" in sound_config:
+                entry["command"] = describe_spec(sound_config["synth"])
+                players = manager.probe.order_players(".wav", ["paplay", "aplay", "afplay"])
+                command = [players[0], str(clip)] if players and clip else None
+            else:
+                command = sound_config.get("command")
+                entry["command"] = " ".join(command or [])
+
+            runs = []
+            for _ in range(repeat):
+                run = measure_command(command, capture) if spawn and command else {}
+                run["server_first_audio"] = measure_server_first_audio(clip) if clip else None
+                runs.append(run)
+                if spawn and len(runs) < repeat:
+                    time.sleep(0.2)
+
+            entry["spawn_to_exec_ms"] = summarize([r.get("spawn_to_exec") for r in runs])
+            entry["first_audio_ms"] = summarize([r.get("first_audio") for r in runs])
+            entry["server_first_audio_ms"] = summarize([r.get("server_first_audio") for r in runs])
+            entry["total_ms"] = summarize([r.get("total") for r in runs])
+            entry.setdefault("status", runs[-1].get("status", "skipped") if command else "no player")
+            entry["sink"] = "null" if capture and spawn and command else ("device" if spawn and command else None)
+            results.append(entry)
+
+    return results
+
+
+def format_table(results: List[Dict]) -> str:
+    """Render results as a fixed-width table"""
+    def cell(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    header = (f"{'Sound type':<24} {'Command':<40} {'Exec ms':>8} {'1st audio':>9} "
+              f"{'Server ms':>9} {'Total ms':>9}  Status")
+    lines = [header, "-" * len(header)]
+    for r in results:
+        command = r["command"] if len(r["command"]) <= 40 else "…" + r["command"][-39:]
+        lines.append(f"{r['sound_type']:<24} {command:<40} {cell(r['spawn_to_exec_ms']):>8} "
+                     f"{cell(r['first_audio_ms']):>9} {cell(r.get('server_first_audio_ms')):>9} "
+                     f"{cell(r['total_ms']):>9}  {r['status']}")
+    return "\n".join(lines)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark configured sound backends")
+    parser.add_argument("--types", nargs="*", help="Sound types to benchmark (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per command (median reported)")
+    parser.add_argument("--no-spawn", action="store_true",
+                        help="Only measure the audio server path; do not run player commands")
+    parser.add_argument("--real-device", action="store_true",
+                        help="Run player commands on the output device when no null sink is available")
+    parser.add_argument("--json", dest="json_file", help="Write results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args()
+
+    manager = SoundManager()
+    results = run_benchmark(manager, args.types, max(1, args.repeat), spawn=not args.no_spawn,
+                            real_device=args.real_device)
+
+    report = {
+        "system": platform.system(),
+        "hostname": platform.node(),
+        "timestamp": time.time(),
+        "repeat": max(1, args.repeat),
+        "results": results,
+    }
+    if args.json_file == "-":
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print("🎵 Sound backend benchmark")
+    print("=" * 40)
+    print(format_table(results))
+    if args.json_file:
+        with open(args.json_file, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 JSON results written to {args.json_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Pre-decoded audio cache for custom sounds.
+Transcodes each configured clip once into canonical PCM WAV, stored under its
+content hash, and writes a manifest from sound type to cached file so playback
+never needs a decoder or a directory scan.
+"""
+
+import os
+import sys
+import json
+import wave
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configuration
+SOUND_CACHE_DIR = Path.home() / ".claude" / "sound_cache"
+MANIFEST_FILE = SOUND_CACHE_DIR / "manifest.json"
+CLIP_INDEX_FILE = SOUND_CACHE_DIR / "clips.json"
+MAX_INDEXED_CLIPS = 256
+TRANSCODE_TIMEOUT = 30  # seconds
+
+
+def load_numpy():
+    """NumPy if installed, else None; callers import it only when rendering audio"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def transcode_commands(source: Path, target: Path) -> List[List[str]]:
+    """Candidate decoder commands for turning a clip into a WAV file"""
+    src, dst = str(source), str(target)
+    commands = [
+        ["ffmpeg", "-v", "error", "-y", "-i", src, "-ac", "2", "-ar", "44100", "-sample_fmt", "s16", dst],
+        ["sox", src, "-r", "44100", "-c", "2", "-b", "16", dst],
+    ]
+    extension = source.suffix.lower()
+    if extension == ".mp3":
+        commands.append(["mpg123", "-q", "-w", dst, src])
+    elif extension == ".ogg":
+        commands.append(["ogg123", "-q", "-d", "wav", "-f", dst, src])
+    commands.append(["afconvert", "-f", "WAVE", "-d", "LEI16@44100", src, dst])
+    return commands
+
+
+def decode_to_wav(source: Path, target: Path) -> bool:
+    """Decode any supported clip into a (not yet canonical) WAV file"""
+    if source.suffix.lower() == ".wav":
+        shutil.copyfile(source, target)
+        return True
+
+    for command in transcode_commands(source, target):
+        if not shutil.which(command[0]):
+            continue
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=TRANSCODE_TIMEOUT)
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            continue
+    return False
+
+
+def write_canonical_wav(source_wav: Path, target: Path):
+    """Rewrite a WAV file as 16-bit stereo PCM at the audio server's rate"""
+    from audio_server import load_wav, SAMPLE_RATE, CHANNELS
+
+    samples = load_wav(source_wav)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    with wave.open(str(target), "wb") as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_stamp(path: Path) -> Optional[List[int]]:
+    """(mtime_ns, size) of a file or directory, or None if it is gone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def clip_facts(path: Path, cache_dir: Path = None) -> Dict:
+    """What is remembered about a clip (content hash or failure), as long as its
+    mtime and size (or its absence) are unchanged; {} otherwise"""
+    index_file = Path(cache_dir or SOUND_CACHE_DIR) / CLIP_INDEX_FILE.name
+    try:
+        with open(index_file, "r") as f:
+            entry = json.load(f).get(str(Path(path).resolve()))
+    except (OSError, ValueError, AttributeError):
+        return {}
+    if entry and entry.get("stamp") == file_stamp(path):
+        return entry
+    return {}
+
+
+def remember_clip(path: Path, cache_dir: Path = None, **facts):
+    """Record facts about a clip under its current mtime and size (bounded; never raises)"""
+    index_file = Path(cache_dir or SOUND_CACHE_DIR) / CLIP_INDEX_FILE.name
+    try:
+        with open(index_file, "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    key = str(Path(path).resolve())
+    index.pop(key, None)
+    index[key] = dict(facts, stamp=file_stamp(path))
+    while len(index) > MAX_INDEXED_CLIPS:
+        index.pop(next(iter(index)))
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_file, index_file)
+    except OSError:
+        pass
+
+
+def content_hash(path: Path, cache_dir: Path = None) -> str:
+    """SHA-256 of a clip, hashed again only when its mtime or size changes"""
+    digest = clip_facts(path, cache_dir).get("hash")
+    if digest is None:
+        digest = hash_file(path)
+        remember_clip(path, cache_dir, hash=digest)
+    return digest
+
+
+def custom_sound_dir(config: Dict) -> Path:
+    """Directory custom clips are resolved in"""
+    custom_config = config.get("custom_sounds", {})
+    return Path(custom_config.get("sound_directory", "~/.claude/hooks/sounds/")).expanduser()
+
+
+def resolve_custom_sources(config: Dict) -> Dict[str, Path]:
+    """Resolve sound type -> source clip the same way SoundManager.try_custom_sound does"""
+    custom_config = config.get("custom_sounds", {})
+    sound_dir = custom_sound_dir(config)
+    examples = custom_config.get("examples", {})
+    formats = custom_config.get("formats", [".wav", ".mp3", ".ogg"])
+
+    sound_types = set(config.get("sounds", {})) | set(examples)
+    sources = {}
+    for sound_type in sorted(sound_types):
+        candidates = []
+        if sound_type in examples:
+            candidates.append(sound_dir / examples[sound_type])
+        candidates.extend(sound_dir / f"{sound_type}{ext}" for ext in formats)
+        for candidate in candidates:
+            if candidate.exists():
+                sources[sound_type] = candidate
+                break
+    return sources
+
+
+def cache_clip(source: Path, cache_dir: Path = None) -> Optional[Path]:
+    """Transcode one clip into the content-addressed cache (no-op if already cached)"""
+    cache_dir = Path(cache_dir or SOUND_CACHE_DIR)
+    cached = cache_dir / f"{content_hash(source, cache_dir)[:32]}.wav"
+    if cached.exists():
+        return cached
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp:
+        decoded = Path(tmp) / "decoded.wav"
+        if not decode_to_wav(source, decoded):
+            print(f"❌ No decoder available for {source.name}")
+            return None
+        canonical = Path(tmp) / "canonical.wav"
+        try:
+            write_canonical_wav(decoded, canonical)
+        except (OSError, EOFError, ValueError, wave.Error) as e:
+            print(f"❌ Error converting {source.name}: {e}")
+            return None
+        os.replace(canonical, cached)
+    return cached
+
+
+def build_manifest(config: Dict, config_digest: str, cache_dir: Path = None) -> Dict:
+    """Cache every configured custom clip and write the sound type manifest.
+
+    Each entry remembers its source's mtime and size, and the manifest the sound
+    directory's, so replacing, adding or removing a clip invalidates it.
+    """
+    cache_dir = Path(cache_dir or SOUND_CACHE_DIR)
+    sound_dir = custom_sound_dir(config)
+    manifest = {"config": config_digest, "directory": [str(sound_dir), file_stamp(sound_dir)],
+                "sounds": {}, "sources": {}}
+
+    for sound_type, source in resolve_custom_sources(config).items():
+        stamp = file_stamp(source)
+        cached = cache_clip(source, cache_dir)
+        if cached:
+            manifest["sounds"][sound_type] = str(cached)
+            manifest["sources"][sound_type] = [str(source), stamp]
+            print(f"✅ {sound_type}: {source.name} -> {cached.name}")
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_file = cache_dir / MANIFEST_FILE.name
+    tmp_file = manifest_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, manifest_file)
+    return manifest
+
+
+def load_manifest(config_digest: str, cache_dir: Path = None) -> Dict[str, str]:
+    """Sound type -> cached WAV path, or {} if missing, built for another config or
+    the sound directory changed since; entries whose source changed are left out"""
+    manifest_file = Path(cache_dir or SOUND_CACHE_DIR) / MANIFEST_FILE.name
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("config") != config_digest:
+            return {}
+        directory, stamp = manifest["directory"]
+        if file_stamp(Path(directory)) != stamp:
+            return {}
+        sources = manifest["sources"]
+        return {
+            sound_type: cached
+            for sound_type, cached in manifest["sounds"].items()
+            if sound_type in sources and file_stamp(Path(sources[sound_type][0])) == sources[sound_type][1]
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def main():
+    """Build the cache for the current sound configuration"""
+    from sound_manager import SoundManager
+
+    manager = SoundManager()
+    print(f"🎵 Building sound cache in {SOUND_CACHE_DIR}")
+    manifest = build_manifest(manager.config, manager.config_digest)
+    print(f"🎯 Cached {len(manifest['sounds'])} sound type(s)")
+
+
+if __name__ == "__main__":
+    main()
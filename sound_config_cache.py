@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Compiled sound configuration cache.
+Flattens sound_config.json into a per-platform lookup table stored with
+marshal, so cold hook processes load it with one stat and one read, and
+watches the config for changes (inotify on Linux) in long-running processes.
+"""
+
+import os
+import json
+import ctypes
+import ctypes.util
+import marshal
+import select
+import struct
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# Configuration
+COMPILED_CONFIG_DIR = Path.home() / ".claude" / "compiled"
+COMPILED_FORMAT = 2
+POLL_INTERVAL = 2  # seconds, when inotify is unavailable
+
+SYSTEM_KEYS = {
+    "Linux": "linux",
+    "Darwin": "macos",
+    "Windows": "windows"
+}
+
+
+def system_key(system: str) -> str:
+    """Config key for a platform.system() value"""
+    return SYSTEM_KEYS.get(system, "linux")
+
+
+def compiled_path(config_file: Path, system: str) -> Path:
+    """Cache file for one config file and platform"""
+    path_hash = hashlib.sha1(str(Path(config_file).resolve()).encode("utf-8")).hexdigest()[:12]
+    return COMPILED_CONFIG_DIR / f"sound_config-{path_hash}-{system_key(system)}.marshal"
+
+
+def compile_config(raw: bytes, system: str, stat: os.stat_result, source: Path) -> Dict:
+    """Parse raw config JSON into the compiled per-platform form"""
+    config = json.loads(raw)
+    key = system_key(system)
+    commands = {
+        sound_type: platforms.get(key, [])
+        for sound_type, platforms in config.get("sounds", {}).items()
+    }
+    return {
+        "format": COMPILED_FORMAT,
+        "source": str(Path(source).resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "digest": hashlib.sha1(raw).hexdigest(),
+        "config": config,
+        "commands": commands,
+    }
+
+
+def load_compiled_config(config_file: Path, system: str) -> Dict:
+    """Return the compiled config, recompiling only when the file changed.
+
+    Raises OSError/ValueError like reading the JSON file directly would.
+    """
+    config_file = Path(config_file)
+    stat = os.stat(config_file)
+    cache_file = compiled_path(config_file, system)
+
+    try:
+        with open(cache_file, "rb") as f:
+            compiled = marshal.loads(f.read())
+        if (compiled.get("format") == COMPILED_FORMAT and
+                compiled.get("mtime_ns") == stat.st_mtime_ns and
+                compiled.get("size") == stat.st_size):
+            return compiled
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+
+    with open(config_file, "rb") as f:
+        raw = f.read()
+    compiled = compile_config(raw, system, stat, config_file)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(marshal.dumps(compiled))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠️ Could not write compiled sound config: {e}")
+    else:
+        prune_compiled(cache_file.parent)
+
+    return compiled
+
+
+def prune_compiled(directory: Optional[Path] = None) -> int:
+    """Delete compiled configs whose source file is gone, or that are unreadable or outdated"""
+    directory = Path(directory) if directory is not None else COMPILED_CONFIG_DIR
+    removed = 0
+    for cache_file in directory.glob("sound_config-*.marshal"):
+        try:
+            with open(cache_file, "rb") as f:
+                compiled = marshal.loads(f.read())
+            source = compiled.get("source") if compiled.get("format") == COMPILED_FORMAT else None
+        except OSError:
+            continue
+        except (EOFError, ValueError, TypeError, AttributeError):
+            source = None
+        if source and os.path.exists(source):
+            continue
+        try:
+            os.unlink(cache_file)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class ConfigWatcher(threading.Thread):
+    """Calls a callback when the config file changes (inotify, else polling)"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, config_file: Path, callback: Callable[[], None]):
+        super().__init__(daemon=True)
+        self.config_file = Path(config_file).resolve()
+        self.callback = callback
+        self.stopped = threading.Event()
+        self.fd: Optional[int] = None
+        self.last_stamp = None
+
+    def _inotify_fd(self) -> Optional[int]:
+        """Set up an inotify watch on the config directory, or None if unavailable"""
+        if not hasattr(os, "O_CLOEXEC"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            # Watch the directory: editors often replace the file instead of writing it
+            mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+            if libc.inotify_add_watch(fd, str(self.config_file.parent).encode(), mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _watch_inotify(self, fd: int):
+        name = self.config_file.name.encode()
+        try:
+            while not self.stopped.is_set():
+                ready, _, _ = select.select([fd], [], [], 1.0)
+                if not ready:
+                    continue
+                data = os.read(fd, 4096)
+                changed = False
+                offset = 0
+                while offset < len(data):
+                    _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                    offset += self.EVENT_HEADER.size
+                    if data[offset:offset + length].rstrip(b"\0") == name:
+                        changed = True
+                    offset += length
+                if changed:
+                    self.callback()
+        finally:
+            os.close(fd)
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.config_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _watch_polling(self):
+        while not self.stopped.wait(POLL_INTERVAL):
+            current = self._stamp()
+            if current != self.last_stamp:
+                self.last_stamp = current
+                self.callback()
+
+    def start(self):
+        # Set up the watch before returning, so edits made right after start() are seen
+        self.fd = self._inotify_fd()
+        if self.fd is None:
+            self.last_stamp = self._stamp()
+        super().start()
+
+    def run(self):
+        if self.fd is not None:
+            self._watch_inotify(self.fd)
+        else:
+            self._watch_polling()
+
+    def stop(self):
+        self.stopped.set()
@@ -6,25 +6,51 @@ Handles sound configuration and playback with customizable options.
 
 import os
 import json
+import socket
 import platform
+import threading
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+from player_probe import PlayerProbe
+from sound_cache import load_manifest
+from sound_queue import SoundArbiter, clip_duration
+from sound_config_cache import ConfigWatcher, load_compiled_config, system_key
+
+# How long an async player gets to fail fast (bad file, no audio server)
+# before we consider it successfully started
+ASYNC_EARLY_EXIT_GRACE = 0.05  # seconds
+DEFAULT_ASYNC_PLAYBACK = True  # when sound_settings.async_playback is not set
+
+# Optional long-lived audio server (see audio_server.py)
+AUDIO_SERVER_SOCKET = Path.home() / ".claude" / "audio_server.sock"
+AUDIO_SERVER_TIMEOUT = 0.5  # seconds
+AUDIO_SERVER_PLAYERS = ("paplay", "aplay", "afplay")
 
 class SoundManager:
     def __init__(self, config_file: str = None):
         """Initialize sound manager with configuration"""
         self.config_file = config_file or Path(__file__).parent / "sound_config.json"
-        self.config = self.load_config()
         self.system = platform.system()
+        self.config_digest = "default"
+        self.platform_commands = None
+        self.config = self.load_config()
+        self.probe = PlayerProbe(self.config_digest, self.system)
+        self.cache_manifest = None
+        self.arbiter = SoundArbiter(self.config.get("sound_queue"))
+        self.player_pid: Optional[int] = None  # last detached player still running
+        self.watcher = None
         
     def load_config(self) -> Dict:
-        """Load sound configuration from JSON file"""
+        """Load sound configuration (via the compiled per-platform cache)"""
+        self.config_digest = "default"
+        self.platform_commands = None
         try:
             if Path(self.config_file).exists():
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    return config
+                compiled = load_compiled_config(Path(self.config_file), self.system)
+                self.config_digest = compiled["digest"]
+                self.platform_commands = compiled["commands"]
+                return compiled["config"]
             else:
                 print(f"Warning: Sound config file not found: {self.config_file}")
                 return self.get_default_config()
@@ -32,13 +58,47 @@ class SoundManager:
             print(f"Error loading sound config: {e}")
             return self.get_default_config()
     
+    def reload_config(self) -> bool:
+        """Reload configuration and everything derived from it.
+
+        A file that cannot be read or parsed (e.g. saved mid-edit) leaves the
+        last good configuration in place; returns whether anything was reloaded.
+        """
+        try:
+            compiled = load_compiled_config(Path(self.config_file), self.system)
+        except (OSError, ValueError) as e:
+            print(f"Error reloading sound config, keeping the previous one: {e}")
+            return False
+        self.config = compiled["config"]
+        self.config_digest = compiled["digest"]
+        self.platform_commands = compiled["commands"]
+        self.probe = PlayerProbe(self.config_digest, self.system)
+        self.cache_manifest = None
+        self.arbiter = SoundArbiter(self.config.get("sound_queue"))
+        return True
+    
+    def watch_config(self, on_reload: Callable[[], None] = None):
+        """Hot-reload the config when the file changes (for long-running processes)"""
+        if self.watcher:
+            return
+        
+        def reload():
+            if self.reload_config() and on_reload:
+                on_reload()
+        
+        self.watcher = ConfigWatcher(Path(self.config_file), reload)
+        self.watcher.start()
+    
     def get_default_config(self) -> Dict:
         """Get default sound configuration"""
         return {
             "sound_settings": {
                 "enabled": True,
                 "volume": 80,
-                "notification_type": "system_default"
+                "normalize_loudness": False,
+                "notification_type": "system_default",
+                "async_playback": DEFAULT_ASYNC_PLAYBACK,
+                "use_audio_server": True
             },
             "sounds": {
                 "success": {
@@ -54,82 +114,209 @@ class SoundManager:
         """Check if sound is enabled"""
         return self.config.get("sound_settings", {}).get("enabled", True)
     
+    def is_async_playback(self) -> bool:
+        """Check if players should be launched detached instead of waited on"""
+        return self.config.get("sound_settings", {}).get("async_playback", DEFAULT_ASYNC_PLAYBACK)
+    
+    def run_player(self, command: List[str], on_complete: Callable[[int], None] = None) -> bool:
+        """Run a player command, detached from this process in async mode.
+        
+        Raises the same exceptions as subprocess.run(check=True) so callers can
+        fall through to the next command. on_complete receives the player's
+        exit code once it finishes (from a background thread in async mode).
+        """
+        self.player_pid = None
+        if not self.is_async_playback():
+            result = subprocess.run(command, check=True, capture_output=True, timeout=5)
+            if on_complete:
+                on_complete(result.returncode)
+            return True
+        
+        # New session and no inherited pipes: the clip keeps playing after the hook exits
+        detach_kwargs = {"start_new_session": True}
+        if self.system == "Windows":
+            detach_kwargs = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+        
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **detach_kwargs
+        )
+        
+        # Early-exit check: a player that dies immediately with an error failed
+        try:
+            returncode = process.wait(timeout=ASYNC_EARLY_EXIT_GRACE)
+        except subprocess.TimeoutExpired:
+            returncode = None
+        
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+        
+        if returncode is None:
+            self.player_pid = process.pid
+        if on_complete:
+            if returncode is None:
+                threading.Thread(target=lambda: on_complete(process.wait()), daemon=True).start()
+            else:
+                on_complete(returncode)
+        return True
+    
+    def apply_volume(self, file_path: Path) -> Path:
+        """Return the clip as a WAV scaled to the configured volume (cached), or the original"""
+        settings = self.config.get("sound_settings", {})
+        volume = settings.get("volume", 100)
+        normalize = settings.get("normalize_loudness", False)
+        if volume == 100 and not normalize:
+            return file_path
+        
+        from sound_volume import scaled_clip, ClipUnavailable, DEFAULT_TARGET_DBFS
+        try:
+            target_dbfs = settings.get("target_loudness_dbfs", DEFAULT_TARGET_DBFS)
+            return scaled_clip(Path(file_path), volume, normalize, target_dbfs)
+        except ClipUnavailable:
+            return file_path
+        except Exception as e:
+            print(f"⚠️ Could not apply volume to {Path(file_path).name}: {e}")
+            return file_path
+    
+    def try_audio_server(self, file_path: Path, verbose: bool = True) -> bool:
+        """Hand a WAV clip to the audio server if one is running"""
+        if not self.config.get("sound_settings", {}).get("use_audio_server", True):
+            return False
+        if not hasattr(socket, "AF_UNIX") or not AUDIO_SERVER_SOCKET.exists():
+            return False
+        if Path(file_path).suffix.lower() != ".wav":
+            return False
+        
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(AUDIO_SERVER_TIMEOUT)
+                sock.connect(str(AUDIO_SERVER_SOCKET))
+                request = {"op": "play", "path": str(Path(file_path).resolve())}
+                sock.sendall(json.dumps(request).encode() + b"\n")
+                response = json.loads(sock.makefile("rb").readline() or b"{}")
+        except (OSError, ValueError):
+            return False
+        
+        if response.get("ok"):
+            if verbose:
+                print(f"🔊 Played via audio server ({response.get('status')}): {Path(file_path).name}")
+            return True
+        return False
+    
     def get_sound_commands(self, sound_type: str = "success") -> List[Dict]:
         """Get available sound commands for the current system and sound type"""
         if not self.is_sound_enabled():
             return []
         
-        system_key = {
-            "Linux": "linux",
-            "Darwin": "macos", 
-            "Windows": "windows"
-        }.get(self.system, "linux")
+        # Compiled per-platform table when loaded from a config file
+        if self.platform_commands is not None:
+            return self.platform_commands.get(sound_type, self.platform_commands.get("success", []))
         
         sounds = self.config.get("sounds", {})
         sound_config = sounds.get(sound_type, sounds.get("success", {}))
         
-        return sound_config.get(system_key, [])
+        return sound_config.get(system_key(self.system), [])
     
-    def play_sound(self, sound_type: str = "success", verbose: bool = True) -> bool:
+    def play_sound(self, sound_type: str = "success", verbose: bool = True,
+                   on_complete: Callable[[int], None] = None) -> bool:
         """Play a sound of the specified type"""
         if not self.is_sound_enabled():
             if verbose:
                 print("🔇 Sound is disabled in configuration")
             return True
         
-        # Check for custom sounds first
-        if self.try_custom_sound(sound_type, verbose):
+        # Merge duplicates and let higher-priority sounds win bursts
+        decision = self.arbiter.admit(sound_type)
+        if decision != "play":
+            if verbose:
+                print(f"🔕 Skipping {sound_type} sound ({decision})")
             return True
         
-        # Fall back to system sounds
-        return self.try_system_sounds(sound_type, verbose)
+        played = False
+        try:
+            # Check for custom sounds first, then fall back to system sounds
+            played = (self.try_custom_sound(sound_type, verbose, on_complete) or
+                      self.try_system_sounds(sound_type, verbose, on_complete))
+            return played
+        finally:
+            if not played:
+                # Nothing is playing, so nothing should be suppressed or merged
+                self.arbiter.release()
+            # Persist anything learned about which players work
+            self.probe.save()
     
-    def try_custom_sound(self, sound_type: str, verbose: bool = True) -> bool:
+    def try_custom_sound(self, sound_type: str, verbose: bool = True,
+                         on_complete: Callable[[int], None] = None) -> bool:
         """Try to play custom sound if enabled"""
         custom_config = self.config.get("custom_sounds", {})
         if not custom_config.get("enabled", False):
             return False
         
+        # Pre-decoded clip from the sound cache (built by sound_cache.py)
+        if self.cache_manifest is None:
+            self.cache_manifest = load_manifest(self.config_digest)
+        cached_file = self.cache_manifest.get(sound_type)
+        if cached_file and self.play_audio_file(Path(cached_file), verbose, on_complete):
+            return True
+        
         sound_dir = Path(custom_config.get("sound_directory", "~/.claude/hooks/sounds/")).expanduser()
         examples = custom_config.get("examples", {})
         
         if sound_type in examples:
             sound_file = sound_dir / examples[sound_type]
             if sound_file.exists():
-                return self.play_audio_file(sound_file, verbose)
+                return self.play_audio_file(sound_file, verbose, on_complete)
         
         # Try common naming patterns
         formats = custom_config.get("formats", [".wav", ".mp3", ".ogg"])
         for format_ext in formats:
             sound_file = sound_dir / f"{sound_type}{format_ext}"
             if sound_file.exists():
-                return self.play_audio_file(sound_file, verbose)
+                return self.play_audio_file(sound_file, verbose, on_complete)
         
         return False
     
-    def play_audio_file(self, file_path: Path, verbose: bool = True) -> bool:
+    def play_audio_file(self, file_path: Path, verbose: bool = True,
+                        on_complete: Callable[[int], None] = None) -> bool:
         """Play an audio file using appropriate system command"""
+        file_path = self.apply_volume(file_path)
+        self.player_pid = None
+        if self._play_audio_file(file_path, verbose, on_complete):
+            self.arbiter.playing_for(clip_duration(file_path), self.player_pid)
+            return True
+        return False
+    
+    def _play_audio_file(self, file_path: Path, verbose: bool = True,
+                         on_complete: Callable[[int], None] = None) -> bool:
+        if self.try_audio_server(file_path, verbose):
+            return True
+        
         try:
             if self.system == "Linux":
-                # Try multiple Linux audio players
-                players = [
-                    ["paplay", str(file_path)],
-                    ["aplay", str(file_path)],
-                    ["mpg123", str(file_path)],
-                    ["ogg123", str(file_path)]
-                ]
+                # Try installed Linux audio players, known-good for this format first
+                extension = file_path.suffix.lower()
+                players = self.probe.order_players(extension, ["paplay", "aplay", "mpg123", "ogg123"])
                 
                 for player in players:
                     try:
-                        subprocess.run(player, check=True, capture_output=True, timeout=5)
+                        self.run_player([player, str(file_path)], on_complete)
+                        self.probe.record_player(extension, player, True)
                         if verbose:
                             print(f"🔊 Played custom sound: {file_path.name}")
                         return True
-                    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+                    except FileNotFoundError:
+                        self.probe.mark_missing(player)
+                        continue
+                    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                        self.probe.record_player(extension, player, False)
                         continue
                         
             elif self.system == "Darwin":  # macOS
-                subprocess.run(["afplay", str(file_path)], check=True, timeout=5)
+                self.run_player(["afplay", str(file_path)], on_complete)
                 if verbose:
                     print(f"🔊 Played custom sound: {file_path.name}")
                 return True
@@ -137,7 +324,7 @@ class SoundManager:
             elif self.system == "Windows":
                 # Use PowerShell to play audio
                 cmd = f'(New-Object Media.SoundPlayer "{file_path}").PlaySync()'
-                subprocess.run(["powershell", "-c", cmd], check=True, timeout=5)
+                self.run_player(["powershell", "-c", cmd], on_complete)
                 if verbose:
                     print(f"🔊 Played custom sound: {file_path.name}")
                 return True
@@ -148,7 +335,8 @@ class SoundManager:
         
         return False
     
-    def try_system_sounds(self, sound_type: str, verbose: bool = True) -> bool:
+    def try_system_sounds(self, sound_type: str, verbose: bool = True,
+                          on_complete: Callable[[int], None] = None) -> bool:
         """Try to play system sounds"""
         import random
         
@@ -159,26 +347,65 @@ class SoundManager:
                 print(f"⚠️  No sound commands available for {sound_type} on {self.system}")
             return False
         
+        # Skip commands whose player is missing or known not to work
+        sound_commands = self.probe.order_commands(sound_commands)
+        if not sound_commands:
+            if verbose:
+                print(f"❌ No working sound commands for {sound_type} (cached probe)")
+            return False
+        
         # For completion sounds with multiple options, randomly select one
         if len(sound_commands) > 1 and sound_type in ["implementation_complete", "thinking", "error_found"]:
             sound_commands = [random.choice(sound_commands)]
         
         for sound_config in sound_commands:
+            # Synthesized tones render to a cached WAV and use the normal file path
+            if "synth" in sound_config:
+                description = sound_config.get("description", "Synthesized tone")
+                try:
+                    from sound_synth import render_tone
+                    tone_file = render_tone(sound_config["synth"])
+                except Exception as e:
+                    if verbose:
+                        print(f"❌ Error rendering tone '{description}': {e}")
+                    continue
+                if self.play_audio_file(tone_file, verbose=False, on_complete=on_complete):
+                    if verbose:
+                        print(f"🔊 Played sound: {description}")
+                    return True
+                continue
+            
             try:
                 command = sound_config["command"]
                 description = sound_config.get("description", "Unknown sound")
                 
-                subprocess.run(command, check=True, capture_output=True, timeout=5)
+                # Simple "player file.wav" commands get the configured volume
+                # and can go through the audio server
+                player_command = command
+                clip = None
+                if len(command) == 2 and command[0] in AUDIO_SERVER_PLAYERS:
+                    clip = self.apply_volume(Path(command[1]))
+                    if self.try_audio_server(clip, verbose):
+                        self.arbiter.playing_for(clip_duration(clip))
+                        return True
+                    player_command = [command[0], str(clip)]
+                
+                self.run_player(player_command, on_complete)
+                self.probe.record_command(command, True)
+                self.arbiter.playing_for(clip_duration(clip) if clip is not None else None, self.player_pid)
                 
                 if verbose:
                     print(f"🔊 Played sound: {description}")
                 return True
                 
             except subprocess.CalledProcessError:
+                self.probe.record_command(command, False)
                 continue
             except FileNotFoundError:
+                self.probe.mark_missing(command[0])
                 continue
             except subprocess.TimeoutExpired:
+                self.probe.record_command(command, False)
                 if verbose:
                     print(f"⏰ Sound command timed out: {description}")
                 continue
@@ -192,38 +419,12 @@ class SoundManager:
         return False
     
     def test_all_sounds(self):
-        """Test all available sounds"""
-        print("🎵 Testing all available sounds...")
-        print("=" * 40)
+        """Benchmark every configured sound type and command (see sound_benchmark.py)"""
+        from sound_benchmark import run_benchmark, format_table
         
-        for sound_type in ["success", "error", "warning"]:
-            print(f"\n🎯 Testing {sound_type} sounds:")
-            sound_commands = self.get_sound_commands(sound_type)
-            
-            if not sound_commands:
-                print(f"   No sounds configured for {sound_type}")
-                continue
-            
-            for i, sound_config in enumerate(sound_commands, 1):
-                description = sound_config.get("description", "Unknown")
-                print(f"   {i}. Testing: {description}")
-                
-                try:
-                    command = sound_config["command"]
-                    result = subprocess.run(command, check=True, capture_output=True, timeout=3)
-                    print(f"      ✅ Success")
-                except subprocess.CalledProcessError as e:
-                    print(f"      ❌ Failed (exit code {e.returncode})")
-                except FileNotFoundError:
-                    print(f"      ❌ Command not found")
-                except subprocess.TimeoutExpired:
-                    print(f"      ⏰ Timeout")
-                except Exception as e:
-                    print(f"      ❌ Error: {e}")
-                
-                # Small delay between sounds
-                import time
-                time.sleep(0.5)
+        print("🎵 Benchmarking all configured sounds...")
+        print("=" * 40)
+        print(format_table(run_benchmark(self)))
     
     def get_config_summary(self) -> str:
         """Get a summary of current sound configuration"""
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Priority-aware sound queue shared by all hook processes.
+Merges duplicate sounds within a window and drops lower-priority sounds that
+arrive while a higher-priority one is playing, bounding player spawns under
+bursts of hooks. A lone request is decided at once; a request that arrives
+while others are pending or just arrived waits for the burst to settle, and a
+higher-priority sound preempts a lower one that already started.
+"""
+
+import os
+import json
+import time
+import uuid
+import wave
+import signal
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Configuration
+SOUND_QUEUE_FILE = Path.home() / ".claude" / "sound_queue.json"
+
+PRIORITY_CLASSES = {"error": 4, "warning": 3, "success": 2, "thinking": 1}
+DEFAULT_SOUND_CLASSES = {
+    "error": "error",
+    "error_found": "error",
+    "warning": "warning",
+    "success": "success",
+    "research_complete": "success",
+    "implementation_complete": "success",
+    "analysis_complete": "success",
+    "testing_complete": "success",
+    "commits_complete": "success",
+    "thinking": "thinking",
+    "task_start": "thinking",
+}
+QUEUE_DEFAULTS = {
+    "enabled": True,
+    "merge_window": 1.0,     # seconds: same sound type again is merged
+    "collect_window": 0.15,  # seconds: wait for higher-priority siblings (only inside a burst)
+    "hold": 1.5,             # seconds a sound counts as playing when its clip length is unknown
+    "preempt": True,         # stop a lower-priority player when a higher-priority sound starts
+}
+
+
+def clip_duration(path: Path) -> Optional[float]:
+    """Length of a WAV clip in seconds, None for other formats or unreadable files"""
+    try:
+        with wave.open(str(path), "rb") as clip:
+            return clip.getnframes() / clip.getframerate()
+    except (wave.Error, OSError, EOFError, ZeroDivisionError):
+        return None
+
+
+class SoundArbiter:
+    def __init__(self, settings: Dict = None, state_file: Path = None):
+        """Initialize arbiter from the sound_queue config section"""
+        self.settings = dict(QUEUE_DEFAULTS)
+        self.settings.update(settings or {})
+        self.sound_classes = dict(DEFAULT_SOUND_CLASSES)
+        self.sound_classes.update(self.settings.get("classes", {}))
+        self.state_file = Path(state_file or SOUND_QUEUE_FILE)
+        self.lock_file = self.state_file.with_suffix(".lock")
+        self.admitted_id: Optional[str] = None  # request of ours that is playing
+
+    def priority(self, sound_type: str) -> int:
+        """Numeric priority of a sound type (unknown types rank as success)"""
+        return PRIORITY_CLASSES.get(self.sound_classes.get(sound_type, "success"), 2)
+
+    def _locked(self):
+        """Open the lock file and take an exclusive lock (no-op without fcntl)"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.lock_file, "a+")
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _load(self, now: float) -> Dict:
+        """Load queue state, pruning entries that no longer matter"""
+        state = {}
+        try:
+            if self.state_file.exists():
+                with open(self.state_file, "r") as f:
+                    state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+
+        horizon = max(self.settings["merge_window"], self.settings["collect_window"] * 4)
+        playing = state.get("playing")
+        return {
+            "playing": playing if playing and playing["until"] > now else None,
+            "recent": {k: t for k, t in state.get("recent", {}).items() if now - t < horizon},
+            "pending": [p for p in state.get("pending", []) if now - p["time"] < horizon],
+            "arrivals": [t for t in state.get("arrivals", []) if now - t < horizon],
+        }
+
+    def _save(self, state: Dict):
+        """Atomically write queue state"""
+        tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def admit(self, sound_type: str) -> str:
+        """Decide whether a sound should play.
+
+        Returns "play", "merged" (same sound just played) or "dropped"
+        (a higher-priority sound is playing or arrived in the same burst).
+        """
+        if not self.settings["enabled"]:
+            return "play"
+
+        priority = self.priority(sound_type)
+        request_id = uuid.uuid4().hex
+        collect_window = self.settings["collect_window"]
+        self.admitted_id = None
+
+        handle = self._locked()
+        try:
+            now = time.time()
+            state = self._load(now)
+            in_burst = state["pending"] or any(now - t < collect_window for t in state["arrivals"])
+            state["arrivals"].append(now)
+            decision = self._decide(state, sound_type, priority, now)
+            if decision == "play" and in_burst and collect_window > 0:
+                # Part of a burst: give near-simultaneous hooks a moment to register
+                state["pending"].append({"id": request_id, "sound_type": sound_type,
+                                         "priority": priority, "time": now})
+                decision = None
+            elif decision == "play":
+                self._start_playing(state, request_id, sound_type, priority, now)
+            self._save(state)
+        finally:
+            handle.close()
+        if decision is not None:
+            return decision
+
+        time.sleep(collect_window)
+
+        handle = self._locked()
+        try:
+            now = time.time()
+            state = self._load(now)
+            mine = next((p for p in state["pending"] if p["id"] == request_id), None)
+            state["pending"] = [p for p in state["pending"] if p["id"] != request_id]
+            if mine is None:
+                mine = {"id": request_id, "sound_type": sound_type, "priority": priority, "time": now}
+
+            # Highest priority wins; ties go to the earliest request, including
+            # one of the burst that started playing before anyone waited
+            rivals = [p for p in state["pending"]
+                      if (p["priority"], -p["time"]) > (mine["priority"], -mine["time"])]
+            playing = state["playing"]
+            if (playing and playing["priority"] == priority and
+                    playing["started"] >= mine["time"] - collect_window):
+                rivals.append(playing)
+            decision = "dropped" if rivals else self._decide(state, sound_type, priority, now)
+            if decision == "play":
+                self._start_playing(state, request_id, sound_type, priority, now)
+            self._save(state)
+        finally:
+            handle.close()
+
+        return decision
+
+    def _decide(self, state: Dict, sound_type: str, priority: int, now: float) -> str:
+        """Decision against what is playing and what just played"""
+        if now - state["recent"].get(sound_type, 0) < self.settings["merge_window"]:
+            return "merged"
+        playing = state["playing"]
+        if playing and playing["priority"] > priority:
+            return "dropped"
+        return "play"
+
+    def _start_playing(self, state: Dict, request_id: str, sound_type: str, priority: int, now: float):
+        playing = state["playing"]
+        if playing and playing["priority"] < priority and playing.get("pid") and self.settings["preempt"]:
+            # A lower-priority clip is still going: stop its player
+            try:
+                os.kill(playing["pid"], signal.SIGTERM)
+            except OSError:
+                pass
+        state["playing"] = {"id": request_id, "sound_type": sound_type, "priority": priority,
+                            "started": now, "until": now + self.settings["hold"]}
+        state["recent"][sound_type] = now
+        self.admitted_id = request_id
+
+    def _update_playing(self, update):
+        """Apply update(state) if the admitted sound is still the one playing"""
+        if self.admitted_id is None:
+            return
+        handle = self._locked()
+        try:
+            state = self._load(time.time())
+            playing = state["playing"]
+            if playing and playing.get("id") == self.admitted_id:
+                update(state)
+                self._save(state)
+        finally:
+            handle.close()
+
+    def playing_for(self, duration: Optional[float], pid: Optional[int] = None):
+        """The admitted sound started; it counts as playing for the clip's length
+        (the configured hold if unknown), and a detached player's pid lets a
+        higher-priority sound preempt it"""
+        if duration is None and pid is None:
+            return
+
+        def update(state):
+            if duration is not None:
+                state["playing"]["until"] = state["playing"]["started"] + duration
+            if pid is not None:
+                state["playing"]["pid"] = pid
+        self._update_playing(update)
+
+    def release(self):
+        """The admitted sound could not be played: free the slot for the next one"""
+        def update(state):
+            state["recent"].pop(state["playing"]["sound_type"], None)
+            state["playing"] = None
+        self._update_playing(update)
+        self.admitted_id = None
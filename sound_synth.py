@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+In-process tone synthesis for sound config entries.
+Renders {"synth": {...}} entries into cached WAV files once, replacing
+heavyweight tone generators such as speaker-test.
+"""
+
+import os
+import sys
+import json
+import math
+import wave
+import array
+import hashlib
+from pathlib import Path
+from typing import Dict
+
+from sound_cache import SOUND_CACHE_DIR, load_numpy
+
+# Configuration
+SYNTH_CACHE_DIR = SOUND_CACHE_DIR / "synth"
+SYNTH_SAMPLE_RATE = 44100
+SYNTH_DEFAULTS = {
+    "frequency": 440.0,   # Hz
+    "duration": 0.25,     # seconds per tone
+    "waveform": "sine",   # sine, square or triangle
+    "amplitude": 0.5,     # 0-1 of full scale
+    "attack": 0.01,       # seconds
+    "release": 0.05,      # seconds
+    "repeats": 1,
+    "gap": 0.1,           # seconds of silence between repeats
+}
+
+
+def normalize_spec(spec: Dict) -> Dict:
+    """Fill in defaults so equivalent specs share one cache entry"""
+    full = dict(SYNTH_DEFAULTS)
+    full.update({k: v for k, v in spec.items() if k in SYNTH_DEFAULTS})
+    if full["waveform"] not in ("sine", "square", "triangle"):
+        raise ValueError(f"Unknown waveform: {full['waveform']}")
+    for key in ("frequency", "duration", "amplitude", "attack", "release", "gap"):
+        full[key] = float(full[key])  # 440 and 440.0 are the same tone
+    full["repeats"] = max(1, int(full["repeats"]))
+    return full
+
+
+def render_samples(spec: Dict, use_numpy: bool = True) -> bytes:
+    """Render a tone spec as mono 16-bit little-endian PCM"""
+    np = load_numpy() if use_numpy else None
+    rate = SYNTH_SAMPLE_RATE
+    tone_frames = int(spec["duration"] * rate)
+    gap_frames = int(spec["gap"] * rate)
+    attack = max(1, int(spec["attack"] * rate))
+    release = max(1, int(spec["release"] * rate))
+    scale = 32767 * max(0.0, min(1.0, spec["amplitude"]))
+    step = spec["frequency"] / rate
+
+    if np is not None:
+        phase = (np.arange(tone_frames) * step) % 1.0
+        if spec["waveform"] == "square":
+            wave_data = np.where(phase < 0.5, 1.0, -1.0)
+        elif spec["waveform"] == "triangle":
+            wave_data = 4.0 * np.abs(phase - 0.5) - 1.0
+        else:
+            wave_data = np.sin(2 * np.pi * phase)
+        envelope = np.minimum(1.0, np.minimum(np.arange(tone_frames) / attack,
+                                              np.arange(tone_frames)[::-1] / release))
+        tone = np.rint(wave_data * envelope * scale).astype("<i2")
+        silence = np.zeros(gap_frames, dtype="<i2")
+        parts = [tone]
+        for _ in range(spec["repeats"] - 1):
+            parts.extend([silence, tone])
+        return np.concatenate(parts).tobytes()
+
+    def sample(i: int) -> int:
+        phase = (i * step) % 1.0
+        if spec["waveform"] == "square":
+            value = 1.0 if phase < 0.5 else -1.0
+        elif spec["waveform"] == "triangle":
+            value = 4.0 * abs(phase - 0.5) - 1.0
+        else:
+            value = math.sin(2 * math.pi * phase)
+        envelope = min(1.0, i / attack, (tone_frames - 1 - i) / release)
+        return int(round(value * envelope * scale))
+
+    tone = array.array("h", (sample(i) for i in range(tone_frames)))
+    silence = array.array("h", bytes(gap_frames * 2))
+    samples = array.array("h", tone)
+    for _ in range(spec["repeats"] - 1):
+        samples.extend(silence)
+        samples.extend(tone)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def render_tone(spec: Dict, cache_dir: Path = None) -> Path:
+    """Return the cached WAV for a tone spec, rendering it on first use"""
+    cache_dir = Path(cache_dir or SYNTH_CACHE_DIR)
+    spec = normalize_spec(spec)
+    key = hashlib.sha1(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+    target = cache_dir / f"{key}.wav"
+    if target.exists():
+        return target
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = target.with_suffix(f".{os.getpid()}.tmp")
+    with wave.open(str(tmp_file), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SYNTH_SAMPLE_RATE)
+        wav.writeframes(render_samples(spec))
+    os.replace(tmp_file, target)
+    return target
+
+
+def describe_spec(spec: Dict) -> str:
+    """Short human-readable form of a tone spec"""
+    spec = normalize_spec(spec)
+    repeats = f" x{spec['repeats']}" if spec["repeats"] > 1 else ""
+    return f"synth {spec['waveform']} {spec['frequency']:g}Hz {spec['duration']:g}s{repeats}"
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Volume scaling and loudness normalization for audio clips.
+Other formats are decoded once through the sound cache. Pre-scaled variants
+are cached by content hash and volume, so applying the configured volume
+costs one file lookup after the first play. Clips that are missing or cannot
+be decoded are reported once and then played as they are.
+"""
+
+import os
+import sys
+import math
+import wave
+import array
+from pathlib import Path
+from typing import Tuple
+
+from sound_cache import SOUND_CACHE_DIR, cache_clip, clip_facts, content_hash, load_numpy, remember_clip
+
+# Configuration
+VOLUME_CACHE_DIR = SOUND_CACHE_DIR / "volume"
+DEFAULT_TARGET_DBFS = -20.0
+FULL_SCALE = 32767
+
+
+def clip_key(path: Path) -> str:
+    """Content hash of a clip (cached clips are already named by theirs)"""
+    path = Path(path).resolve()
+    if path.parent == SOUND_CACHE_DIR.resolve():
+        return path.stem
+    return content_hash(path)[:32]
+
+
+class ClipUnavailable(Exception):
+    """A clip is missing or cannot be decoded; it was reported when first seen"""
+
+
+def decoded_clip(path: Path) -> Path:
+    """The clip itself if it is a WAV, else its decoded copy from the sound cache"""
+    path = Path(path)
+    failure = clip_facts(path).get("error")
+    if failure:
+        raise ClipUnavailable(failure)
+    if not path.exists():
+        print(f"⚠️ Sound clip not found: {path}")
+        remember_clip(path, error="missing")
+        raise ClipUnavailable("missing")
+    if path.suffix.lower() == ".wav":
+        return path
+    cached = cache_clip(path)  # reports why it failed
+    if cached is None:
+        remember_clip(path, error="cannot decode")
+        raise ClipUnavailable("cannot decode")
+    return cached
+
+
+def read_pcm16(path: Path) -> Tuple[array.array, int, int]:
+    """Read a WAV file as native-order 16-bit samples plus (channels, rate)"""
+    with wave.open(str(path), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    if width != 2:
+        # Other sample widths go through the audio server's canonical decoder
+        from audio_server import load_wav, SAMPLE_RATE, CHANNELS
+        return load_wav(path), CHANNELS, SAMPLE_RATE
+
+    samples = array.array("h", data)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples, channels, rate
+
+
+def measure_loudness(samples: array.array) -> Tuple[float, int]:
+    """Return (RMS, peak) of 16-bit samples"""
+    if not samples:
+        return 0.0, 0
+    np = load_numpy()
+    if np is not None:
+        x = np.frombuffer(samples, dtype=np.int16).astype(np.float64)
+        return float(np.sqrt(np.mean(x * x))), int(np.max(np.abs(x)))
+    rms = math.sqrt(math.fsum(s * s for s in samples) / len(samples))
+    return rms, max(max(samples), -min(samples))
+
+
+def compute_gain(rms: float, peak: int, volume: int, normalize: bool,
+                 target_dbfs: float = DEFAULT_TARGET_DBFS) -> float:
+    """Linear gain for a volume (0-100), optionally normalizing RMS loudness first"""
+    gain = max(0, min(100, volume)) / 100.0
+    if normalize and rms > 0:
+        target_rms = FULL_SCALE * 10 ** (target_dbfs / 20.0)
+        # Never normalize past the point where the peak would clip
+        gain *= min(target_rms / rms, FULL_SCALE / peak if peak else 1.0)
+    return gain
+
+
+def scale_samples(samples: array.array, gain: float) -> bytes:
+    """Apply gain with clipping and return little-endian PCM bytes"""
+    np = load_numpy()
+    if np is not None:
+        x = np.frombuffer(samples, dtype=np.int16).astype(np.float32) * gain
+        return np.clip(np.rint(x), -32768, 32767).astype("<i2").tobytes()
+
+    scaled = array.array("h", (max(-32768, min(32767, int(round(s * gain)))) for s in samples))
+    if sys.byteorder == "big":
+        scaled.byteswap()
+    return scaled.tobytes()
+
+
+def scaled_clip(path: Path, volume: int, normalize: bool = False,
+                target_dbfs: float = DEFAULT_TARGET_DBFS, cache_dir: Path = None) -> Path:
+    """Return a cached WAV copy of a clip at the given volume, creating it if needed"""
+    cache_dir = Path(cache_dir or VOLUME_CACHE_DIR)
+    path = decoded_clip(path)
+    suffix = f"n{target_dbfs:g}" if normalize else "raw"
+    variant = cache_dir / f"{clip_key(path)}-v{int(volume)}-{suffix}.wav"
+    if variant.exists():
+        return variant
+
+    try:
+        samples, channels, rate = read_pcm16(path)
+    except (OSError, EOFError, ValueError, wave.Error) as e:
+        print(f"⚠️ Could not read {path.name}: {e}")
+        remember_clip(path, error="unreadable")
+        raise ClipUnavailable("unreadable")
+    rms, peak = measure_loudness(samples)
+    gain = compute_gain(rms, peak, volume, normalize, target_dbfs)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = variant.with_suffix(f".{os.getpid()}.tmp")
+    with wave.open(str(tmp_file), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(scale_samples(samples, gain))
+    os.replace(tmp_file, variant)
+    return variant
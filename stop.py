@@ -8,6 +8,9 @@ import time
 from pathlib import Path
 from datetime import datetime
 from sound_manager import SoundManager
+from host_context import get_host_context
+from relay_client import RelayClient
+from webhook_index import wait_url, record_webhook_response, session_meta
 
 # Load Discord webhook from .env file
 def load_discord_webhook():
@@ -33,12 +36,18 @@ def load_discord_webhook():
 
 DISCORD_WEBHOOK_URL = load_discord_webhook()
 
+# Central notification relay (used instead of the webhook when configured)
+relay_client = RelayClient()
+
 # Initialize sound manager
 sound_manager = SoundManager()
 
 # Send Discord message with retry logic and rich formatting
-def send_discord_message_with_retry(content, embed_data=None, max_retries=3):
+def send_discord_message_with_retry(content, embed_data=None, max_retries=3, session=None):
     """Send Discord message with retry logic and rich formatting"""
+    if relay_client.is_configured():
+        return relay_client.forward(content, embed_data, session)
+    
     if not DISCORD_WEBHOOK_URL:
         print("No Discord webhook URL found. Skipping Discord notification.")
         return False
@@ -55,14 +64,17 @@ def send_discord_message_with_retry(content, embed_data=None, max_retries=3):
     for attempt in range(max_retries):
         try:
             response = requests.post(
-                DISCORD_WEBHOOK_URL, 
+                wait_url(DISCORD_WEBHOOK_URL), 
                 data=json.dumps(payload), 
                 headers=headers,
                 timeout=10
             )
             
-            if response.status_code == 204:
+            if response.status_code in (200, 204):
                 print(f"✅ Discord notification sent successfully (attempt {attempt + 1})")
+                if response.status_code == 200:
+                    # Let the bot recognize replies to this message and resume the session
+                    record_webhook_response(response.text, session)
                 return True
             elif response.status_code == 429:
                 # Rate limited, wait and retry
@@ -93,13 +105,17 @@ def gather_system_context():
     """Gather system and environment context"""
     context = {
         "timestamp": datetime.now().isoformat(),
-        "hostname": platform.node(),
-        "platform": platform.platform(),
-        "python_version": platform.python_version(),
         "working_directory": str(Path.cwd()),
         "user": os.getenv("USER", "unknown"),
     }
     
+    # Static host facts and project type come from a cached snapshot
+    try:
+        context.update(get_host_context(Path.cwd()))
+    except Exception as e:
+        print(f"⚠️ Error loading host context: {e}")
+        context.setdefault("hostname", platform.node())
+    
     # Try to get git information
     try:
         git_branch = subprocess.run(
@@ -124,16 +140,6 @@ def gather_system_context():
     except:
         pass
     
-    # Try to get project information
-    try:
-        project_files = ["package.json", "pyproject.toml", "Cargo.toml", "go.mod", "composer.json"]
-        for file in project_files:
-            if Path(file).exists():
-                context["project_type"] = file
-                break
-    except:
-        pass
-    
     return context
 
 def create_stop_notification(hook_input, context):
@@ -230,7 +236,8 @@ if __name__ == "__main__":
     
     # Send Discord message with retry logic
     print("📤 Sending Discord notification...")
-    success = send_discord_message_with_retry(main_message, embed)
+    session = session_meta(hook_input, context["working_directory"])
+    success = send_discord_message_with_retry(main_message, embed, session=session)
     
     if success:
         print("✅ Notification sent successfully!")
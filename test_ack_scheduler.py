@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the acknowledgement scheduler.
+Uses fake messages that record the REST calls they would make.
+"""
+
+import time
+import asyncio
+
+from ack_scheduler import AckScheduler
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, calls: list):
+        self.id = channel_id
+        self.calls = calls
+
+    async def send(self, content):
+        self.calls.append(("send", self.id, content, time.monotonic()))
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, channel: FakeChannel):
+        self.id = message_id
+        self.channel = channel
+
+    async def reply(self, content, mention_author=True):
+        self.channel.calls.append(("reply", self.id, content, time.monotonic()))
+
+    async def add_reaction(self, emoji):
+        self.channel.calls.append(("reaction", self.id, emoji, time.monotonic()))
+
+
+def test_burst_replies_are_merged():
+    """Five acknowledgements in one channel become one reply"""
+    print("Testing reply batching...")
+    calls = []
+
+    async def scenario():
+        acks = AckScheduler("reply", batch_window=0.05)
+        channel = FakeChannel(1, calls)
+        for i in range(5):
+            acks.acknowledge(FakeMessage(i, channel), f"Command queued: `c{i}`")
+        await acks.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert [c[0] for c in calls] == ["reply"]
+    assert calls[0][1] == 4  # replies to the newest message
+    assert calls[0][2].count("•") == 5
+    print("✅ One reply for five commands")
+
+
+def test_reaction_style_and_dedup():
+    """Reaction style sends no replies, and repeated reactions are dropped"""
+    print("Testing reaction style...")
+    calls = []
+
+    async def scenario():
+        acks = AckScheduler("reaction", route_intervals={"reaction": 0.05})
+        message = FakeMessage(7, FakeChannel(2, calls))
+        acks.acknowledge(message, "Command queued: `x`")
+        acks.react(message, '✅')
+        acks.react(message, '❌')
+        await acks.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert [(c[0], c[2]) for c in calls] == [("reaction", '✅'), ("reaction", '❌')]
+    assert calls[1][3] - calls[0][3] >= 0.045  # paced per channel route
+    print("✅ Duplicate dropped, reactions paced")
+
+
+def test_channels_are_independent():
+    """Replies to different channels are not merged or delayed by each other"""
+    print("Testing per-channel batching...")
+    calls = []
+
+    async def scenario():
+        acks = AckScheduler("reply", batch_window=0.05)
+        acks.reply(FakeMessage(1, FakeChannel(10, calls)), "a")
+        acks.reply(FakeMessage(2, FakeChannel(11, calls)), "b")
+        await acks.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert sorted(c[2] for c in calls) == ["a", "b"]
+    print("✅ Channels batched separately")
+
+
+def test_failed_send_keeps_newer_batch():
+    """A failing flush must not unregister the batch that replaced it"""
+    print("Testing failure during a flush...")
+    calls = []
+
+    async def scenario():
+        acks = AckScheduler("reply", batch_window=0.02, route_intervals={"message": 0})
+        channel = FakeChannel(12, calls)
+
+        class BrokenMessage(FakeMessage):
+            async def reply(self, content, mention_author=True):
+                # A new command arrives while this send is in flight, then the send fails
+                acks.reply(FakeMessage(2, channel), "second")
+                raise RuntimeError("send failed")
+
+        acks.reply(BrokenMessage(1, channel), "first")
+        await acks.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert [(c[0], c[2]) for c in calls] == [("reply", "second")]
+    print("✅ Newer batch still sent")
+
+
+def main():
+    """Run all acknowledgement scheduler tests"""
+    print("📨 Testing Acknowledgement Scheduler")
+    print("=" * 40)
+    test_burst_replies_are_merged()
+    test_reaction_style_and_dedup()
+    test_channels_are_independent()
+    test_failed_send_keeps_newer_batch()
+    print("\n🎯 All acknowledgement scheduler tests completed!")
+
+
+if __name__ == "__main__":
+    main()
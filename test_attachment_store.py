@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test script for the attachment store.
+Serves files from the local Discord stand-in and checks streaming, size caps,
+the content policy, deduplication, eviction and how the monitor passes the
+files to Claude.
+"""
+
+import os
+import time
+import asyncio
+import tempfile
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import claude_monitor
+from attachment_store import AttachmentStore, AttachmentRejected, describe_attachments
+from claude_monitor import ClaudeMonitor
+from command_sanitizer import CommandSanitizer
+from fake_discord import FakeDiscord
+
+
+def attachment(fake: FakeDiscord, filename: str, content: bytes, declared_size: int = None):
+    """A discord.Attachment-like object for a file hosted by the stand-in"""
+    data = fake.attach("file", content)
+    return SimpleNamespace(url=data["url"], filename=filename, content_type=data["content_type"],
+                           size=len(content) if declared_size is None else declared_size)
+
+
+async def with_store(directory: Path, scenario, **store_options):
+    fake = FakeDiscord()
+    await fake.start()
+    store = AttachmentStore(directory, **store_options)
+    await store.start()
+    try:
+        await scenario(fake, store)
+    finally:
+        await store.stop()
+        await fake.stop()
+
+
+def test_stream_and_deduplicate():
+    """The same content sent twice is stored once, under its hash"""
+    print("Testing streaming and deduplication...")
+    with tempfile.TemporaryDirectory() as directory:
+        async def scenario(fake, store):
+            log = b"line\n" * 50000
+            first, = await store.ingest_all([attachment(fake, "build.log", log)])
+            second, = await store.ingest_all([attachment(fake, "../../again.log", log)])
+            assert first["path"] == second["path"] and first["sha256"] == second["sha256"]
+            assert Path(first["path"]).read_bytes() == log and first["size"] == len(log)
+            assert second["filename"] == "again.log"
+            assert store.stats["downloaded"] == 1 and store.stats["deduplicated"] == 1
+            assert not list(store.tmp_dir.iterdir())
+
+        asyncio.run(with_store(Path(directory), scenario))
+    print("✅ Stored once and referenced by path")
+
+
+def test_large_file_is_not_held_in_memory():
+    """Peak Python allocations stay far below the file size"""
+    print("Testing memory use while streaming...")
+    with tempfile.TemporaryDirectory() as directory:
+        async def scenario(fake, store):
+            big = os.urandom(6 * 1024 * 1024)
+            item = attachment(fake, "dump.bin", big)
+            del big
+            tracemalloc.start()
+            try:
+                ref, = await store.ingest_all([item])
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert ref["size"] == 6 * 1024 * 1024
+            # Bounded by socket read-ahead while chunks are written in a thread, plus
+            # the stand-in's own send buffer, which runs in this process too
+            assert peak < 2 * 1024 * 1024, f"peak {peak} bytes"
+            print(f"   6 MB file, peak allocations {peak // 1024} KB")
+
+        asyncio.run(with_store(Path(directory), scenario))
+    print("✅ Streamed to disk")
+
+
+def test_size_and_count_limits():
+    """Oversized or too many attachments are refused; understated sizes are caught mid-stream"""
+    print("Testing limits...")
+    with tempfile.TemporaryDirectory() as directory:
+        async def scenario(fake, store):
+            too_big = attachment(fake, "big.log", b"x" * 2048)
+            try:
+                await store.ingest_all([too_big])
+                assert False, "oversized attachment accepted"
+            except AttachmentRejected as e:
+                assert "big.log" in str(e)
+            assert fake.stats.get("attachment_downloads", 0) == 0  # refused before downloading
+
+            lying = attachment(fake, "lying.log", b"x" * 2048, declared_size=10)
+            try:
+                await store.ingest_all([lying])
+                assert False, "understated attachment accepted"
+            except AttachmentRejected:
+                pass
+            assert not list(store.tmp_dir.iterdir())
+            assert not list(store.blob_dir.glob("*/*"))
+
+            many = [attachment(fake, f"{i}.txt", b"hi") for i in range(3)]
+            try:
+                await store.ingest_all(many)
+                assert False, "too many attachments accepted"
+            except AttachmentRejected as e:
+                assert "at most 2" in str(e)
+
+        asyncio.run(with_store(Path(directory), scenario, max_bytes=1024, max_attachments=2))
+    print("✅ Limits enforced")
+
+
+def test_contents_checked_against_policy():
+    """Text the policy rejects refuses the attachment; other rule hits are flagged"""
+    print("Testing attachment contents against the policy...")
+    sanitizer = CommandSanitizer([
+        {"name": "sudo", "pattern": r"\bsudo\b", "action": "reject"},
+        {"name": "pipe", "pattern": r"\|", "action": "strip"},
+    ])
+    with tempfile.TemporaryDirectory() as directory:
+        async def scenario(fake, store):
+            try:
+                await store.ingest_all([attachment(fake, "setup.sh", b"echo hi\nSUDO make install\n")])
+                assert False, "rejected content accepted"
+            except AttachmentRejected as e:
+                assert "setup.sh" in str(e) and "sudo" in str(e)
+            assert not list(store.tmp_dir.iterdir()) and not list(store.blob_dir.glob("*/*"))
+
+            ref, = await store.ingest_all([attachment(fake, "notes.md", b"use a | b\n")])
+            assert ref["policy_rules"] == ["pipe"]
+            assert "flagged by the command policy (pipe)" in describe_attachments([ref])
+
+        asyncio.run(with_store(Path(directory), scenario, sanitizer=sanitizer))
+    print("✅ Contents checked")
+
+
+def test_prune_evicts_least_recently_used():
+    """Old files go first once the store is over its cap; recent files stay"""
+    print("Testing eviction...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = AttachmentStore(Path(directory), max_cache_bytes=250)
+        old = time.time() - 7 * 24 * 3600
+        paths = []
+        for i, name in enumerate(["a" * 64, "b" * 64, "c" * 64]):
+            path = store.blob_path(name)
+            path.parent.mkdir(parents=True)
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (old + i, old + i))
+            paths.append(path)
+        fresh = store.blob_path("d" * 64)
+        fresh.parent.mkdir(parents=True)
+        fresh.write_bytes(b"x" * 100)
+
+        assert store.prune() == 2
+        assert [p.exists() for p in paths] == [False, False, True] and fresh.exists()
+    print("✅ Least recently used files evicted")
+
+
+def test_monitor_passes_file_references():
+    """The monitor gives Claude a directory with only this command's files and skips missing ones"""
+    print("Testing monitor command line...")
+    with tempfile.TemporaryDirectory() as directory:
+        stored = Path(directory) / "blob"
+        stored.write_text("Traceback ...")
+        (Path(directory) / "other-users-file").write_text("secret")
+        entry = {"command": "explain this error", "timestamp": "2026-01-01T00:00:00", "message_id": 7,
+                 "attachments": [
+                     {"path": str(stored), "filename": "error.log", "size": 13},
+                     {"path": str(Path(directory) / "gone"), "filename": "gone.log", "size": 1},
+                 ]}
+        monitor = ClaudeMonitor.__new__(ClaudeMonitor)
+        monitor.command_queue = SimpleNamespace(complete=lambda command_id, status="done": None)
+        original_dir = claude_monitor.COMMAND_FILES_DIR
+        claude_monitor.COMMAND_FILES_DIR = Path(directory) / "commands"
+        try:
+            claude_cmd, _ = monitor.build_claude_command(entry)
+            files_dir = Path(claude_cmd[claude_cmd.index("--add-dir") + 1])
+            assert files_dir.parent == Path(directory) / "commands"
+            assert [p.name for p in files_dir.iterdir()] == ["1-error.log"]
+            assert (files_dir / "1-error.log").read_text() == "Traceback ..."
+            prompt = claude_cmd[-1]
+            assert prompt.startswith("explain this error\n\n")
+            assert f"{files_dir / '1-error.log'} (error.log, 13 bytes)" in prompt and "gone.log" not in prompt
+
+            monitor.finish_command(monitor.get_command_id(entry))
+            assert not files_dir.exists() and stored.exists()
+        finally:
+            claude_monitor.COMMAND_FILES_DIR = original_dir
+
+        claude_cmd, _ = monitor.build_claude_command({"command": "hello"})
+        assert "--add-dir" not in claude_cmd and claude_cmd[-1] == "hello"
+    print("✅ Only the command's own files passed to Claude")
+
+
+def main():
+    """Run all attachment store tests"""
+    print("📎 Testing Attachment Store")
+    print("=" * 40)
+    test_stream_and_deduplicate()
+    test_large_file_is_not_held_in_memory()
+    test_size_and_count_limits()
+    test_contents_checked_against_policy()
+    test_prune_evicts_least_recently_used()
+    test_monitor_passes_file_references()
+    print("\n🎯 All attachment store tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for the audio server.
+Runs against null and file sinks, so no sound hardware is needed.
+"""
+
+import json
+import math
+import time
+import wave
+import array
+import asyncio
+import tempfile
+from pathlib import Path
+
+import sound_config_cache
+from sound_manager import SoundManager
+from audio_server import AudioServer, FileSink, NullSink, Mixer, load_wav, SAMPLE_RATE
+
+
+def write_tone(path: Path, frequency: float, seconds: float, rate: int = 22050, channels: int = 1):
+    """Write a short sine tone WAV for testing"""
+    frames = int(rate * seconds)
+    samples = array.array("h", (int(8000 * math.sin(2 * math.pi * frequency * i / rate))
+                                for i in range(frames) for _ in range(channels)))
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+
+
+def wait_idle(mixer: Mixer, timeout: float = 5):
+    """Wait for the mixer to finish everything it has"""
+    deadline = time.time() + timeout
+    while not mixer.idle() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_load_wav_converts_format():
+    """Mono 22.05kHz input comes out as stereo at the output rate"""
+    print("Testing WAV decoding...")
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = Path(tmp) / "tone.wav"
+        write_tone(clip, 440, 0.5)
+        samples = load_wav(clip)
+        frames = len(samples) // 2
+        assert abs(frames - SAMPLE_RATE * 0.5) <= 2, frames
+        assert samples[0::2] == samples[1::2]
+    print("✅ WAV decoding works")
+
+
+def test_mix_policy_overlaps_clips():
+    """Two overlapping clips under 'mix' take the length of the longer one"""
+    print("\nTesting mix policy...")
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = Path(tmp) / "tone.wav"
+        write_tone(clip, 440, 0.3)
+        sink = NullSink(realtime=False)
+        mixer = Mixer(sink, "mix")
+        mixer.start()
+        samples = load_wav(clip)
+        mixer.submit("a", samples)
+        mixer.submit("b", samples)
+        wait_idle(mixer)
+        mixer.stop()
+        assert mixer.stats["played"] == 2
+        assert sink.frames_written < len(samples)  # overlapped, not sequential
+    print("✅ Mix policy works")
+
+
+def test_queue_policy_serializes_clips():
+    """Two clips under 'queue' play back to back into a file sink"""
+    print("\nTesting queue policy with file sink...")
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = Path(tmp) / "tone.wav"
+        output = Path(tmp) / "out.wav"
+        write_tone(clip, 440, 0.3)
+        sink = FileSink(output)
+        mixer = Mixer(sink, "queue")
+        samples = load_wav(clip)
+        assert mixer.submit("a", samples) == "playing"
+        assert mixer.submit("b", samples) == "queued"
+        mixer.start()
+        wait_idle(mixer)
+        mixer.stop()
+        sink.close()
+        with wave.open(str(output), "rb") as wav:
+            assert wav.getnframes() >= len(samples)  # both clips, sequentially
+    print("✅ Queue policy works")
+
+
+def test_socket_protocol():
+    """Play requests over the Unix socket reach the mixer"""
+    print("\nTesting socket protocol...")
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = Path(tmp) / "tone.wav"
+        write_tone(clip, 440, 0.2)
+        socket_path = Path(tmp) / "audio.sock"
+        server = AudioServer(NullSink(realtime=False), "mix", socket_path)
+
+        async def scenario():
+            task = asyncio.create_task(server.serve())
+            while not socket_path.exists():
+                await asyncio.sleep(0.01)
+
+            reader, writer = await asyncio.open_unix_connection(str(socket_path))
+            for request in ({"op": "play", "path": str(clip)},
+                            {"op": "play", "path": str(clip)},
+                            {"op": "play", "path": "missing.mp3"}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                print(f"   {request['path']}: {(await reader.readline()).decode().strip()}")
+            writer.write(b'{"op": "stats"}\n')
+            stats = json.loads(await reader.readline())
+            writer.close()
+            await writer.wait_closed()
+
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return stats
+
+        stats = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+        assert stats["ok"] and stats["clips"] == 1  # decoded once, served twice
+    print("✅ Socket protocol works")
+
+
+def test_config_hot_reload():
+    """The server follows policy edits and keeps the last good config on a broken save"""
+    print("\nTesting config hot reload...")
+    saved = sound_config_cache.COMPILED_CONFIG_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        sound_config_cache.COMPILED_CONFIG_DIR = Path(tmp) / "compiled"
+        config_file = Path(tmp) / "sound_config.json"
+        config_file.write_text(json.dumps({"sound_settings": {"audio_server_policy": "queue"}}))
+        manager = SoundManager(str(config_file))
+        server = AudioServer(NullSink(realtime=False), "mix", Path(tmp) / "audio.sock")
+        server.follow_config(manager)
+        try:
+            assert server.mixer.policy == "queue"
+
+            config_file.write_text(json.dumps({"sound_settings": {"audio_server_policy": "interrupt"}}))
+            deadline = time.time() + 5
+            while server.mixer.policy != "interrupt" and time.time() < deadline:
+                time.sleep(0.05)
+            assert server.mixer.policy == "interrupt"
+
+            config_file.write_text('{"sound_settings": {"audio_server_policy": "mix"')
+            time.sleep(3)  # longer than the polling fallback's interval
+            assert server.mixer.policy == "interrupt"
+            assert manager.config["sound_settings"]["audio_server_policy"] == "interrupt"
+        finally:
+            manager.watcher.stop()
+            sound_config_cache.COMPILED_CONFIG_DIR = saved
+    print("✅ Policy reloaded, broken edit ignored")
+
+
+def main():
+    """Run all audio server tests"""
+    print("🎵 Testing Audio Server")
+    print("=" * 40)
+    test_load_wav_converts_format()
+    test_mix_policy_overlaps_clips()
+    test_queue_policy_serializes_clips()
+    test_socket_protocol()
+    test_config_hot_reload()
+    print("\n🎯 All audio server tests completed!")
+
+
+if __name__ == "__main__":
+    main()
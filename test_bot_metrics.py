@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the bot metrics module.
+Drives timers, the HTTP wrapper and the metrics endpoint without Discord.
+"""
+
+import asyncio
+import logging
+import socket
+
+from aiohttp import ClientSession
+
+from bot_metrics import BotMetrics, percentile
+
+
+class FakeRoute:
+    method = "POST"
+    path = "/channels/{channel_id}/messages"
+
+
+class FakeHTTPClient:
+    async def request(self, route, **kwargs):
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_percentiles():
+    """Nearest-rank percentiles over a window"""
+    print("Testing percentiles...")
+    values = sorted(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
+    print("✅ Percentiles correct")
+
+
+def test_timers_and_rate_limit_counter():
+    """Handler timings, error counts, REST timings and 429 log lines are recorded"""
+    print("Testing timers and counters...")
+    metrics = BotMetrics()
+
+    async def scenario():
+        http = FakeHTTPClient()
+        metrics.instrument_http(http)
+        with metrics.timer("on_message"):
+            await http.request(FakeRoute())
+        try:
+            with metrics.timer("queue_command"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        logging.getLogger("discord.http").warning(
+            'We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.', "POST", "/x", 1.0)
+        snapshot = metrics.snapshot()
+        await metrics.stop()
+        return snapshot
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["timings"]["rest POST /channels/{channel_id}/messages"]["count"] == 1
+    assert snapshot["timings"]["on_message"]["p50_ms"] >= 10
+    assert snapshot["counters"]["queue_command_errors"] == 1
+    assert snapshot["counters"]["rate_limit_429"] == 1
+    print("✅ Timings and counters recorded")
+
+
+def test_endpoint_and_loop_lag():
+    """The local endpoint serves the snapshot, including loop lag samples"""
+    print("Testing metrics endpoint...")
+    port = free_port()
+
+    async def scenario():
+        metrics = BotMetrics()
+        await metrics.start(port, report_interval=0)
+        await asyncio.sleep(0.6)
+        async with ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                data = await response.json()
+        await metrics.stop()
+        return data
+
+    data = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+    assert data["timings"]["loop_lag"]["count"] >= 1
+    print("✅ Endpoint serves metrics")
+
+
+def main():
+    """Run all bot metrics tests"""
+    print("📈 Testing Bot Metrics")
+    print("=" * 40)
+    test_percentiles()
+    test_timers_and_rate_limit_counter()
+    test_endpoint_and_loop_lag()
+    print("\n🎯 All bot metrics tests completed!")
+
+
+if __name__ == "__main__":
+    main()
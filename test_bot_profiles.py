@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Test script for the bot client profiles.
+Runs a short simulated message stream for each profile.
+"""
+
+import asyncio
+
+from bot_profiles import client_options
+from bot_memory_benchmark import simulate
+
+
+def test_low_memory_options():
+    """The low-memory profile disables caches and unneeded intents"""
+    print("Testing low-memory options...")
+    options = client_options("low_memory")
+    intents = options["intents"]
+    assert intents.message_content and intents.guild_messages and intents.dm_messages
+    assert not intents.members and not intents.presences and not intents.typing
+    assert options["max_messages"] is None and options["chunk_guilds_at_startup"] is False
+    print("✅ Options correct")
+
+
+def test_message_cache_per_profile():
+    """Only the default profile caches messages"""
+    print("Testing simulated message stream...")
+    default = asyncio.run(simulate("default", 300, 10, 50))
+    low_memory = asyncio.run(simulate("low_memory", 300, 10, 50))
+    assert default["cached_messages"] == 300
+    assert low_memory["cached_messages"] == 0
+    assert low_memory["retained_kib"] < default["retained_kib"]
+    print("✅ Low-memory profile retains less")
+
+
+def main():
+    """Run all bot profile tests"""
+    print("🧠 Testing Bot Profiles")
+    print("=" * 40)
+    test_low_memory_options()
+    test_message_cache_per_profile()
+    print("\n🎯 All bot profile tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test script for the command queue backends.
+Uses scratch directories, so the real queue is never touched.
+"""
+
+import os
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+
+import command_queue
+from command_queue import AsyncQueueWriter, JsonFileQueue, SqliteQueue, get_command_queue, make_command_id
+
+
+def make_entry(i: int) -> dict:
+    """Minimal command entry as produced by the Discord bot"""
+    return {"timestamp": f"2024-01-01T00:00:{i:02d}", "message_id": i, "command": f"command {i}"}
+
+
+def check_backend(queue):
+    """Enqueue, claim in order, then nothing is left"""
+    for i in range(3):
+        queue.enqueue(make_entry(i))
+    assert len(queue.pending()) == 3
+
+    first = queue.claim(1)
+    assert [c["message_id"] for c in first] == [0]
+    queue.complete(make_command_id(first[0]))
+    assert [c["message_id"] for c in queue.claim(5)] == [1, 2]
+    assert queue.claim(1) == []
+    assert queue.pending() == []
+
+
+def test_json_backend():
+    """JSON backend keeps the original file format"""
+    print("Testing JSON backend...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JsonFileQueue(Path(directory) / "queue.json", Path(directory) / "processed.json")
+        check_backend(queue)
+    print("✅ JSON backend works")
+
+
+def test_sqlite_backend():
+    """SQLite backend enqueues, claims and completes"""
+    print("Testing SQLite backend...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        check_backend(queue)
+        queue.close()
+    print("✅ SQLite backend works")
+
+
+def test_sqlite_concurrent_claims():
+    """Concurrent claimers never receive the same command"""
+    print("Testing concurrent SQLite claims...")
+    with tempfile.TemporaryDirectory() as directory:
+        db_file = Path(directory) / "queue.db"
+        queue = SqliteQueue(db_file)
+        queue.enqueue_many([make_entry(i) for i in range(50)])
+        queue.close()
+
+        claimed = []
+        lock = threading.Lock()
+
+        def claim_all():
+            own = SqliteQueue(db_file)
+            while True:
+                batch = own.claim(1)
+                if not batch:
+                    break
+                with lock:
+                    claimed.append(batch[0]["message_id"])
+            own.close()
+
+        threads = [threading.Thread(target=claim_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == list(range(50))
+    print("✅ Each command claimed exactly once")
+
+
+def test_status_and_cancel():
+    """Pending commands cancel outright, running ones are flagged for the monitor"""
+    print("Testing status and cancel...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        entries = [dict(make_entry(i), user_id=7 if i < 2 else 8) for i in range(3)]
+        queue.enqueue_many(entries)
+        running = queue.claim(1)[0]
+        running_id, pending_id = make_command_id(running), make_command_id(entries[1])
+
+        assert queue.counts() == {"pending": 2, "running": 1}
+        assert [e["command_id"] for e in queue.recent(5, user_id=7)] == [pending_id, running_id]
+        assert queue.get(running_id)["status"] == "running"
+
+        assert queue.cancel(pending_id) == "cancelled"
+        assert queue.cancel(running_id) == "cancelling"
+        assert queue.cancel("unknown") is None
+        assert queue.cancel(pending_id) is None
+        assert queue.cancel_requests() == [running_id]
+        assert [c["message_id"] for c in queue.claim(5)] == [2]  # cancelled one is skipped
+
+        queue.complete(running_id, "cancelled")
+        assert queue.cancel_requests() == []
+        queue.close()
+
+        json_queue = JsonFileQueue(Path(directory) / "queue.json", Path(directory) / "processed.json")
+        json_queue.enqueue_many(entries[:2])
+        assert json_queue.cancel(make_command_id(entries[0])) == "cancelled"
+        assert json_queue.get(make_command_id(entries[0]))["status"] == "processed"
+        assert [c["message_id"] for c in json_queue.claim(5)] == [1]
+    print("✅ Status and cancel work")
+
+
+def test_backend_from_env_file():
+    """The monitor picks the backend from the same .env files as the bot"""
+    print("Testing backend selection from .env...")
+    with tempfile.TemporaryDirectory() as directory:
+        env_file = Path(directory) / ".env"
+        env_file.write_text("# queue\nCOMMAND_QUEUE_BACKEND=json\n")
+        saved_files, saved_env = command_queue.ENV_FILES, os.environ.pop("COMMAND_QUEUE_BACKEND", None)
+        saved_home = command_queue.COMMAND_QUEUE_FILE, command_queue.PROCESSED_COMMANDS_FILE
+        command_queue.ENV_FILES = [env_file]
+        command_queue.COMMAND_QUEUE_FILE = Path(directory) / "queue.json"
+        command_queue.PROCESSED_COMMANDS_FILE = Path(directory) / "processed.json"
+        try:
+            assert command_queue.configured_backend() == "json"
+            assert isinstance(get_command_queue(), JsonFileQueue)
+            os.environ["COMMAND_QUEUE_BACKEND"] = "sqlite"
+            assert command_queue.configured_backend() == "json"  # .env wins, as in the bot
+        finally:
+            command_queue.ENV_FILES = saved_files
+            command_queue.COMMAND_QUEUE_FILE, command_queue.PROCESSED_COMMANDS_FILE = saved_home
+            os.environ.pop("COMMAND_QUEUE_BACKEND", None)
+            if saved_env is not None:
+                os.environ["COMMAND_QUEUE_BACKEND"] = saved_env
+    print("✅ Backend read from .env")
+
+
+def test_recover_interrupted_commands():
+    """Commands a dead monitor left running are requeued, pending cancellations finish"""
+    print("Testing recovery after a monitor crash...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        queue.enqueue_many([make_entry(i) for i in range(3)])
+        first, second = queue.claim(2)
+        queue.cancel(make_command_id(second))
+        assert queue.claim(1) and queue.counts() == {"running": 2, "cancelling": 1}
+
+        assert queue.recover() == {"pending": 2, "cancelled": 1}
+        assert queue.get(make_command_id(second))["status"] == "cancelled"
+        assert [c["message_id"] for c in queue.claim(5)] == [0, 2]
+        queue.close()
+    print("✅ Interrupted commands recovered")
+
+
+def test_async_writer_group_commit():
+    """Concurrent submissions are committed together before they are acknowledged"""
+    print("Testing async group commit...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        commits = []
+        enqueue_many = queue.enqueue_many
+
+        def recording_enqueue_many(entries):
+            commits.append(len(entries))
+            return enqueue_many(entries)
+
+        queue.enqueue_many = recording_enqueue_many
+
+        async def scenario():
+            writer = AsyncQueueWriter(queue, batch_window=0.02)
+            writer.start()
+            ids = await asyncio.gather(*(writer.submit(make_entry(i)) for i in range(20)))
+            await writer.stop()
+            return ids
+
+        ids = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+        assert ids == [make_command_id(make_entry(i)) for i in range(20)]
+        assert len(queue.pending()) == 20
+        assert commits == [20], commits
+        queue.close()
+    print("✅ 20 submissions committed in one write")
+
+
+def main():
+    """Run all command queue tests"""
+    print("📬 Testing Command Queue")
+    print("=" * 40)
+    test_json_backend()
+    test_sqlite_backend()
+    test_sqlite_concurrent_claims()
+    test_status_and_cancel()
+    test_backend_from_env_file()
+    test_recover_interrupted_commands()
+    test_async_writer_group_commit()
+    print("\n🎯 All command queue tests completed!")
+
+
+if __name__ == "__main__":
+    main()
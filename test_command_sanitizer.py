@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the command sanitizer.
+Checks the seed corpus, each action, the literal prefilter and worst-case inputs.
+"""
+
+import time
+import random
+import logging
+
+from command_sanitizer import CommandSanitizer, first_chars, required_literal
+from sanitizer_benchmark import ADVERSARIAL, load_corpus, mutate
+
+logging.getLogger("command_sanitizer").setLevel(logging.ERROR)
+
+
+def test_corpus_expectations():
+    """The default policy produces the recorded rules and output for every seed"""
+    print("Testing seed corpus...")
+    sanitizer = CommandSanitizer.from_file()
+    for case in load_corpus():
+        result = sanitizer.sanitize(case["input"])
+        assert result.fired == case["fired"], (case["input"], result.fired)
+        assert result.text == case["output"], (case["input"], result.text)
+    print("✅ Corpus matches")
+
+
+def test_actions():
+    """reject, strip and escape apply per rule and all fired rules are reported"""
+    print("Testing actions...")
+    sanitizer = CommandSanitizer([
+        {"name": "sudo", "pattern": r"\bsudo\b", "action": "reject"},
+        {"name": "pipe", "pattern": r"\|", "action": "escape"},
+        {"name": "separator", "pattern": r";", "action": "strip"},
+    ])
+    result = sanitizer.sanitize("ls | wc; Sudo x")
+    assert result.rejected and result.fired == ["pipe", "separator", "sudo"]
+    result = sanitizer.sanitize("ls | wc; echo")
+    assert not result.rejected
+    assert result.text == "ls \\| wc[REMOVED] echo"
+    print("✅ Actions applied")
+
+
+def test_literal_analysis():
+    """Start characters and required literals are derived only when every match has them"""
+    print("Testing rule literal analysis...")
+    assert first_chars(r"\bsudo\b") == {"s"}
+    assert first_chars(r"rm|(?:ch)mod") is None
+    assert first_chars(r"a?b") is None
+    assert first_chars(r"\w+") is None
+    assert required_literal(r"rm\s+-RF") == "-rf"
+    assert required_literal(r">>?") == ">"
+    assert required_literal(r"\$\(") == "$("
+    assert required_literal(r"\x41") is None
+    assert required_literal(r"[a-z]+") is None
+    print("✅ Literals derived")
+
+
+def test_prefilter_matches_full_scan():
+    """Skipping rules whose literal is absent never changes the outcome"""
+    print("Testing literal prefilter...")
+    sanitizer = CommandSanitizer.from_file()
+    reference = CommandSanitizer.from_file()
+    full = reference.compile_rules(list(range(len(reference.rules))))
+    reference.regex_for = lambda command: full
+
+    rng = random.Random(1)
+    seeds = [case["input"] for case in load_corpus()]
+    for text in seeds + [mutate(rng.choice(seeds), rng) for _ in range(2000)]:
+        expected = reference.sanitize(text)
+        result = sanitizer.sanitize(text)
+        assert (result.text, result.fired) == (expected.text, expected.fired), text
+
+    # re.IGNORECASE matches dotless i with i; the prefilter must too
+    pip = CommandSanitizer([{"name": "pip", "pattern": r"\bpip\b", "action": "strip"}])
+    assert pip.sanitize("pıp install x").fired == ["pip"]
+    assert pip.sanitize("ſudo pip").text == "ſudo [REMOVED]"
+    print("✅ Prefilter agrees with a full scan")
+
+
+def test_adversarial_inputs_are_fast():
+    """100k-character adversarial inputs finish well within a second"""
+    print("Testing adversarial inputs...")
+    sanitizer = CommandSanitizer.from_file()
+    for name, generate in ADVERSARIAL.items():
+        started = time.perf_counter()
+        sanitizer.sanitize(generate(100_000))
+        elapsed = time.perf_counter() - started
+        assert elapsed < 1.0, (name, elapsed)
+    print("✅ No pathological backtracking")
+
+
+def main():
+    """Run all command sanitizer tests"""
+    print("🛡️ Testing Command Sanitizer")
+    print("=" * 40)
+    test_corpus_expectations()
+    test_actions()
+    test_literal_analysis()
+    test_prefilter_matches_full_scan()
+    test_adversarial_inputs_are_fast()
+    print("\n🎯 All command sanitizer tests completed!")
+
+
+if __name__ == "__main__":
+    main()
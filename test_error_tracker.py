@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the error fingerprint tracker.
+Uses a scratch state file and explicit timestamps.
+"""
+
+import tempfile
+from pathlib import Path
+
+from error_tracker import ErrorTracker, fingerprint_error, format_summary
+
+
+def error_input(path: str = "/home/me/project/app.py", line: int = 12) -> dict:
+    """Hook payload for a failing tool call"""
+    return {"tool_name": "Bash", "error": f"TypeError: bad operand at {path}:{line}"}
+
+
+def test_repeats_are_deduplicated():
+    """Only the first occurrence notifies; paths and numbers do not change the fingerprint"""
+    print("Testing deduplication...")
+    with tempfile.TemporaryDirectory() as directory:
+        tracker = ErrorTracker(Path(directory) / "state.json", window=180)
+        assert fingerprint_error(error_input())[0] == fingerprint_error(error_input("/tmp/x.py", 99))[0]
+        assert tracker.record(error_input(), now=1000) == (True, [])
+        assert tracker.record(error_input("/tmp/x.py", 99), now=1010) == (False, [])
+        assert tracker.record({"tool_name": "Bash", "error": "ValueError: other"}, now=1020)[0]
+    print("✅ Repeats suppressed")
+
+
+def test_closed_window_is_summarized_once():
+    """Five repeats produce one ×5 summary when the next event arrives after the window"""
+    print("Testing window summary...")
+    with tempfile.TemporaryDirectory() as directory:
+        tracker = ErrorTracker(Path(directory) / "state.json", window=180)
+        for i in range(5):
+            tracker.record(error_input(line=i), now=1000 + i * 30)
+
+        is_first, summaries = tracker.record({"tool_name": "Read", "error": "OSError: gone"}, now=1200)
+        assert is_first
+        summary, = summaries
+        assert summary["count"] == 5 and summary["last_seen"] - summary["first_seen"] == 120
+        assert format_summary(summary)[0] == "❌ **Repeated error** ×5 in 2 min"
+        assert tracker.flush(now=1200) == []  # handed out exactly once
+    print("✅ Summary returned once")
+
+
+def test_single_occurrence_expires_silently():
+    """A window with one occurrence closes without a summary and the error notifies again"""
+    print("Testing expiry...")
+    with tempfile.TemporaryDirectory() as directory:
+        tracker = ErrorTracker(Path(directory) / "state.json", window=180)
+        tracker.record(error_input(), now=1000)
+        assert tracker.flush(now=1100) == []
+        assert tracker.flush(now=1200) == []
+        assert tracker.record(error_input(), now=1201) == (True, [])
+    print("✅ Window expired")
+
+
+def test_namespaces_are_independent():
+    """The sound-only hook neither suppresses nor expires notification.py's fingerprints"""
+    print("Testing namespaces...")
+    with tempfile.TemporaryDirectory() as directory:
+        state_file = Path(directory) / "state.json"
+        notifications = ErrorTracker(state_file, window=180)
+        sounds = ErrorTracker(state_file, window=180, namespace="error_found")
+
+        assert sounds.record(error_input(), now=1000)[0]
+        assert notifications.record(error_input(), now=1001)[0]  # not suppressed by the sound hook
+        notifications.record(error_input(), now=1002)
+
+        sounds.record(error_input(), now=1500)  # expires only its own window
+        summary, = notifications.flush(now=1500)
+        assert summary["count"] == 2
+    print("✅ Namespaces kept apart")
+
+
+def main():
+    """Run all error tracker tests"""
+    print("🔁 Testing Error Tracker")
+    print("=" * 40)
+    test_repeats_are_deduplicated()
+    test_closed_window_is_summarized_once()
+    test_single_occurrence_expires_silently()
+    test_namespaces_are_independent()
+    print("\n🎯 All error tracker tests completed!")
+
+
+if __name__ == "__main__":
+    main()
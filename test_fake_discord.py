@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for the local Discord stand-in.
+Checks webhook rate limiting, then runs the notification relay and the real
+bot process against it: message and slash commands, attachments, acks, and a
+restart that resumes the gateway session.
+"""
+
+import os
+import sys
+import signal
+import asyncio
+import tempfile
+from pathlib import Path
+
+from aiohttp import ClientSession
+
+from command_queue import SqliteQueue
+from fake_discord import FakeDiscord, DEFAULT_CHANNEL_ID, DEFAULT_USER_ID
+from notification_relay import NotificationRelay
+
+BOT_SCRIPT = Path(__file__).parent / "discord_bot.py"
+
+
+async def wait_until(condition, timeout: float = 20.0, interval: float = 0.05):
+    """Poll a condition until it holds or the timeout expires"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            raise TimeoutError("condition not met in time")
+        await asyncio.sleep(interval)
+
+
+def test_webhook_rate_limit_headers():
+    """The sixth webhook post within the window is a 429 with Discord's headers"""
+    print("Testing webhook rate limits...")
+
+    async def scenario():
+        fake = FakeDiscord()
+        await fake.start()
+        try:
+            async with ClientSession() as session:
+                statuses, last = [], None
+                for i in range(6):
+                    async with session.post(fake.webhook_url() + "?wait=true", json={"content": f"n{i}"}) as r:
+                        statuses.append(r.status)
+                        last = r.headers, await r.json()
+            headers, body = last
+            assert statuses == [200] * 5 + [429], statuses
+            assert headers["X-RateLimit-Remaining"] == "0" and "Retry-After" in headers
+            assert body["retry_after"] > 0 and body["global"] is False
+            assert fake.stats["429"] == 1 and fake.stats["webhook_messages"] == 5
+        finally:
+            await fake.stop()
+
+    asyncio.run(scenario())
+    print("✅ 429 returned with rate limit headers")
+
+
+def test_relay_stays_under_the_limit():
+    """The relay reads the bucket headers and waits instead of collecting 429s"""
+    print("Testing relay against the stand-in...")
+
+    async def scenario(directory: Path):
+        fake = FakeDiscord(latency=0.005, rate_limits={"webhook": (2, 0.3)})
+        await fake.start()
+        relay = NotificationRelay(fake.webhook_url(), index_db=directory / "index.db")
+        await relay.start(None)
+        relay.flusher.cancel()
+        try:
+            results = [await relay.post_to_discord({"content": f"event {i}"}) for i in range(6)]
+        finally:
+            await relay.stop(None)
+            await fake.stop()
+        assert all(results)
+        assert fake.stats["webhook_messages"] == 6
+        assert fake.stats.get("429", 0) == 0, fake.stats
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(Path(directory)))
+    print("✅ Relay delivered everything without a 429")
+
+
+async def start_bot(fake: FakeDiscord, home: Path):
+    """Run discord_bot.py in a scratch home directory against the stand-in"""
+    env = dict(os.environ, HOME=str(home), DISCORD_BOT_TOKEN="fake", AUTHORIZED_USER_ID=str(DEFAULT_USER_ID),
+               DISCORD_API_BASE=fake.api_base, DISCORD_GATEWAY_URL=fake.gateway_url,
+               COMMAND_QUEUE_BACKEND="sqlite", BOT_METRICS_INTERVAL="0", ACK_STYLE="reply")
+    with open(home / "bot.log", "ab") as log:
+        return await asyncio.create_subprocess_exec(sys.executable, str(BOT_SCRIPT), cwd=str(home), env=env,
+                                                    stdout=log, stderr=log)
+
+
+def test_bot_end_to_end():
+    """Commands flow from the gateway into the queue, acks come back, restarts resume"""
+    print("Testing the bot against the stand-in...")
+
+    async def scenario(home: Path):
+        fake = FakeDiscord()
+        await fake.start()
+        bot = None
+        try:
+            bot = await start_bot(fake, home)
+            await wait_until(lambda: fake.stats.get("gateway_identify") == 1)
+
+            await fake.push_message("claude: summarize the README", files={"README.md": b"# Hooks\n" * 1000})
+            await wait_until(lambda: any(m["content"].startswith("Command queued")
+                                         for m in fake.channel_history(DEFAULT_CHANNEL_ID)))
+
+            await fake.push_interaction("claude", "run", {"command": "run the tests"})
+            await wait_until(lambda: any("Command queued: `run the tests`" in m["content"]
+                                         for m in fake.channel_history(DEFAULT_CHANNEL_ID)))
+            assert fake.interaction_responses[0]["type"] == 5  # deferred first
+
+            bot.send_signal(signal.SIGTERM)
+            assert await asyncio.wait_for(bot.wait(), timeout=20) == 0
+            assert (home / ".claude" / "gateway_session.json").exists()
+
+            await fake.push_message("claude: sent while the bot restarts")
+            bot = await start_bot(fake, home)
+            await wait_until(lambda: fake.stats.get("gateway_resume") == 1)
+            await wait_until(lambda: any("`sent while the bot restarts`" in m["content"]
+                                         for m in fake.channel_history(DEFAULT_CHANNEL_ID)))
+            assert fake.stats["gateway_identify"] == 1
+
+            queue = SqliteQueue(home / ".claude" / "command_queue.db")
+            pending = queue.pending()
+            commands = [entry["command"] for entry in pending]
+            queue.close()
+            attached, = pending[0]["attachments"]
+            assert Path(attached["path"]).read_bytes() == b"# Hooks\n" * 1000
+            assert Path(attached["path"]).is_relative_to(home / ".claude" / "attachments")
+            assert commands == ["summarize the README", "run the tests", "sent while the bot restarts"], commands
+        finally:
+            if bot is not None and bot.returncode is None:
+                bot.send_signal(signal.SIGTERM)
+                await asyncio.wait_for(bot.wait(), timeout=20)
+            await fake.stop()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            asyncio.run(scenario(Path(tmp)))
+        except Exception:
+            print((Path(tmp) / "bot.log").read_text()[-3000:])
+            raise
+    print("✅ Message and slash commands queued with attachments and acknowledged; restart resumed")
+
+
+def main():
+    """Run all stand-in tests"""
+    print("🧪 Testing Fake Discord")
+    print("=" * 40)
+    test_webhook_rate_limit_headers()
+    test_relay_stays_under_the_limit()
+    test_bot_end_to_end()
+    print("\n🎯 All stand-in tests completed!")
+
+
+if __name__ == "__main__":
+    main()
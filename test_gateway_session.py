@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for gateway session persistence.
+Runs a discord.py client against the local Discord stand-in (fake_discord.py)
+through identify, suspend, resume with replay and INVALID_SESSION.
+"""
+
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+import discord
+
+from fake_discord import FakeDiscord, discord_py_pointed_at
+from gateway_session import (ResumingWebSocket, install_resuming_websocket,
+                             load_gateway_session, save_gateway_session)
+
+
+class RecordingClient(discord.Client):
+    def __init__(self):
+        intents = discord.Intents.none()
+        intents.dm_messages = True
+        intents.message_content = True
+        super().__init__(intents=intents)
+        self.saved_gateway_session = None
+        self.received = []
+        self.events = asyncio.Queue()
+
+    async def on_ready(self):
+        await self.events.put("ready")
+
+    async def on_resumed(self):
+        await self.events.put("resumed")
+
+    async def on_message(self, message):
+        self.received.append(message.content)
+        await self.events.put(message.content)
+
+
+async def run_against_stand_in(scenario):
+    """Serve the stand-in, point discord.py at it and run the scenario"""
+    fake = FakeDiscord()
+    await fake.start()
+    install_resuming_websocket()
+    try:
+        with discord_py_pointed_at(fake):
+            await scenario(fake)
+    finally:
+        await fake.stop()
+
+
+async def start_client(saved=None) -> RecordingClient:
+    client = RecordingClient()
+    client.saved_gateway_session = saved
+    await client.login("token")
+    client.connect_task = asyncio.create_task(client.connect())
+    return client
+
+
+async def next_event(client: RecordingClient):
+    return await asyncio.wait_for(client.events.get(), timeout=5)
+
+
+def test_restart_resumes_and_replays():
+    """A suspended session resumes in a new client, which receives the events it missed"""
+    print("Testing resume across a restart...")
+
+    async def scenario(fake):
+        with tempfile.TemporaryDirectory() as tmp:
+            session_file = Path(tmp) / "gateway_session.json"
+
+            first = await start_client()
+            assert await next_event(first) == "ready"
+            await fake.push_message("claude: before restart")
+            assert await next_event(first) == "claude: before restart"
+            assert isinstance(first.ws, ResumingWebSocket)
+
+            # Shutdown: stop handling events, save state, close resumably
+            save_gateway_session(first.ws.suspend(), session_file)
+            await fake.push_message("claude: during restart")
+            await asyncio.sleep(0.1)
+            await first.close()
+            await first.connect_task
+
+            saved = load_gateway_session(session_file)
+            assert saved["sequence"] == 2 and saved["session_id"] in fake.sessions
+            assert not session_file.exists()
+
+            started = time.perf_counter()
+            second = await start_client(saved)
+            assert await next_event(second) == "claude: during restart"
+            assert await next_event(second) == "resumed"
+            elapsed = time.perf_counter() - started
+            await second.close()
+
+            assert first.received == ["claude: before restart"]
+            assert second.received == ["claude: during restart"]
+            assert fake.stats["gateway_identify"] == 1 and fake.stats["gateway_resume"] == 1
+            assert fake.gateway_closes[0] == 4000, fake.gateway_closes
+            print(f"✅ Resumed in {elapsed * 1000:.0f}ms and replayed the missed event")
+
+    asyncio.run(run_against_stand_in(scenario))
+
+
+def test_invalid_session_falls_back_to_identify():
+    """An unknown session is invalidated and the client identifies instead"""
+    print("Testing invalid session fallback...")
+
+    async def scenario(fake):
+        saved = {"session_id": "expired", "sequence": 5,
+                 "resume_gateway_url": fake.gateway_url, "saved_at": time.time()}
+        client = await start_client(saved)
+        assert await next_event(client) == "ready"
+        await client.close()
+        assert fake.stats["gateway_invalid_session"] == 1 and fake.stats["gateway_identify"] == 1
+        print("✅ Identified after INVALID_SESSION")
+
+    asyncio.run(run_against_stand_in(scenario))
+
+
+def test_stale_or_broken_state_is_ignored():
+    """Old or malformed state is not used, and the file is consumed"""
+    print("Testing stale state...")
+    with tempfile.TemporaryDirectory() as tmp:
+        session_file = Path(tmp) / "gateway_session.json"
+        save_gateway_session({"session_id": "s", "sequence": 1, "resume_gateway_url": "wss://x",
+                              "saved_at": time.time() - 3600}, session_file)
+        assert load_gateway_session(session_file, max_age=90) is None
+        assert not session_file.exists()
+
+        session_file.write_text("{not json")
+        assert load_gateway_session(session_file) is None
+        assert load_gateway_session(session_file) is None  # missing file
+    print("✅ Stale and broken state ignored")
+
+
+def main():
+    """Run all tests"""
+    print("🔌 Testing Gateway Session Persistence")
+    print("=" * 40)
+    test_stale_or_broken_state_is_ignored()
+    test_restart_resumes_and_replays()
+    test_invalid_session_falls_back_to_identify()
+    print("\n✅ All gateway session tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-process hook debounce.
+Uses a scratch table file and explicit timestamps.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from hook_debounce import should_fire, get_cooldown, TABLE_SIZE
+
+
+def test_cooldown_window():
+    """A hook fires once per cooldown window, per session and hook type"""
+    print("Testing cooldown window...")
+    with tempfile.TemporaryDirectory() as directory:
+        table = Path(directory) / "debounce.bin"
+        assert should_fire("s1", "thinking", cooldown=30, now=1000, table_file=table)
+        assert not should_fire("s1", "thinking", cooldown=30, now=1029.9, table_file=table)
+        assert should_fire("s2", "thinking", cooldown=30, now=1010, table_file=table)
+        assert should_fire("s1", "task_start", cooldown=30, now=1010, table_file=table)
+        assert should_fire("s1", "thinking", cooldown=30, now=1030, table_file=table)
+        assert not should_fire("s1", "thinking", cooldown=30, now=1045, table_file=table)  # window restarted
+        assert table.stat().st_size == TABLE_SIZE
+    print("✅ Suppressed inside the window only")
+
+
+def test_cooldown_configuration():
+    """Environment overrides apply and a zero cooldown never touches the table"""
+    print("Testing cooldown configuration...")
+    os.environ["CLAUDE_HOOK_COOLDOWN_THINKING"] = "5"
+    try:
+        assert get_cooldown("thinking") == 5
+    finally:
+        del os.environ["CLAUDE_HOOK_COOLDOWN_THINKING"]
+    assert get_cooldown("thinking") == 30 and get_cooldown("stop") == 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        table = Path(directory) / "debounce.bin"
+        assert should_fire("s1", "stop", now=1000, table_file=table)
+        assert should_fire("s1", "stop", now=1000, table_file=table)
+        assert not table.exists()
+    print("✅ Cooldowns configured")
+
+
+def test_full_table_still_debounces():
+    """Filling the table evicts old entries without breaking recent ones"""
+    print("Testing a full table...")
+    with tempfile.TemporaryDirectory() as directory:
+        table = Path(directory) / "debounce.bin"
+        for i in range(2000):
+            assert should_fire(f"old{i}", "thinking", cooldown=30, now=1000, table_file=table)
+        assert should_fire("recent", "thinking", cooldown=30, now=2000, table_file=table)
+        assert not should_fire("recent", "thinking", cooldown=30, now=2001, table_file=table)
+    print("✅ Oldest entries evicted")
+
+
+def test_unusable_table_fails_open():
+    """A table that cannot be opened lets the hook fire"""
+    print("Testing fail-open...")
+    with tempfile.TemporaryDirectory() as directory:
+        blocker = Path(directory) / "file"
+        blocker.write_text("")
+        table = blocker / "debounce.bin"  # parent is a file
+        assert should_fire("s1", "thinking", cooldown=30, now=1000, table_file=table)
+        assert should_fire("s1", "thinking", cooldown=30, now=1001, table_file=table)
+    print("✅ Hook fires without a table")
+
+
+def fire(table: str) -> bool:
+    return should_fire("shared", "thinking", cooldown=30, table_file=Path(table))
+
+
+def test_concurrent_processes_fire_once():
+    """Hook processes racing on the same window let exactly one through"""
+    print("Testing concurrent processes...")
+    with tempfile.TemporaryDirectory() as directory:
+        table = str(Path(directory) / "debounce.bin")
+        with ProcessPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(fire, [table] * 32))
+        assert results.count(True) == 1, results
+    print("✅ One process fired")
+
+
+def main():
+    """Run all hook debounce tests"""
+    print("⏱️ Testing Hook Debounce")
+    print("=" * 40)
+    test_cooldown_window()
+    test_cooldown_configuration()
+    test_full_table_still_debounces()
+    test_unusable_table_fails_open()
+    test_concurrent_processes_fire_once()
+    print("\n🎯 All hook debounce tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the host facts snapshot.
+Uses a scratch snapshot file and scratch project directories.
+"""
+
+import os
+import json
+import tempfile
+from pathlib import Path
+
+from host_context import get_host_context, probe_host_facts, MAX_PROJECT_ENTRIES
+
+
+def test_facts_reused_until_key_changes():
+    """Facts come from the snapshot until the boot ID, hostname or Python changes"""
+    print("Testing host facts invalidation...")
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_file = Path(directory) / "host_facts.json"
+        assert get_host_context(Path(directory), snapshot_file) == probe_host_facts()
+
+        # Marked facts are served as-is while the key matches: nothing was re-probed
+        snapshot = json.loads(snapshot_file.read_text())
+        snapshot["facts"]["hostname"] = "from-snapshot"
+        snapshot_file.write_text(json.dumps(snapshot))
+        assert get_host_context(Path(directory), snapshot_file)["hostname"] == "from-snapshot"
+
+        snapshot["key"]["boot_id"] = "previous-boot"
+        snapshot_file.write_text(json.dumps(snapshot))
+        assert get_host_context(Path(directory), snapshot_file) == probe_host_facts()
+        assert json.loads(snapshot_file.read_text())["key"]["boot_id"] != "previous-boot"
+
+        snapshot_file.write_text("{not json")
+        assert get_host_context(Path(directory), snapshot_file) == probe_host_facts()
+    print("✅ Re-probed only after a reboot or a corrupt snapshot")
+
+
+def step_mtime(directory: Path):
+    """Move a directory's mtime forward, as a later edit would (coarse clocks can repeat it)"""
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_project_type_follows_directory_changes():
+    """Adding or removing a marker file invalidates the memoized project type"""
+    print("Testing project type invalidation...")
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_file = Path(directory) / "host_facts.json"
+        project = Path(directory) / "project"
+        project.mkdir()
+        assert "project_type" not in get_host_context(project, snapshot_file)
+
+        (project / "pyproject.toml").write_text("")
+        step_mtime(project)
+        assert get_host_context(project, snapshot_file)["project_type"] == "pyproject.toml"
+
+        snapshot = json.loads(snapshot_file.read_text())
+        snapshot["projects"][str(project)]["project_type"] = "memoized"
+        snapshot_file.write_text(json.dumps(snapshot))
+        assert get_host_context(project, snapshot_file)["project_type"] == "memoized"
+
+        (project / "pyproject.toml").unlink()
+        step_mtime(project)
+        assert "project_type" not in get_host_context(project, snapshot_file)
+    print("✅ Project type re-detected on change")
+
+
+def test_project_entries_are_bounded():
+    """Only the most recently detected directories are kept"""
+    print("Testing project entry bound...")
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_file = Path(directory) / "host_facts.json"
+        projects = [Path(directory) / f"p{i}" for i in range(MAX_PROJECT_ENTRIES + 5)]
+        for project in projects:
+            project.mkdir()
+            get_host_context(project, snapshot_file)
+        stored = json.loads(snapshot_file.read_text())["projects"]
+        assert len(stored) == MAX_PROJECT_ENTRIES
+        assert str(projects[0]) not in stored and str(projects[-1]) in stored
+    print("✅ Oldest directories dropped")
+
+
+def main():
+    """Run all host context tests"""
+    print("🖥️ Testing Host Context")
+    print("=" * 40)
+    test_facts_reused_until_key_changes()
+    test_project_type_follows_directory_changes()
+    test_project_entries_are_bounded()
+    print("\n🎯 All host context tests completed!")
+
+
+if __name__ == "__main__":
+    main()
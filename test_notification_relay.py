@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the notification relay and its client.
+Checks coalescing, fail-fast on Discord client errors, and that a spooled
+event the relay refuses does not block the events behind it.
+"""
+
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import sound_config_cache
+from fake_discord import FakeDiscord
+from notification_relay import NotificationRelay, coalesce_events, MAX_EMBEDS_PER_MESSAGE
+from relay_client import RelayClient, REJECTED_DIR_NAME
+
+
+def test_coalesce_keeps_distinct_payloads():
+    """Identical payloads merge, others of the same session share a message"""
+    print("Testing coalescing...")
+    embed = {"title": "Build failed"}
+    session = {"session_id": "abc"}
+    events = [
+        {"client": "a", "payload": {"content": "done"}},
+        {"client": "b", "payload": {"content": "done"}},
+        {"client": "a", "payload": {"content": "done", "embeds": [embed]}},
+        {"client": "a", "payload": {"content": "done"}, "session": session},
+    ]
+    payloads = coalesce_events(events)
+    assert payloads == [
+        ({"content": "done ×2 (a, b)\ndone", "embeds": [embed]}, None),
+        ({"content": "done"}, session),
+    ], payloads
+
+    many = [{"client": "a", "payload": {"content": f"e{i}", "embeds": [{"title": str(i)}]}}
+            for i in range(MAX_EMBEDS_PER_MESSAGE + 1)]
+    packed = coalesce_events(many)
+    assert [len(message["embeds"]) for message, _ in packed] == [MAX_EMBEDS_PER_MESSAGE, 1]
+    print("✅ Embeds and sessions kept")
+
+
+def test_coalesce_real_hook_payloads():
+    """Hook notifications differ only in embed timestamps, so repeats still merge"""
+    print("Testing coalescing of hook payloads...")
+    saved = sound_config_cache.COMPILED_CONFIG_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        sound_config_cache.COMPILED_CONFIG_DIR = Path(directory)  # the hooks load sounds on import
+        try:
+            import stop
+            import notification
+        finally:
+            sound_config_cache.COMPILED_CONFIG_DIR = saved
+
+    events = []
+    for i in range(3):
+        context = {"timestamp": f"2026-01-01T00:00:0{i}", "user": "dev", "hostname": "host",
+                   "working_directory": "/src/project", "git_branch": "main"}
+        content, embed = notification.create_rich_notification({"session_id": "s1"}, context)
+        events.append({"client": "host", "payload": {"content": content, "embeds": [embed]}})
+    content, embed = stop.create_stop_notification({"session_id": "s1"}, context)
+    events.append({"client": "host", "payload": {"content": content, "embeds": [embed]}})
+
+    payloads = coalesce_events(events)
+    assert len(payloads) == 1, payloads
+    message, session = payloads[0]
+    assert "×3 (host)" in message["content"] and "Stopped" in message["content"]
+    assert len(message["embeds"]) == 2
+    assert message["embeds"][0]["timestamp"] == "2026-01-01T00:00:02"  # latest repeat kept
+    print("✅ Repeats merged and packed into one message")
+
+
+def test_client_errors_fail_fast():
+    """A 4xx other than 429 is not retried"""
+    print("Testing fail-fast on client errors...")
+
+    async def scenario(directory: Path):
+        fake = FakeDiscord()
+        await fake.start()
+        relay = NotificationRelay(fake.webhook_url(), index_db=directory / "index.db")
+        await relay.start(None)
+        relay.flusher.cancel()
+        try:
+            started = time.monotonic()
+            assert not await relay.post_to_discord({"content": ""})  # Discord refuses empty messages
+            assert time.monotonic() - started < 1
+        finally:
+            await relay.stop(None)
+            await fake.stop()
+        assert fake.stats["requests"] == 1, fake.stats
+        assert relay.stats["failed"] == 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(scenario(Path(directory)))
+    print("✅ Rejected payload dropped without retrying")
+
+
+class FakeRelayHandler(BaseHTTPRequestHandler):
+    """Accepts events, except ones whose content is 'bad'"""
+    received = []
+
+    def do_POST(self):
+        event = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = 400 if event["payload"]["content"] == "bad" else 202
+        if status == 202:
+            self.received.append(event["payload"]["content"])
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_rejected_spool_entry_does_not_block():
+    """A refused spooled event is dead-lettered and the rest of the spool drains"""
+    print("Testing spool drain past a rejected event...")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeRelayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            spool_dir = Path(directory)
+            offline = RelayClient("http://127.0.0.1:1", spool_dir=spool_dir)
+            assert not offline.forward("bad")
+            assert not offline.forward("queued")
+
+            client = RelayClient(f"http://127.0.0.1:{server.server_port}", spool_dir=spool_dir)
+            assert client.forward("live")
+            assert FakeRelayHandler.received == ["queued", "live"]
+            assert not list(spool_dir.glob("*.json"))
+            rejected, = (spool_dir / REJECTED_DIR_NAME).glob("*.json")
+            assert json.loads(rejected.read_text())["payload"]["content"] == "bad"
+
+            assert not client.forward("bad")  # refused live events are not spooled
+            assert not list(spool_dir.glob("*.json"))
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("✅ Rejected event set aside, others delivered")
+
+
+def main():
+    """Run all notification relay tests"""
+    print("📡 Testing Notification Relay")
+    print("=" * 40)
+    test_coalesce_keeps_distinct_payloads()
+    test_coalesce_real_hook_payloads()
+    test_client_errors_fail_fast()
+    test_rejected_spool_entry_does_not_block()
+    print("\n🎯 All notification relay tests completed!")
+
+
+if __name__ == "__main__":
+    main()
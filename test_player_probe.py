@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the audio player capability cache.
+Uses a scratch cache file; executables are looked up on the real PATH.
+"""
+
+import time
+import tempfile
+from pathlib import Path
+
+import player_probe
+from player_probe import PlayerProbe
+
+PRESENT = "sh"  # on PATH everywhere these hooks run
+MISSING = "no-such-player-xyz"
+
+
+def make_probe(directory: str) -> PlayerProbe:
+    return PlayerProbe("digest", "Linux", cache_file=Path(directory) / "probe.json")
+
+
+def test_missing_executable_is_dropped():
+    """Executables that do not exist are cached and skipped"""
+    print("Testing missing executables...")
+    with tempfile.TemporaryDirectory() as directory:
+        probe = make_probe(directory)
+        assert probe.order_players(".wav", [MISSING, PRESENT]) == [PRESENT]
+        commands = [{"command": [MISSING, "a.wav"]}, {"command": [PRESENT, "-c", "true"]}]
+        assert probe.order_commands(commands) == commands[1:]
+
+        probe.save()
+        assert make_probe(directory).data["backends"][MISSING] is False
+    print("✅ Missing executables dropped")
+
+
+def test_transient_failure_only_demotes():
+    """A failed player is tried last, never dropped, and recovers after FAILURE_TTL"""
+    print("Testing transient failures...")
+    with tempfile.TemporaryDirectory() as directory:
+        probe = make_probe(directory)
+        probe.has_backend("cat")
+        probe.record_player(".wav", PRESENT, False)
+        assert probe.order_players(".wav", [PRESENT]) == [PRESENT]  # still playable
+        assert probe.order_players(".wav", [PRESENT, "cat"]) == ["cat", PRESENT]
+
+        probe.data["formats"][".wav"]["failed"][PRESENT] = time.time() - player_probe.FAILURE_TTL - 1
+        assert probe.order_players(".wav", [PRESENT, "cat"]) == [PRESENT, "cat"]
+
+        probe.record_player(".wav", "cat", True)
+        assert probe.order_players(".wav", [PRESENT, "cat"])[0] == "cat"
+    print("✅ Failed players demoted, not dropped")
+
+
+def test_command_failure_expires():
+    """Failed commands go last for FAILURE_TTL; known-good commands go first"""
+    print("Testing command failures...")
+    with tempfile.TemporaryDirectory() as directory:
+        probe = make_probe(directory)
+        flaky = {"command": [PRESENT, "-c", "exit 1"]}
+        good = {"command": [PRESENT, "-c", "true"]}
+        synth = {"synth": {"frequency": 440}}
+
+        probe.record_command(flaky["command"], False)
+        assert probe.order_commands([flaky, synth]) == [synth, flaky]
+        probe.record_command(good["command"], True)
+        assert probe.order_commands([flaky, synth, good]) == [good, synth, flaky]
+
+        key = probe.command_key(flaky["command"])
+        probe.data["commands"][key] = time.time() - player_probe.FAILURE_TTL - 1
+        assert probe.order_commands([synth, flaky]) == [synth, flaky]  # untried rank again
+        assert probe.order_commands([flaky, synth]) == [flaky, synth]
+    print("✅ Command failures expire")
+
+
+def test_old_cache_format_is_discarded():
+    """Caches from before the failure timestamps are rebuilt"""
+    print("Testing cache versioning...")
+    with tempfile.TemporaryDirectory() as directory:
+        probe = make_probe(directory)
+        probe.save()
+        cache_file = Path(directory) / "probe.json"
+        cache_file.write_text(cache_file.read_text().replace('"version": 2', '"version": 1'))
+        assert make_probe(directory).dirty  # fresh state
+    print("✅ Old cache discarded")
+
+
+def main():
+    """Run all player probe tests"""
+    print("🔎 Testing Player Probe")
+    print("=" * 40)
+    test_missing_executable_is_dropped()
+    test_transient_failure_only_demotes()
+    test_command_failure_expires()
+    test_old_cache_format_is_discarded()
+    print("\n🎯 All player probe tests completed!")
+
+
+if __name__ == "__main__":
+    main()
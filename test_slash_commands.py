@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test script for the /claude slash commands.
+Drives the command callbacks with fake interactions and a scratch queue.
+"""
+
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+import discord
+from discord import app_commands
+
+from bot_metrics import BotMetrics
+from command_queue import SqliteQueue, make_command_id
+from command_sanitizer import CommandSanitizer
+from slash_commands import ClaudeCommandGroup, sync_commands
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+    def __str__(self):
+        return f"user{self.id}"
+
+
+class FakeResponse:
+    def __init__(self):
+        self.deferred_at = None
+        self.ephemeral = None
+        self.messages = []
+
+    async def defer(self, ephemeral: bool = False, thinking: bool = False):
+        self.deferred_at = time.perf_counter()
+        self.ephemeral = ephemeral
+
+    async def send_message(self, content, ephemeral: bool = False):
+        self.messages.append(content)
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content):
+        self.messages.append(content)
+
+
+class FakeInteraction:
+    def __init__(self, user_id: int, interaction_id: int):
+        self.user = FakeUser(user_id)
+        self.id = interaction_id
+        self.channel_id = 5
+        self.guild_id = None
+        self.created = time.perf_counter()
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+
+
+class FakeBot:
+    """The parts of ClaudeCommandBot the command group uses"""
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.metrics = BotMetrics()
+        self.sanitizer = CommandSanitizer()
+
+    def is_authorized(self, user_id: int) -> bool:
+        return user_id != 666
+
+    async def submit_command(self, command_text, user, channel_id, source_id, guild_id=None,
+                             session=None, source="message", attachments=()):
+        await asyncio.sleep(0.05)  # a slow commit must not delay the defer
+        result = self.sanitizer.sanitize(command_text)
+        if result.rejected:
+            return result, None
+        entry = {"timestamp": "2024-01-01T00:00:00", "message_id": source_id, "command": result.text,
+                 "user_id": user.id, "channel_id": channel_id, "source": source}
+        return result, self.queue.enqueue(entry)
+
+
+def test_run_status_cancel():
+    """run queues, status lists, cancel cancels; every handler defers before working"""
+    print("Testing /claude run, status and cancel...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        group = ClaudeCommandGroup(FakeBot(queue), queue)
+
+        async def scenario():
+            run = FakeInteraction(7, 100)
+            await group.run.callback(group, run, command="explain the tests")
+            assert run.response.deferred_at - run.created < 0.05
+            assert run.followup.messages[0].startswith("✅ Command queued: `explain the tests`")
+            command_id = make_command_id({"timestamp": "2024-01-01T00:00:00", "message_id": 100})
+            assert queue.get(command_id)["source"] == "interaction"
+
+            status = FakeInteraction(7, 101)
+            await group.status.callback(group, status)
+            assert status.response.ephemeral
+            assert "1 pending, 0 running" in status.followup.messages[0]
+            assert command_id in status.followup.messages[0]
+
+            other = FakeInteraction(8, 102)
+            await group.cancel.callback(group, other, command_id=command_id)
+            assert other.followup.messages == ["You can only cancel your own commands."]
+
+            cancel = FakeInteraction(7, 103)
+            await group.cancel.callback(group, cancel)
+            assert cancel.followup.messages == [f"🚫 Cancelled `{command_id}`."]
+            assert queue.get(command_id)["status"] == "cancelled"
+
+        asyncio.run(scenario())
+        queue.close()
+    print("✅ Slash commands work")
+
+
+def test_unauthorized_user_is_refused():
+    """The group check answers unauthorized users directly"""
+    print("Testing authorization check...")
+    with tempfile.TemporaryDirectory() as directory:
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        group = ClaudeCommandGroup(FakeBot(queue), queue)
+        interaction = FakeInteraction(666, 200)
+        assert asyncio.run(group.interaction_check(interaction)) is False
+        assert interaction.response.messages == ["You are not authorized to run commands."]
+        queue.close()
+    print("✅ Unauthorized user refused")
+
+
+def test_sync_only_when_changed():
+    """Commands are registered once per definition set, not on every start"""
+    print("Testing command sync...")
+    with tempfile.TemporaryDirectory() as directory:
+        state_file = Path(directory) / "slash_commands.json"
+        queue = SqliteQueue(Path(directory) / "queue.db")
+        client = discord.Client(intents=discord.Intents.none())
+        client._connection.application_id = 42
+        tree = app_commands.CommandTree(client)
+        tree.add_command(ClaudeCommandGroup(FakeBot(queue), queue))
+        syncs = []
+
+        async def fake_sync(*, guild=None):
+            syncs.append(guild)
+            return []
+
+        tree.sync = fake_sync
+        assert asyncio.run(sync_commands(tree, state_file=state_file)) is True
+        assert asyncio.run(sync_commands(tree, state_file=state_file)) is False
+        assert asyncio.run(sync_commands(tree, guild_id=9, state_file=state_file)) is True
+        assert len(syncs) == 2 and syncs[1].id == 9
+        queue.close()
+    print("✅ Sync skipped when unchanged")
+
+
+def main():
+    """Run all slash command tests"""
+    print("⚡ Testing Slash Commands")
+    print("=" * 40)
+    test_run_status_cancel()
+    test_unauthorized_user_is_refused()
+    test_sync_only_when_changed()
+    print("\n🎯 All slash command tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the sound backend benchmark.
+Uses a stand-in capture sink, so no PulseAudio server is needed and nothing
+is played.
+"""
+
+import time
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import sound_benchmark
+from sound_benchmark import NullSinkCapture, measure_command, run_benchmark
+
+
+class FakeCapture(NullSinkCapture):
+    """Reports first audio 20 ms after each run is armed"""
+
+    def arm(self):
+        super().arm()
+        threading.Timer(0.02, lambda: setattr(self, "first_audio", time.perf_counter())).start()
+
+
+def test_players_are_routed_to_the_null_sink():
+    """Spawned players get PULSE_SINK and first audio is timed per run"""
+    print("Testing null sink routing...")
+    with tempfile.TemporaryDirectory() as directory:
+        out = Path(directory) / "sink.txt"
+        result = measure_command(["sh", "-c", f'printf %s "$PULSE_SINK" > {out}'], FakeCapture())
+        assert result["status"] == "ok"
+        assert out.read_text() == sound_benchmark.NULL_SINK_NAME
+        assert 0.015 < result["first_audio"] < 0.5
+    print("✅ Player routed and first audio measured")
+
+
+def test_no_real_device_playback_by_default():
+    """Without a null sink, players are only spawned when the real device is allowed"""
+    print("Testing fallback without a null sink...")
+    manager = SimpleNamespace(
+        platform_commands={"success": []}, config={},
+        get_sound_commands=lambda sound_type: [{"command": ["true"], "description": "noop"}])
+    saved_start = NullSinkCapture.start
+    NullSinkCapture.start = lambda self: False
+    try:
+        skipped, = run_benchmark(manager)
+        played, = run_benchmark(manager, real_device=True)
+    finally:
+        NullSinkCapture.start = saved_start
+    assert skipped["spawn_to_exec_ms"] is None and skipped["sink"] is None
+    assert played["spawn_to_exec_ms"] is not None and played["sink"] == "device"
+    assert played["first_audio_ms"] is None  # not measurable on the real device
+    print("✅ Real device only on request")
+
+
+def main():
+    """Run all sound benchmark tests"""
+    print("⏱️ Testing Sound Benchmark")
+    print("=" * 40)
+    test_players_are_routed_to_the_null_sink()
+    test_no_real_device_playback_by_default()
+    print("\n🎯 All sound benchmark tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-decoded sound cache.
+Uses scratch sound and cache directories, so the real cache is never touched.
+"""
+
+import os
+import math
+import wave
+import array
+import io
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+
+import sound_cache
+import sound_volume
+from sound_cache import build_manifest, load_manifest, hash_file, content_hash, clip_facts
+from sound_volume import scaled_clip, read_pcm16, measure_loudness, ClipUnavailable
+
+
+def write_tone(path: Path, frequency: float, seconds: float = 0.1, rate: int = 22050):
+    """Write a short mono sine tone WAV for testing"""
+    samples = array.array("h", (int(8000 * math.sin(2 * math.pi * frequency * i / rate))
+                                for i in range(int(rate * seconds))))
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+
+
+def test_replaced_clip_invalidates_entry():
+    """A clip replaced after the build is not served from the stale cache"""
+    print("Testing manifest invalidation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        sound_dir, cache_dir = Path(tmp) / "sounds", Path(tmp) / "cache"
+        sound_dir.mkdir()
+        write_tone(sound_dir / "success.wav", 440)
+        write_tone(sound_dir / "error.wav", 220)
+        config = {"sounds": {"success": {}, "error": {}},
+                  "custom_sounds": {"sound_directory": str(sound_dir)}}
+
+        build_manifest(config, "digest", cache_dir)
+        assert set(load_manifest("digest", cache_dir)) == {"success", "error"}
+        assert load_manifest("other", cache_dir) == {}
+
+        # Rewrite in place (same name, directory listing unchanged)
+        directory_stamp = os.stat(sound_dir)
+        write_tone(sound_dir / "success.wav", 880, seconds=0.2)
+        os.utime(sound_dir, ns=(directory_stamp.st_atime_ns, directory_stamp.st_mtime_ns))
+        assert set(load_manifest("digest", cache_dir)) == {"error"}
+
+        # Adding or removing a clip changes the directory
+        write_tone(sound_dir / "new.wav", 330)
+        assert load_manifest("digest", cache_dir) == {}
+
+        build_manifest(config, "digest", cache_dir)
+        assert set(load_manifest("digest", cache_dir)) == {"success", "error"}
+    print("✅ Stale entries dropped")
+
+
+def test_volume_variants_by_content():
+    """Variants are keyed by content, and non-WAV clips are scaled via their decoded copy"""
+    print("Testing volume variants...")
+    saved = sound_cache.SOUND_CACHE_DIR, sound_volume.SOUND_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sound_cache.SOUND_CACHE_DIR = sound_volume.SOUND_CACHE_DIR = tmp / "cache"
+        try:
+            volume_dir = tmp / "volume"
+            write_tone(tmp / "a.wav", 440)
+            shutil.copyfile(tmp / "a.wav", tmp / "b.wav")
+            variant = scaled_clip(tmp / "a.wav", 50, cache_dir=volume_dir)
+            assert scaled_clip(tmp / "b.wav", 50, cache_dir=volume_dir) == variant  # same content
+
+            write_tone(tmp / "a.wav", 880)  # replaced: a new variant, not the stale one
+            assert scaled_clip(tmp / "a.wav", 50, cache_dir=volume_dir) != variant
+
+            # An OGG clip whose decoded copy is already in the sound cache needs no decoder
+            ogg = tmp / "c.ogg"
+            ogg.write_bytes(b"OggS not really")
+            sound_cache.SOUND_CACHE_DIR.mkdir(exist_ok=True)
+            write_tone(sound_cache.SOUND_CACHE_DIR / f"{hash_file(ogg)[:32]}.wav", 440)
+            scaled = scaled_clip(ogg, 50, cache_dir=volume_dir)
+            assert scaled.suffix == ".wav"
+            original_rms = measure_loudness(read_pcm16(tmp / "b.wav")[0])[0]
+            assert abs(measure_loudness(read_pcm16(scaled)[0])[0] - original_rms / 2) < original_rms * 0.02
+        finally:
+            sound_cache.SOUND_CACHE_DIR, sound_volume.SOUND_CACHE_DIR = saved
+    print("✅ Variants shared by content, OGG scaled")
+
+
+def test_hashes_and_failures_are_remembered():
+    """Content hashes are reused until a clip changes; unplayable clips are reported once"""
+    print("Testing remembered clip facts...")
+    saved = sound_cache.SOUND_CACHE_DIR, sound_volume.SOUND_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sound_cache.SOUND_CACHE_DIR = sound_volume.SOUND_CACHE_DIR = tmp / "cache"
+        try:
+            clip = tmp / "a.wav"
+            write_tone(clip, 440)
+            assert content_hash(clip) == hash_file(clip)
+            assert clip_facts(clip)["hash"] == hash_file(clip)
+            write_tone(clip, 880, seconds=0.2)
+            assert clip_facts(clip) == {}  # changed: hashed again on next use
+            assert content_hash(clip) == hash_file(clip)
+
+            undecodable = tmp / "b.oga"
+            undecodable.write_bytes(b"not audio")
+            for unplayable in (undecodable, tmp / "missing.wav"):
+                for attempt in range(2):
+                    output = io.StringIO()
+                    with contextlib.redirect_stdout(output):
+                        try:
+                            scaled_clip(unplayable, 50, cache_dir=tmp / "volume")
+                        except ClipUnavailable:
+                            pass
+                        else:
+                            raise AssertionError(f"{unplayable.name} scaled")
+                    assert bool(output.getvalue()) == (attempt == 0), output.getvalue()
+
+            write_tone(tmp / "missing.wav", 440)  # appears later: retried
+            assert scaled_clip(tmp / "missing.wav", 50, cache_dir=tmp / "volume").exists()
+        finally:
+            sound_cache.SOUND_CACHE_DIR, sound_volume.SOUND_CACHE_DIR = saved
+    print("✅ Hashes reused, failures reported once")
+
+
+def main():
+    """Run all sound cache tests"""
+    print("🗂️ Testing Sound Cache")
+    print("=" * 40)
+    test_replaced_clip_invalidates_entry()
+    test_volume_variants_by_content()
+    test_hashes_and_failures_are_remembered()
+    print("\n🎯 All sound cache tests completed!")
+
+
+if __name__ == "__main__":
+    main()
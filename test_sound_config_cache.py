@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled sound configuration cache and its watcher.
+Uses a scratch compiled directory, so the real ~/.claude/compiled is never touched.
+"""
+
+import os
+import json
+import marshal
+import tempfile
+import threading
+from pathlib import Path
+
+import sound_config_cache
+from sound_config_cache import ConfigWatcher, load_compiled_config, compiled_path, prune_compiled
+
+
+def write_config(config_file: Path, command: str):
+    """Write a config with one Linux success command"""
+    config_file.write_text(json.dumps({"sounds": {"success": {"linux": [command]}}}))
+
+
+def test_stale_source_recompiled():
+    """The compiled file is served while the source is unchanged and rebuilt after an edit"""
+    print("Testing stale source invalidation...")
+    saved = sound_config_cache.COMPILED_CONFIG_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        sound_config_cache.COMPILED_CONFIG_DIR = Path(tmp) / "compiled"
+        try:
+            config_file = Path(tmp) / "sound_config.json"
+            write_config(config_file, "first")
+            assert load_compiled_config(config_file, "Linux")["commands"] == {"success": ["first"]}
+
+            # A marked cache entry is served as-is while the source stat matches
+            cache_file = compiled_path(config_file, "Linux")
+            compiled = marshal.loads(cache_file.read_bytes())
+            compiled["commands"] = {"success": ["from-cache"]}
+            cache_file.write_bytes(marshal.dumps(compiled))
+            assert load_compiled_config(config_file, "Linux")["commands"] == {"success": ["from-cache"]}
+
+            stat = os.stat(config_file)
+            write_config(config_file, "second")
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            assert load_compiled_config(config_file, "Linux")["commands"] == {"success": ["second"]}
+            assert marshal.loads(cache_file.read_bytes())["commands"] == {"success": ["second"]}
+        finally:
+            sound_config_cache.COMPILED_CONFIG_DIR = saved
+    print("✅ Edited config recompiled")
+
+
+def test_orphans_pruned():
+    """Compiled files whose config was deleted are removed on the next compile"""
+    print("Testing pruning of orphaned compiled files...")
+    saved = sound_config_cache.COMPILED_CONFIG_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        sound_config_cache.COMPILED_CONFIG_DIR = Path(tmp) / "compiled"
+        try:
+            kept, removed = Path(tmp) / "kept.json", Path(tmp) / "removed.json"
+            write_config(kept, "a")
+            write_config(removed, "b")
+            load_compiled_config(kept, "Linux")
+            load_compiled_config(removed, "Linux")
+            (sound_config_cache.COMPILED_CONFIG_DIR / "sound_config-corrupt-linux.marshal").write_bytes(b"junk")
+            removed.unlink()
+
+            assert prune_compiled() == 2
+            assert [p.name for p in sound_config_cache.COMPILED_CONFIG_DIR.iterdir()] == \
+                [compiled_path(kept, "Linux").name]
+        finally:
+            sound_config_cache.COMPILED_CONFIG_DIR = saved
+    print("✅ Orphans removed, live entry kept")
+
+
+def test_watcher_calls_back():
+    """The watcher fires for edits to its file, including replace-by-rename saves"""
+    print("Testing config watcher...")
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "sound_config.json"
+        write_config(config_file, "first")
+        changed = threading.Event()
+        watcher = ConfigWatcher(config_file, changed.set)
+        watcher.start()
+        try:
+            (Path(tmp) / "other.json").write_text("{}")  # unrelated files are ignored
+            if watcher.fd is not None:
+                assert not changed.wait(0.3)
+
+            write_config(config_file, "second")
+            assert changed.wait(sound_config_cache.POLL_INTERVAL * 3)
+
+            changed.clear()
+            replacement = Path(tmp) / "sound_config.json.new"
+            write_config(replacement, "third")
+            os.replace(replacement, config_file)
+            assert changed.wait(sound_config_cache.POLL_INTERVAL * 3)
+        finally:
+            watcher.stop()
+    print("✅ Callback fired on change")
+
+
+def main():
+    """Run all compiled config tests"""
+    print("⚙️ Testing Compiled Sound Config")
+    print("=" * 40)
+    test_stale_source_recompiled()
+    test_orphans_pruned()
+    test_watcher_calls_back()
+    print("\n🎯 All compiled config tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for SoundManager player launching.
+Uses shell commands and short Python scripts as stand-in players, so no sound hardware is needed.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+
+import sound_config_cache
+from sound_manager import SoundManager, ASYNC_EARLY_EXIT_GRACE
+
+SYSTEM_KEY = {"Linux": "linux", "Darwin": "macos", "Windows": "windows"}.get(platform.system(), "linux")
+
+
+def player(script: str) -> list:
+    """Command that runs a Python snippet as a player"""
+    return [sys.executable, "-c", script]
+
+
+def make_manager(directory: Path, commands: list = None, async_playback: bool = True) -> SoundManager:
+    """SoundManager over a scratch config"""
+    config_file = directory / "sound_config.json"
+    config_file.write_text(json.dumps({
+        "sound_settings": {"async_playback": async_playback, "use_audio_server": False},
+        "sound_queue": {"enabled": False},
+        "sounds": {"success": {SYSTEM_KEY: commands or []}},
+    }))
+    saved = sound_config_cache.COMPILED_CONFIG_DIR
+    sound_config_cache.COMPILED_CONFIG_DIR = directory / "compiled"
+    try:
+        return SoundManager(str(config_file))
+    finally:
+        sound_config_cache.COMPILED_CONFIG_DIR = saved
+
+
+def test_detached_playback():
+    """Async mode returns before the player finishes, in its own session, and reports completion"""
+    print("Testing detached playback...")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        manager = make_manager(directory)
+        marker = directory / "session"
+        finished = threading.Event()
+        exit_codes = []
+
+        def on_complete(returncode):
+            exit_codes.append(returncode)
+            finished.set()
+
+        started = time.monotonic()
+        assert manager.run_player(player(
+            f"import os, time; time.sleep(0.5); open({str(marker)!r}, 'w').write(str(os.getsid(0)))"),
+            on_complete)
+        assert time.monotonic() - started < 0.4  # did not wait for the clip
+        assert not marker.exists()
+
+        assert finished.wait(10)
+        assert exit_codes == [0]
+        if hasattr(os, "getsid"):
+            assert int(marker.read_text()) != os.getsid(0)  # survives the hook's session
+    print("✅ Player detached")
+
+
+def test_early_exit_is_a_failure():
+    """A player that dies within the grace period raises so callers fall through"""
+    print("Testing early-exit detection...")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = make_manager(Path(directory))
+        try:
+            manager.run_player(["sh", "-c", "exit 3"])  # Python starts slower than the grace period
+        except subprocess.CalledProcessError as e:
+            assert e.returncode == 3
+        else:
+            raise AssertionError("early exit not reported")
+
+        exit_codes = []
+        assert manager.run_player(["true"], exit_codes.append)  # a clean quick exit is fine
+        deadline = time.monotonic() + 5
+        while not exit_codes and time.monotonic() < deadline:
+            time.sleep(ASYNC_EARLY_EXIT_GRACE)
+        assert exit_codes == [0]
+
+        try:
+            manager.run_player(["/nonexistent/player"])
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("missing player not reported")
+    print("✅ Early exits raise")
+
+
+def test_falls_back_to_next_command():
+    """A command that fails fast is skipped and the next configured one plays"""
+    print("Testing fallback to the next command...")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        marker = directory / "played"
+        manager = make_manager(directory, [
+            {"command": ["sh", "-c", "exit 1"], "description": "broken"},
+            {"command": player(f"open({str(marker)!r}, 'w')"), "description": "working"},
+        ])
+        assert manager.try_system_sounds("success", verbose=False)
+        deadline = time.monotonic() + 5
+        while not marker.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert marker.exists()
+    print("✅ Next command played")
+
+
+def test_sync_mode_waits():
+    """Without async playback the player runs to completion"""
+    print("Testing synchronous playback...")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        manager = make_manager(directory, async_playback=False)
+        marker = directory / "done"
+        assert manager.run_player(player(f"import time; time.sleep(0.2); open({str(marker)!r}, 'w')"))
+        assert marker.exists()
+    print("✅ Waited for the player")
+
+
+def test_async_is_the_default():
+    """A config without async_playback gets the same default as the built-in config"""
+    print("Testing async playback default...")
+    with tempfile.TemporaryDirectory() as directory:
+        manager = make_manager(Path(directory))
+        manager.config["sound_settings"].pop("async_playback")
+        assert manager.is_async_playback()
+        assert manager.get_default_config()["sound_settings"]["async_playback"]
+    print("✅ Async playback on by default")
+
+
+def main():
+    """Run all sound manager tests"""
+    print("🔊 Testing Sound Manager")
+    print("=" * 40)
+    test_detached_playback()
+    test_early_exit_is_a_failure()
+    test_falls_back_to_next_command()
+    test_sync_mode_waits()
+    test_async_is_the_default()
+    print("\n🎯 All sound manager tests completed!")
+
+
+if __name__ == "__main__":
+    main()
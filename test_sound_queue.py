@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for the sound arbiter.
+Uses a scratch state file; nothing is played.
+"""
+
+import sys
+import json
+import time
+import wave
+import threading
+import subprocess
+import tempfile
+from pathlib import Path
+
+from sound_queue import SoundArbiter, clip_duration
+
+
+def make_arbiter(directory: str, **settings) -> SoundArbiter:
+    settings = dict({"collect_window": 0.3, "merge_window": 1.0, "hold": 1.5}, **settings)
+    return SoundArbiter(settings, state_file=Path(directory) / "queue.json")
+
+
+def test_lone_request_does_not_wait():
+    """Without pending siblings a sound is admitted immediately"""
+    print("Testing lone request...")
+    with tempfile.TemporaryDirectory() as directory:
+        arbiter = make_arbiter(directory)
+        start = time.perf_counter()
+        assert arbiter.admit("success") == "play"
+        assert time.perf_counter() - start < 0.1
+        assert make_arbiter(directory).admit("success") == "merged"
+    print("✅ Admitted without waiting")
+
+
+def admit_together(directory: str, sound_types: list, stagger: float = 0.0) -> dict:
+    """Call admit() for each sound type from its own thread, as near-simultaneous hooks would"""
+    barrier = threading.Barrier(len(sound_types))
+    results = {}
+
+    def hook(index, sound_type):
+        arbiter = make_arbiter(directory)
+        barrier.wait()
+        time.sleep(index * stagger)
+        results[sound_type] = arbiter.admit(sound_type)
+
+    threads = [threading.Thread(target=hook, args=item) for item in enumerate(sound_types)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_burst_highest_priority_wins():
+    """Concurrent hooks: the error plays, and at most the very first arrival also started"""
+    print("Testing burst arbitration...")
+    for _ in range(5):
+        with tempfile.TemporaryDirectory() as directory:
+            results = admit_together(directory, ["thinking", "success", "error"])
+            assert results["error"] == "play", results
+            assert list(results.values()).count("play") <= 2, results
+            state = json.loads((Path(directory) / "queue.json").read_text())
+            assert state["playing"]["sound_type"] == "error"
+
+        # Lowest priority first, the others arrive while it decides
+        with tempfile.TemporaryDirectory() as directory:
+            results = admit_together(directory, ["thinking", "success", "error"], stagger=0.05)
+            assert results == {"thinking": "play", "success": "dropped", "error": "play"}, results
+    print("✅ Lower-priority siblings dropped")
+
+
+def test_higher_priority_preempts_player():
+    """A higher-priority sound stops the player of a lower one that already started"""
+    print("Testing preemption...")
+    with tempfile.TemporaryDirectory() as directory:
+        player = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            first = make_arbiter(directory)
+            assert first.admit("thinking") == "play"
+            first.playing_for(None, player.pid)
+            assert make_arbiter(directory).admit("error") == "play"
+            assert player.wait(timeout=5) != 0
+        finally:
+            if player.poll() is None:
+                player.kill()
+    print("✅ Lower-priority player stopped")
+
+
+def test_clip_length_sets_playing_time():
+    """A short clip stops suppressing lower-priority sounds when it ends"""
+    print("Testing clip duration...")
+    with tempfile.TemporaryDirectory() as directory:
+        clip = Path(directory) / "beep.wav"
+        with wave.open(str(clip), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(8000)
+            f.writeframes(b"\0\0" * 1600)
+        assert clip_duration(clip) == 0.2
+        assert clip_duration(Path(directory) / "missing.wav") is None
+
+        arbiter = make_arbiter(directory)
+        assert arbiter.admit("error") == "play"
+        assert make_arbiter(directory).admit("thinking") == "dropped"
+        arbiter.playing_for(clip_duration(clip))
+        time.sleep(0.25)
+        assert make_arbiter(directory).admit("thinking") == "play"
+    print("✅ Playing time follows the clip")
+
+
+def test_failed_playback_releases_slot():
+    """When the admitted sound cannot play, nothing is suppressed or merged"""
+    print("Testing release on failure...")
+    with tempfile.TemporaryDirectory() as directory:
+        arbiter = make_arbiter(directory)
+        assert arbiter.admit("error") == "play"
+        arbiter.release()
+        assert make_arbiter(directory).admit("thinking") == "play"
+        assert make_arbiter(directory).admit("error") == "play"  # not merged with the failed one
+    print("✅ Slot released")
+
+
+def test_release_leaves_newer_sound_alone():
+    """A stale release does not clear a sound admitted by another process"""
+    print("Testing stale release...")
+    with tempfile.TemporaryDirectory() as directory:
+        first = make_arbiter(directory, hold=0.05)
+        assert first.admit("error") == "play"
+        time.sleep(0.1)
+        assert make_arbiter(directory).admit("warning") == "play"
+        first.release()
+        assert make_arbiter(directory).admit("thinking") == "dropped"
+    print("✅ Newer sound kept")
+
+
+def main():
+    """Run all sound queue tests"""
+    print("🔔 Testing Sound Queue")
+    print("=" * 40)
+    test_lone_request_does_not_wait()
+    test_burst_highest_priority_wins()
+    test_higher_priority_preempts_player()
+    test_clip_length_sets_playing_time()
+    test_failed_playback_releases_slot()
+    test_release_leaves_newer_sound_alone()
+    print("\n🎯 All sound queue tests completed!")
+
+
+if __name__ == "__main__":
+    main()
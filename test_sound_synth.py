@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for in-process tone synthesis.
+Renders into a scratch cache directory and checks the generated PCM.
+"""
+
+import wave
+import array
+import tempfile
+from pathlib import Path
+
+from sound_synth import load_numpy, render_tone, render_samples, normalize_spec, describe_spec, SYNTH_SAMPLE_RATE
+
+
+def read_tone(path: Path):
+    """Samples plus (channels, sample width, rate) of a rendered WAV"""
+    with wave.open(str(path), "rb") as wav:
+        params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        return array.array("h", wav.readframes(wav.getnframes())), params
+
+
+def test_length_and_format():
+    """Tones are mono 16-bit at the synth rate, with the configured tones and gaps"""
+    print("Testing tone length and format...")
+    with tempfile.TemporaryDirectory() as directory:
+        spec = {"frequency": 880, "duration": 0.2, "repeats": 3, "gap": 0.05}
+        samples, params = read_tone(render_tone(spec, Path(directory)))
+        assert params == (1, 2, SYNTH_SAMPLE_RATE)
+        tone, gap = int(0.2 * SYNTH_SAMPLE_RATE), int(0.05 * SYNTH_SAMPLE_RATE)
+        assert len(samples) == 3 * tone + 2 * gap
+        assert not any(samples[tone:tone + gap])  # silence between repeats
+
+        # Roughly 880 Hz: two zero crossings per cycle
+        first = samples[:tone]
+        crossings = sum(1 for a, b in zip(first, first[1:]) if (a < 0) != (b < 0))
+        assert abs(crossings / 2 / 0.2 - 880) < 20, crossings
+    print("✅ Length, rate and pitch correct")
+
+
+def test_no_clipping():
+    """Every waveform stays within its amplitude, including amplitudes above full scale"""
+    print("Testing for clipping...")
+    for waveform in ("sine", "square", "triangle"):
+        for amplitude in (0.5, 1.0, 3.0):
+            spec = normalize_spec({"waveform": waveform, "amplitude": amplitude, "duration": 0.05})
+            samples = array.array("h", render_samples(spec))
+            limit = round(32767 * min(1.0, amplitude))
+            assert max(samples) <= limit and min(samples) >= -limit, (waveform, amplitude)
+            assert abs(samples[0]) <= 1 and abs(samples[-1]) <= limit // 10  # envelope fades in and out
+    print("✅ No sample clips")
+
+
+def test_fallback_matches_numpy():
+    """The array-module fallback renders the same PCM as NumPy"""
+    print("Testing the array fallback...")
+    spec = normalize_spec({"waveform": "triangle", "frequency": 523.25, "repeats": 2, "duration": 0.05})
+    fallback = array.array("h", render_samples(spec, use_numpy=False))
+    if load_numpy() is None:
+        print("⚠️ NumPy not installed; fallback only")
+        return
+    vectorized = array.array("h", render_samples(spec))
+    assert len(fallback) == len(vectorized)
+    assert max(abs(a - b) for a, b in zip(fallback, vectorized)) <= 1
+    print("✅ Fallback matches")
+
+
+def test_equivalent_specs_share_cache():
+    """Specs differing only in spelled-out defaults render once"""
+    print("Testing the tone cache...")
+    with tempfile.TemporaryDirectory() as directory:
+        first = render_tone({"frequency": 440}, Path(directory))
+        assert render_tone({"frequency": 440.0, "waveform": "sine", "repeats": 1}, Path(directory)) == first
+        assert render_tone({"frequency": 660}, Path(directory)) != first
+        assert len(list(Path(directory).glob("*.wav"))) == 2
+    try:
+        normalize_spec({"waveform": "sawtooth"})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown waveform accepted")
+    assert describe_spec({"frequency": 440, "repeats": 2}) == "synth sine 440Hz 0.25s x2"
+    print("✅ Cache shared")
+
+
+def main():
+    """Run all sound synth tests"""
+    print("🎹 Testing Sound Synth")
+    print("=" * 40)
+    test_length_and_format()
+    test_no_clipping()
+    test_fallback_matches_numpy()
+    test_equivalent_specs_share_cache()
+    print("\n🎯 All sound synth tests completed!")
+
+
+if __name__ == "__main__":
+    main()
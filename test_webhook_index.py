@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the webhook message index.
+Uses a scratch database, so the real index is never touched.
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+from webhook_index import WebhookIndex, session_meta, wait_url
+
+
+def test_wait_url():
+    """wait=true is added without disturbing existing query parameters"""
+    print("Testing webhook URL rewriting...")
+    assert wait_url("https://discord.com/api/webhooks/1/abc") == "https://discord.com/api/webhooks/1/abc?wait=true"
+    assert wait_url("https://x/api/webhooks/1/abc?thread_id=5") == "https://x/api/webhooks/1/abc?thread_id=5&wait=true"
+    print("✅ wait=true added")
+
+
+def test_record_and_lookup():
+    """Recorded messages are found, with metadata when given"""
+    print("Testing record and lookup...")
+    with tempfile.TemporaryDirectory() as directory:
+        index = WebhookIndex(Path(directory) / "index.db")
+        index.record(111, 9)
+        index.record(222, 9, {"session_id": "abc"})
+        assert index.contains(111)
+        assert index.lookup(222) == {"session_id": "abc"}
+        assert index.lookup(333) is None
+        index.close()
+    print("✅ Lookup works")
+
+
+def test_lru_eviction():
+    """The least recently used message is evicted once the bound is reached"""
+    print("Testing LRU eviction...")
+    with tempfile.TemporaryDirectory() as directory:
+        index = WebhookIndex(Path(directory) / "index.db", max_messages=3)
+        for message_id in (1, 2, 3):
+            index.record(message_id)
+        index.lookup(1)  # 2 is now the least recently used
+        index.record(4)
+        assert [index.contains(m) for m in (1, 2, 3, 4)] == [True, False, True, True]
+        index.close()
+    print("✅ Oldest unused message evicted")
+
+
+def test_lookup_from_worker_threads():
+    """Async callers can share one index through asyncio.to_thread"""
+    print("Testing threaded access...")
+    with tempfile.TemporaryDirectory() as directory:
+        index = WebhookIndex(Path(directory) / "index.db")
+
+        async def scenario():
+            await asyncio.gather(*(asyncio.to_thread(index.record, m, 9, {"n": m}) for m in range(50)))
+            return await asyncio.gather(*(asyncio.to_thread(index.lookup, m) for m in range(50)))
+
+        assert asyncio.run(scenario()) == [{"n": m} for m in range(50)]
+        index.close()
+    print("✅ Records and lookups off the event loop")
+
+
+def test_session_meta():
+    """Hook input maps to resumable session info; unknown sessions map to nothing"""
+    print("Testing session metadata...")
+    assert session_meta({"session_id": "unknown"}, "/tmp") is None
+    meta = session_meta({"session_id": "abc", "transcript_path": "/t.jsonl"}, "/work")
+    assert meta == {"session_id": "abc", "cwd": "/work", "transcript_path": "/t.jsonl"}
+    assert session_meta({"session_id": "abc", "cwd": "/hook"}, "/work")["cwd"] == "/hook"
+    print("✅ Session metadata extracted")
+
+
+def main():
+    """Run all webhook index tests"""
+    print("🔎 Testing Webhook Index")
+    print("=" * 40)
+    test_wait_url()
+    test_record_and_lookup()
+    test_lru_eviction()
+    test_lookup_from_worker_threads()
+    test_session_meta()
+    print("\n🎯 All webhook index tests completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Local index of Discord messages posted through our webhook.
+Notification senders record the IDs of the messages they post, together with
+the Claude session they came from, so the bot can tell whether a reply targets
+one of our notifications without a REST round trip and route it back to that
+session. Bounded with least-recently-used eviction.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Configuration
+WEBHOOK_INDEX_DB = Path.home() / ".claude" / "webhook_messages.db"
+MAX_INDEXED_MESSAGES = 5000
+
+
+def wait_url(webhook_url: str) -> str:
+    """Webhook URL with ?wait=true, so Discord returns the created message"""
+    parts = urlsplit(webhook_url)
+    query = dict(parse_qsl(parts.query))
+    query["wait"] = "true"
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def session_meta(hook_input: Dict, working_directory: str) -> Optional[Dict]:
+    """Claude session a notification belongs to, so replies can resume it"""
+    session_id = hook_input.get("session_id")
+    if not session_id or session_id == "unknown":
+        return None
+    return {
+        "session_id": session_id,
+        "cwd": hook_input.get("cwd") or working_directory,
+        "transcript_path": hook_input.get("transcript_path"),
+    }
+
+
+class WebhookIndex:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS messages (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL,
+            meta TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_messages_last_used ON messages(last_used);
+    """
+
+    def __init__(self, db_file: Path = None, max_messages: int = MAX_INDEXED_MESSAGES):
+        """Open (and create if needed) the index database"""
+        self.db_file = Path(db_file or WEBHOOK_INDEX_DB)
+        self.max_messages = max_messages
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # Async callers run lookups and records in worker threads; the lock
+        # keeps them from interleaving on the shared connection
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_file), timeout=5, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def record(self, message_id: int, channel_id: Optional[int] = None, meta: Optional[Dict] = None):
+        """Remember a message we posted, evicting the least recently used beyond the bound"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    """INSERT INTO messages (message_id, channel_id, created_at, last_used, meta)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(message_id) DO UPDATE SET last_used = excluded.last_used,
+                           meta = COALESCE(excluded.meta, messages.meta)""",
+                    (int(message_id), channel_id, now, now, json.dumps(meta) if meta else None)
+                )
+                self.conn.execute(
+                    """DELETE FROM messages WHERE message_id IN (
+                           SELECT message_id FROM messages ORDER BY last_used DESC LIMIT -1 OFFSET ?)""",
+                    (self.max_messages,)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def lookup(self, message_id: int) -> Optional[Dict]:
+        """Stored metadata for one of our messages ({} if none), or None if unknown.
+
+        Blocking (it also refreshes the LRU timestamp); call it from a worker
+        thread when running on an event loop.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT meta FROM messages WHERE message_id = ?", (int(message_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE messages SET last_used = ? WHERE message_id = ?",
+                              (time.time(), int(message_id)))
+        return json.loads(row[0]) if row[0] else {}
+
+    def contains(self, message_id: int) -> bool:
+        """Whether a message was posted by us"""
+        return self.lookup(message_id) is not None
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def record_webhook_response(response_body: Union[str, Dict], meta: Optional[Dict] = None):
+    """Index the message returned by a ?wait=true webhook call; never raises"""
+    try:
+        response_json = json.loads(response_body) if isinstance(response_body, str) else response_body
+        message_id = response_json.get("id")
+        if not message_id:
+            return
+        index = WebhookIndex()
+        try:
+            channel_id = response_json.get("channel_id")
+            index.record(int(message_id), int(channel_id) if channel_id else None, meta)
+        finally:
+            index.close()
+    except Exception as e:
+        print(f"⚠️ Could not index webhook message: {e}")